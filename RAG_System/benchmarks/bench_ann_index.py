@@ -0,0 +1,73 @@
+"""
+Recall@k, QPS and memory of VectorStore index types against the exact flat index.
+
+Uses clustered synthetic vectors with MiniLM's dimension (384), so no model
+download is needed. Run from RAG_System:
+    python -m benchmarks.bench_ann_index --vectors 200000 --queries 1000 --k 10
+"""
+import argparse
+import time
+
+import numpy as np
+
+from rag.index_factory import build_faiss_index, index_memory_bytes, set_search_params
+
+
+def synthetic_vectors(n: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    """Unit-norm vectors drawn around random cluster centres (embedding-like)."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, clusters, size=n)] + 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(f[f >= 0]) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vectors", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 64, 128])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    print(f"[BENCH] {args.vectors} vectors x {args.dim} dims, {args.queries} queries, k={args.k}")
+    data = synthetic_vectors(args.vectors + args.queries, args.dim, clusters=max(10, args.vectors // 1000), seed=args.seed)
+    vectors, queries = data[:args.vectors], data[args.vectors:]
+    
+    configs = [("flat", {})]
+    configs += [("hnsw", {"ef_search": ef}) for ef in args.ef_search]
+    for index_type in ("ivf_flat", "ivf_sq8", "ivf_pq"):
+        configs += [(index_type, {"nprobe": nprobe}) for nprobe in args.nprobe]
+    configs += [("sq8", {})]
+    
+    built = {}
+    truth = None
+    print(f"\n  {'index':<10} {'params':<16} {'build s':>8} {'recall@k':>9} {'QPS':>10} {'memory MB':>10}")
+    for index_type, search_params in configs:
+        if index_type not in built:
+            start = time.perf_counter()
+            built[index_type] = (build_faiss_index(vectors, index_type), time.perf_counter() - start)
+        index, build_time = built[index_type]
+        set_search_params(index, **search_params)
+        
+        start = time.perf_counter()
+        _, found = index.search(queries, args.k)
+        elapsed = time.perf_counter() - start
+        
+        if truth is None:
+            truth = found
+        params = ",".join(f"{k}={v}" for k, v in search_params.items()) or "-"
+        print(f"  {index_type:<10} {params:<16} {build_time:>8.2f} {recall_at_k(found, truth):>9.3f} "
+              f"{args.queries / elapsed:>10,.0f} {index_memory_bytes(index) / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Memory of clean_jobs' per-chunk dicts versus the compact JobTable views.
+
+Measures the traced memory still held by each result (tracemalloc), checks
+that every compact chunk view equals the corresponding dict record, and
+times matching through both representations.
+
+Run from RAG_System:
+    python -m benchmarks.bench_chunk_memory --jobs 20000 --words 600
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import write_corpus
+from data_ingestion.job_cleaner import clean_jobs
+from skill_engine.skill_matrix import JobSkillMatrix
+from skill_engine.skill_trends import iter_matching_chunks
+
+
+def measure(jobs_path: str, compact: bool):
+    """Run clean_jobs and return (result, MB still allocated, peak MB, seconds)."""
+    # Timed separately: tracemalloc slows allocation-heavy code unevenly
+    start = time.perf_counter()
+    clean_jobs(jobs_path, compact=compact)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    result = clean_jobs(jobs_path, compact=compact)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 2**20, peak / 2**20, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=20_000)
+    parser.add_argument("--words", type=int, default=600, help="Words per synthetic description")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs_path = write_corpus(tmp, args.jobs, seed=args.seed, words_per_job=args.words)["jobs.json"]
+        print(f"[BENCH] {args.jobs:,} jobs x ~{args.words} words ({os.path.getsize(jobs_path) / 2**20:.0f} MB)")
+
+        (dict_chunks, dict_skills), dict_mb, dict_peak, dict_s = measure(jobs_path, compact=False)
+        (view_chunks, view_skills), view_mb, view_peak, view_s = measure(jobs_path, compact=True)
+
+    print(f"  ✓ dict records: {len(dict_chunks):,} chunks, {dict_mb:,.1f} MB held "
+          f"(peak {dict_peak:,.1f} MB), {dict_s:.2f}s")
+    print(f"  ✓ JobTable:     {len(view_chunks):,} chunks, {view_mb:,.1f} MB held "
+          f"(peak {view_peak:,.1f} MB), {view_s:.2f}s")
+    print(f"  ✓ Memory held x{dict_mb / view_mb:.1f} smaller")
+
+    if len(view_chunks) != len(dict_chunks) or list(view_skills) != dict_skills:
+        raise SystemExit("  ❌ Chunk or skill counts differ")
+    if any(view.to_dict() != record for view, record in zip(view_chunks, dict_chunks)):
+        raise SystemExit("  ❌ A chunk view differs from its dict record")
+    print("  ✓ Every chunk view equals its dict record")
+
+    matrix = JobSkillMatrix.from_skill_lists(dict_skills)
+    trending = matrix.trending_skills(0.3)
+    for label, chunks in (("dict records", dict_chunks), ("JobTable", view_chunks)):
+        start = time.perf_counter()
+        matched = sum(1 for _ in iter_matching_chunks(chunks, trending, matrix))
+        print(f"  ✓ matching over {label}: {matched:,} chunks in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Blocked module x job coverage scoring: time, peak memory and block-size invariance.
+
+Uses a synthetic corpus and deterministic fake embeddings. Every block size
+must give the same summary; larger blocks trade memory for fewer passes.
+
+Run from RAG_System:
+    python -m benchmarks.bench_coverage --jobs 100000 --block-sizes 1024 8192 65536
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.fake_embeddings import install_fake_embeddings
+from benchmarks.synthetic import generate_curriculum, generate_jobs
+from data_ingestion.curriculum_processor import process_curriculum
+from data_ingestion.job_cleaner import _process_descriptions, build_chunk_records
+from rag.coverage import CoverageEngine
+from rag.vector_store import VectorStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--courses", type=int, default=12)
+    parser.add_argument("--block-sizes", type=int, nargs="+", default=[1024, 8192, 65536])
+    parser.add_argument("--threshold", type=float, default=0.4)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    install_fake_embeddings()
+    jobs = generate_jobs(args.jobs, seed=args.seed)
+    skills_list, chunks_list = _process_descriptions([job["description"] for job in jobs])
+    chunks = [
+        chunk
+        for job_index, (job, skills, texts) in enumerate(zip(jobs, skills_list, chunks_list))
+        for chunk in build_chunk_records(job, skills, texts, job_index)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "curriculum.json")
+        with open(path, "w") as f:
+            json.dump(generate_curriculum(args.courses, seed=args.seed), f)
+        curriculum, modules = process_curriculum(path)
+
+    store = VectorStore(use_embedding_cache=False)
+    store.build_index([c["text"] for c in chunks], [c["metadata"] for c in chunks])
+    print(f"[BENCH] {len(modules)} modules x {len(chunks):,} job chunks")
+
+    course_ids = [course["id"] for course in curriculum["courses"]]
+    reference = None
+    for block_size in args.block_sizes:
+        engine = CoverageEngine(store, modules, threshold=args.threshold, block_size=block_size)
+        tracemalloc.start()
+        start = time.perf_counter()
+        summaries = [engine.summary(course_id) for course_id in course_ids]
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+
+        print(f"  ✓ block={block_size:>6}: {elapsed:.2f}s, peak {peak:,.1f} MB")
+        if reference is None:
+            reference = summaries
+        elif summaries != reference:
+            raise SystemExit(f"  ❌ Summary with block size {block_size} differs")
+
+    first = reference[0]
+    print(f"  ✓ Summaries identical for all block sizes")
+    print(f"  Course {first['courseId']}: {first['coveredShare']:.0%} covered, "
+          f"top module {first['modules'][0]['title']!r}, "
+          f"most under-served {[s['skill'] for s in first['underservedSkills'][:3]]}")
+
+
+if __name__ == "__main__":
+    main()
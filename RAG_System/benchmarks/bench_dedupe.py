@@ -0,0 +1,68 @@
+"""
+Near-duplicate posting detection (MinHash + LSH): throughput and precision.
+
+Generates a synthetic corpus, reposts a share of it with small edits under
+new ids and companies, and runs DuplicateDetector over the result. Reports
+postings per second, precision / recall against the injected reposts, how
+many candidate comparisons LSH needed, and how much the reposts inflate
+skill counts without dedupe.
+
+Run from RAG_System:
+    python -m benchmarks.bench_dedupe --jobs 100000 --rate 0.2 --edits 2
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import generate_jobs, inject_near_duplicates
+from data_ingestion.dedupe import DEDUPE_BATCH_SIZE, DuplicateDetector
+from data_ingestion.job_table import clean_description
+from skill_engine.skill_extractor import extract_skills_batch
+from skill_engine.skill_trends import calculate_trends
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--rate", type=float, default=0.2, help="Reposts injected, as a share of --jobs")
+    parser.add_argument("--edits", type=int, default=2, help="Words changed per repost")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--num-perm", type=int, default=64)
+    parser.add_argument("--bands", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    jobs, origin = inject_near_duplicates(generate_jobs(args.jobs, seed=args.seed), args.rate, args.edits, args.seed)
+    descriptions = [clean_description(job["description"]) for job in jobs]
+    print(f"[BENCH] {len(jobs):,} postings ({sum(o is not None for o in origin):,} injected reposts, "
+          f"{args.edits} edits each), threshold {args.threshold}, {args.num_perm} perms / {args.bands} bands")
+
+    detector = DuplicateDetector(args.threshold, args.num_perm, args.bands)
+    start = time.perf_counter()
+    for batch_start in range(0, len(descriptions), DEDUPE_BATCH_SIZE):
+        detector.add_batch(descriptions[batch_start:batch_start + DEDUPE_BATCH_SIZE])
+    elapsed = time.perf_counter() - start
+
+    flagged = [i for i, canonical in enumerate(detector.canonical) if canonical != i]
+    true_positives = sum(origin[i] is not None for i in flagged)
+    # A repost matched to another repost of the same original is still a correct match
+    same_family = sum(
+        origin[i] is not None and (origin[i] == detector.canonical[i] or origin[i] == origin[detector.canonical[i]])
+        for i in flagged
+    )
+    reposts = sum(o is not None for o in origin)
+    print(f"  ✓ {len(jobs) / elapsed:,.0f} postings/s ({elapsed:.2f}s)")
+    print(f"  ✓ flagged {len(flagged):,}: precision {true_positives / max(1, len(flagged)):.3f} "
+          f"(matched to own original: {same_family / max(1, len(flagged)):.3f}), "
+          f"recall {true_positives / max(1, reposts):.3f}")
+
+    skills_list = extract_skills_batch(descriptions)
+    inflated = calculate_trends(skills_list)
+    kept = calculate_trends(skills for skills, keep in zip(skills_list, detector.kept) if keep)
+    originals = calculate_trends(skills for skills, o in zip(skills_list, origin) if o is None)
+    error_with = sum(abs(inflated.get(s, 0) - c) for s, c in originals.items()) / max(1, sum(originals.values()))
+    error_without = sum(abs(kept.get(s, 0) - c) for s, c in originals.items()) / max(1, sum(originals.values()))
+    print(f"  ✓ skill count error vs. originals only: {error_with:.1%} without dedupe, {error_without:.1%} with")
+
+
+if __name__ == "__main__":
+    main()
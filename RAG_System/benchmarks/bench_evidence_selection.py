@@ -0,0 +1,134 @@
+"""
+Token-budgeted evidence selection versus the fixed prompt slices.
+
+For every synthetic course, takes the hybrid-retrieved job chunks and
+builds the gap-analysis evidence twice: the legacy way (first 10 trending
+skills, first modules, first 3 chunks) and with select_evidence under a
+token budget. Reports estimated evidence tokens, distinct job skills the
+evidence shows, near-duplicate evidence pairs and selection time.
+
+Run from RAG_System:
+    python -m benchmarks.bench_evidence_selection --jobs 20000 --budget 300
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.fake_embeddings import install_fake_embeddings
+from benchmarks.synthetic import generate_curriculum, generate_jobs
+from data_ingestion.curriculum_processor import process_curriculum
+from data_ingestion.job_cleaner import _process_descriptions, build_chunk_records
+from rag.hybrid_retriever import HybridRetriever, retrieve_course_evidence
+from rag.vector_store import VectorStore, embed_texts
+from reasoning.evidence_selector import estimate_tokens, select_evidence
+from skill_engine.skill_trends import calculate_trends, get_trending_skills
+
+DUPLICATE_SIMILARITY = 0.9  # Cosine similarity above which two evidence chunks count as near-duplicates
+
+
+def legacy_evidence(chunks: list, modules: list, trending_skills: list) -> dict:
+    """The fixed slices analyze_gap used before evidence selection."""
+    return {
+        "skills": trending_skills[:10],
+        "modules": [
+            {
+                "id": m["metadata"].get("moduleId"),
+                "title": m["metadata"].get("moduleTitle"),
+                "skills": m["metadata"].get("moduleSkills", [])[:5],
+            }
+            for m in modules
+        ],
+        "jobEvidence": [
+            {"jobTitle": c["metadata"].get("jobTitle"), "skills": c["metadata"].get("extractedSkills", [])}
+            for c in chunks[:3]
+        ],
+    }
+
+
+def describe(evidence: dict) -> tuple:
+    """Estimated tokens and distinct skills across the evidence sections."""
+    tokens = sum(estimate_tokens(json.dumps(evidence[key])) for key in ("skills", "modules", "jobEvidence"))
+    skills = {s.lower() for s in evidence["skills"]}
+    skills.update(s.lower() for item in evidence["jobEvidence"] for s in item["skills"])
+    return tokens, len(skills)
+
+
+def near_duplicates(evidence_texts: list) -> int:
+    """Near-duplicate pairs among the evidence chunks (by embedding similarity)."""
+    if len(evidence_texts) < 2:
+        return 0
+    vectors = np.asarray(embed_texts(evidence_texts), dtype=np.float32)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-9)
+    similarities = np.triu(vectors @ vectors.T, k=1)
+    return int((similarities >= DUPLICATE_SIMILARITY).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=20_000)
+    parser.add_argument("--courses", type=int, default=12)
+    parser.add_argument("--candidates", type=int, default=30, help="Retrieved chunks offered per course")
+    parser.add_argument("--budget", type=int, default=300)
+    parser.add_argument("--diversity", type=float, default=0.3)
+    parser.add_argument("--trending-threshold", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    install_fake_embeddings()
+    jobs = generate_jobs(args.jobs, seed=args.seed)
+    skills_list, chunks_list = _process_descriptions([job["description"] for job in jobs])
+    chunks = [
+        chunk
+        for job_index, (job, skills, texts) in enumerate(zip(jobs, skills_list, chunks_list))
+        for chunk in build_chunk_records(job, skills, texts, job_index)
+    ]
+    skill_frequency = calculate_trends(skills_list)
+    trending_skills = get_trending_skills(skill_frequency, len(jobs), threshold=args.trending_threshold)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "curriculum.json")
+        with open(path, "w") as f:
+            json.dump(generate_curriculum(args.courses, seed=args.seed), f)
+        _, modules = process_curriculum(path)
+    by_course = {}
+    for module in modules:
+        by_course.setdefault(module["metadata"]["courseId"], []).append(module)
+
+    store = VectorStore(use_embedding_cache=False)
+    store.build_index([c["text"] for c in chunks], [c["metadata"] for c in chunks])
+    retriever = HybridRetriever(store)
+    print(f"[BENCH] {len(chunks):,} chunks, {len(by_course)} courses, "
+          f"{len(trending_skills)} trending skills, {args.candidates} candidates per course, "
+          f"budget {args.budget} tokens")
+
+    totals = {"legacy": [0, 0, 0], "selected": [0, 0, 0]}
+    elapsed = 0.0
+    for course_modules in by_course.values():
+        evidence = retrieve_course_evidence(retriever, course_modules, per_module=4, limit=args.candidates)
+
+        legacy = legacy_evidence(evidence, course_modules, trending_skills)
+        start = time.perf_counter()
+        selected = select_evidence(evidence, course_modules, trending_skills, skill_frequency,
+                                   embed_texts, args.budget, args.diversity)
+        elapsed += time.perf_counter() - start
+
+        for name, result in (("legacy", legacy), ("selected", selected)):
+            tokens, skills = describe(result)
+            texts = [f"{item['jobTitle']}: {' '.join(item['skills'])}" for item in result["jobEvidence"]]
+            totals[name][0] += tokens
+            totals[name][1] += skills
+            totals[name][2] += near_duplicates(texts)
+
+    n = len(by_course)
+    for name, (tokens, skills, duplicates) in totals.items():
+        print(f"  ✓ {name:>8}: {tokens / n:6.0f} evidence tokens, {skills / n:5.1f} distinct skills, "
+              f"{duplicates / n:4.1f} near-duplicate evidence pairs per course")
+    print(f"  ✓ selection: {elapsed / n * 1000:.2f} ms/course")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Fuzzy skill pass (skill-embedding index): throughput, recall and emerging skills.
+
+Generates a synthetic corpus and appends, to a share of the postings, a
+sentence with a spelling variant of a catalogue skill that the keyword
+regex misses ("deep-learning", "ci cd") and one with a phrase the catalogue
+does not know ("prompt engineering"). Runs FuzzySkillPass over the corpus
+with FakeEmbeddings (feature hashing, no model download) and reports
+postings per second, the share of missed variant mentions recovered, the
+precision of the added skills (share the posting actually mentions), and
+where the novel phrases rank among the emerging skills (precision of the
+top entries).
+
+Run from RAG_System:
+    python -m benchmarks.bench_fuzzy_skills --jobs 50000 --rate 0.1
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from benchmarks.fake_embeddings import FakeEmbeddings
+from benchmarks.synthetic import generate_jobs
+from data_ingestion.job_table import clean_description
+from skill_engine.skill_extractor import extract_skills_batch
+from skill_engine.skill_index import FUZZY_BATCH_SIZE, FuzzySkillPass, SkillEmbeddingIndex
+
+# Variant spelling -> catalogue skill it means
+VARIANTS = {
+    "deep-learning": "deep learning",
+    "machine-learning": "machine learning",
+    "hugging-face": "hugging face",
+    "google-cloud": "gcp",
+    "ci cd": "ci/cd",
+    "lang-chain": "langchain",
+}
+NOVEL_PHRASES = ["llmops", "prompt engineering", "vector databases", "agentic workflows"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=50_000)
+    parser.add_argument("--rate", type=float, default=0.1, help="Share of postings given a variant and a novel phrase")
+    parser.add_argument("--threshold", type=float, default=0.75)
+    parser.add_argument("--min-jobs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    mentions = []  # Variant skill injected into each posting (None if none)
+    descriptions = []
+    for job in generate_jobs(args.jobs, seed=args.seed):
+        description = job["description"]
+        skill = None
+        if rng.random() < args.rate:
+            variant = rng.choice(list(VARIANTS))
+            skill = VARIANTS[variant]
+            description += f". Hands-on {variant} is a must; {rng.choice(NOVEL_PHRASES)} is a plus."
+        mentions.append(skill)
+        descriptions.append(clean_description(description))
+    print(f"[BENCH] {len(descriptions):,} postings, {sum(m is not None for m in mentions):,} with a variant "
+          f"spelling, threshold {args.threshold}")
+
+    # Wide enough that single words rarely share a hash bucket (a collision reads as similarity 1)
+    embeddings = FakeEmbeddings(dim=4096)
+    with tempfile.TemporaryDirectory() as index_dir:
+        start = time.perf_counter()
+        index = SkillEmbeddingIndex.load_or_build(index_dir, embeddings.embed_documents, "fake")
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        SkillEmbeddingIndex.load_or_build(index_dir, embeddings.embed_documents, "fake")
+        loaded = time.perf_counter() - start
+    print(f"  ✓ skill index: {len(index.labels)} catalogue entries, built in {built * 1000:.1f}ms, "
+          f"loaded in {loaded * 1000:.1f}ms")
+
+    skills_list = extract_skills_batch(descriptions)
+    fuzzy = FuzzySkillPass(index, threshold=args.threshold, min_jobs=args.min_jobs,
+                           embed_fn=embeddings.embed_documents)
+    start = time.perf_counter()
+    for batch_start in range(0, len(descriptions), FUZZY_BATCH_SIZE):
+        fuzzy.add_batch(descriptions[batch_start:batch_start + FUZZY_BATCH_SIZE])
+    collected = time.perf_counter() - start
+    start = time.perf_counter()
+    fuzzy.resolve()
+    merged = fuzzy.merge(skills_list)
+    resolved = time.perf_counter() - start
+    print(f"  ✓ {len(descriptions) / collected:,.0f} postings/s collecting {len(fuzzy.phrase_ids):,} distinct "
+          f"phrases; {len(fuzzy.candidates):,} frequent phrases embedded and matched in {resolved:.2f}s")
+
+    missed = recovered = added = spurious = 0
+    for exact, both, skill in zip(skills_list, merged, mentions):
+        new = set(both) - set(exact)
+        added += len(new)
+        spurious += len(new - {skill})
+        if skill is not None and skill not in exact:
+            missed += 1
+            recovered += skill in new
+    print(f"  ✓ variant mentions missed by the regex: {missed:,}, recovered: {recovered / max(1, missed):.1%}")
+    print(f"  ✓ skills added: {added:,}, of which not mentioned in the posting: {spurious:,} "
+          f"(precision {(added - spurious) / max(1, added):.1%})")
+    print(f"  ✓ matched phrases: {sorted(fuzzy.matched_phrases().items())[:20]}")
+
+    # Synthetic filler words are frequent unmatched phrases too, so report where the novel ones rank
+    emerging = fuzzy.emerging_skills(top=len(fuzzy.candidates))
+    ranks = {candidate["phrase"]: rank for rank, candidate in enumerate(emerging, 1)}
+    top = [candidate["phrase"] for candidate in emerging[:len(NOVEL_PHRASES)]]
+    print(f"  ✓ novel phrases reported as emerging: {sum(p in ranks for p in NOVEL_PHRASES)}/{len(NOVEL_PHRASES)} "
+          f"(ranks {[ranks.get(p) for p in NOVEL_PHRASES]} of {len(emerging):,}), "
+          f"precision of the top {len(top)}: {sum(p in NOVEL_PHRASES for p in top) / max(1, len(top)):.0%}")
+    for candidate in emerging[:10]:
+        print(f"    {candidate['phrase']!r}: {candidate['jobs']} jobs, nearest {candidate['nearestSkill']!r} "
+              f"({candidate['similarity']:.2f})")
+
+
+if __name__ == "__main__":
+    main()
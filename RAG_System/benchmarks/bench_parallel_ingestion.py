@@ -0,0 +1,50 @@
+"""
+Scaling of parallel job ingestion (clean_jobs) across worker counts.
+
+Run from RAG_System:
+    python -m benchmarks.bench_parallel_ingestion --jobs 50000 --workers 1 2 4 8
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import generate_jobs
+from data_ingestion.job_cleaner import clean_jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=50_000, help="Number of synthetic job postings")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--words", type=int, default=400, help="Words per synthetic description")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    print(f"[BENCH] Generating {args.jobs} synthetic jobs ({os.cpu_count()} CPUs available)...")
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs_path = os.path.join(tmp, "jobs.json")
+        with open(jobs_path, "w") as f:
+            json.dump(generate_jobs(args.jobs, seed=args.seed, words_per_job=args.words), f)
+        
+        baseline = None
+        baseline_elapsed = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            result = clean_jobs(jobs_path, workers=workers)
+            elapsed = time.perf_counter() - start
+            
+            if baseline is None:
+                baseline, baseline_elapsed = result, elapsed
+            elif result != baseline:
+                raise SystemExit(f"  ❌ Output with {workers} workers differs from {args.workers[0]} worker(s)")
+            
+            print(f"  ✓ workers={workers}: {elapsed:.2f}s "
+                  f"({args.jobs / elapsed:,.0f} jobs/s, speedup x{baseline_elapsed / elapsed:.2f})")
+    
+    print("  ✓ Output identical for all worker counts")
+
+
+if __name__ == "__main__":
+    main()
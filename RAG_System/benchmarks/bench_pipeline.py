@@ -0,0 +1,220 @@
+"""
+End-to-end pipeline benchmark on a seeded synthetic corpus.
+
+Times every stage (process_curriculum, clean_jobs, extract_skills, trends,
+matching, VectorStore build/retrieve, analyze_gap) and records its peak
+traced memory, with deterministic stand-ins for the embedding model and the
+Gemini client. Writes a JSON report and can compare it with a stored
+baseline, flagging stages that got slower or hungrier.
+
+Run from RAG_System:
+    python -m benchmarks.bench_pipeline --jobs 1000 10000 --out report.json
+    python -m benchmarks.bench_pipeline --jobs 1000 10000 --baseline report.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.fake_embeddings import install_fake_embeddings
+from benchmarks.fake_llm import FakeGeminiModel
+from benchmarks.synthetic import write_corpus
+from data_ingestion.curriculum_processor import process_curriculum
+from data_ingestion.job_cleaner import clean_jobs, iter_jobs
+from rag.vector_store import VectorStore
+from reasoning.gap_analysis import analyze_gap
+from skill_engine.skill_extractor import extract_skills_batch
+from skill_engine.skill_matrix import JobSkillMatrix
+from skill_engine.skill_trends import calculate_trends, get_trending_skills, iter_matching_chunks
+
+REPORT_VERSION = 1
+DEFAULT_TOLERANCE = 0.25  # Flag stages more than 25% slower / bigger than the baseline
+MIN_SECONDS_DELTA = 0.05  # Ignore timing differences below this (noise)
+MIN_MB_DELTA = 1.0  # Ignore memory differences below this
+
+
+class StageRecorder:
+    """Times stages and records their peak traced memory and process max RSS."""
+
+    def __init__(self, trace_memory: bool = True, quiet: bool = True):
+        self.trace_memory = trace_memory
+        self.quiet = quiet
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str, **counts):
+        stats = dict(counts)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        output = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output) if self.quiet else contextlib.nullcontext():
+            yield stats
+        stats["seconds"] = round(time.perf_counter() - start, 4)
+        if self.trace_memory:
+            stats["peakMB"] = round((tracemalloc.get_traced_memory()[1] - traced_before) / 2**20, 2)
+        stats["maxRssMB"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        self.stages[name] = stats
+        print(f"  ✓ {name}: {stats['seconds']:.3f}s"
+              + (f", peak {stats['peakMB']:.1f} MB" if "peakMB" in stats else ""))
+
+
+def run_pipeline(n_jobs: int, args) -> dict:
+    recorder = StageRecorder(trace_memory=not args.no_memory)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"\n[BENCH] {n_jobs:,} postings")
+        with recorder.stage("generate_corpus", jobs=n_jobs, courses=args.courses):
+            paths = write_corpus(tmp, n_jobs, args.courses, args.instructors, args.seed, args.words)
+
+        with recorder.stage("process_curriculum") as stats:
+            curriculum, modules = process_curriculum(paths["curriculum.json"])
+            stats["modules"] = len(modules)
+
+        with recorder.stage("clean_jobs") as stats:
+            job_chunks, job_skills_list = clean_jobs(paths["jobs.json"])
+            stats["chunks"] = len(job_chunks)
+
+        # Skill extraction alone, on batches streamed from the file
+        with recorder.stage("extract_skills"):
+            batch = []
+            for job in iter_jobs(paths["jobs.json"]):
+                batch.append(job.get("description", ""))
+                if len(batch) == 1024:
+                    extract_skills_batch(batch)
+                    batch = []
+            extract_skills_batch(batch)
+
+        with recorder.stage("calculate_trends") as stats:
+            skill_matrix = JobSkillMatrix.from_skill_lists(job_skills_list)
+            skill_frequency = calculate_trends(skill_matrix)
+            trending_skills = get_trending_skills(skill_matrix, threshold=args.threshold)
+            stats["skills"] = len(skill_frequency)
+            stats["trending"] = len(trending_skills)
+
+        with recorder.stage("matching") as stats:
+            evidence = []
+            matched = 0
+            for chunk in iter_matching_chunks(job_chunks, trending_skills, skill_matrix):
+                matched += 1
+                if len(evidence) < 10:
+                    evidence.append(chunk)
+            stats["matched"] = matched
+
+        indexed = job_chunks[:args.index_chunks]
+        store = VectorStore(use_embedding_cache=False, index_type=args.index_type)
+        with recorder.stage("build_index", chunks=len(indexed), indexType=args.index_type):
+            store.build_index([c["text"] for c in indexed], [c["metadata"] for c in indexed])
+
+        queries = [m["text"] for m in modules][:args.queries]
+        with recorder.stage("retrieve", queries=len(queries)):
+            store.retrieve_batch(queries, k=10)
+
+        course = curriculum["courses"][0]
+        course_modules = [m for m in modules if m["metadata"]["courseId"] == course["id"]]
+        with recorder.stage("analyze_gap") as stats:
+            result = analyze_gap(course["courseName"], course["id"], evidence, course_modules,
+                                 trending_skills, skill_frequency, use_cache=False,
+                                 model=FakeGeminiModel(latency=0.0, jitter=0.0))
+            stats["modulesToAdd"] = len(result["modulesToAdd"])
+
+    return {
+        "jobs": n_jobs,
+        "totalSeconds": round(sum(s["seconds"] for s in recorder.stages.values()), 4),
+        "stages": recorder.stages,
+    }
+
+
+def compare_reports(report: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """
+    Compare stage timings and peak memory with a baseline report.
+
+    Returns:
+        List of regression descriptions (empty if none)
+    """
+    regressions = []
+    baseline_runs = {run["jobs"]: run for run in baseline.get("runs", [])}
+    for run in report["runs"]:
+        base = baseline_runs.get(run["jobs"])
+        if base is None:
+            continue
+        for name, stats in run["stages"].items():
+            base_stats = base["stages"].get(name)
+            if base_stats is None:
+                continue
+            for metric, min_delta, unit in (("seconds", MIN_SECONDS_DELTA, "s"), ("peakMB", MIN_MB_DELTA, " MB")):
+                if metric not in stats or metric not in base_stats:
+                    continue
+                now, before = stats[metric], base_stats[metric]
+                if now - before > min_delta and now > before * (1 + tolerance):
+                    regressions.append(
+                        f"{run['jobs']:,} jobs / {name}: {metric} {before}{unit} -> {now}{unit} "
+                        f"(+{(now / before - 1) * 100 if before else float('inf'):.0f}%)"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1_000, 10_000],
+                        help="Corpus sizes to run (e.g. 1000 10000 100000 1000000)")
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--instructors", type=int, default=50)
+    parser.add_argument("--words", type=int, default=120, help="Words per synthetic description")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--threshold", type=float, default=0.30, help="Trending skill threshold")
+    parser.add_argument("--index-type", default="flat")
+    parser.add_argument("--index-chunks", type=int, default=100_000,
+                        help="Cap on chunks embedded and indexed (fake embeddings still cost CPU)")
+    parser.add_argument("--queries", type=int, default=64)
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (faster, no peakMB)")
+    parser.add_argument("--out", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="Compare with this report and exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    install_fake_embeddings()
+    if not args.no_memory:
+        tracemalloc.start()
+
+    report = {
+        "version": REPORT_VERSION,
+        "config": {
+            key: getattr(args, key)
+            for key in ("courses", "instructors", "words", "seed", "threshold", "index_type", "index_chunks",
+                        "queries", "no_memory")
+        },
+        "machine": {"python": platform.python_version(), "cpus": os.cpu_count()},
+        "runs": [run_pipeline(n, args) for n in args.jobs],
+    }
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report saved to: {args.out}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != report["config"]:
+            print("⚠️  Baseline was recorded with a different configuration")
+        regressions = compare_reports(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) vs {args.baseline}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            raise SystemExit(1)
+        print(f"\n✓ No regressions vs {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Courses re-analysed after small job-board changes, with the artifact graph.
+
+Builds the per-course prompt fingerprints main.py records (each course's
+prompt as sent to the model, from its hybrid evidence and coverage) for a
+synthetic corpus, then appends postings one batch at a time and counts the courses
+whose analysis would rerun. Without the graph every course reruns.
+
+Run from RAG_System:
+    python -m benchmarks.bench_recompute --jobs 20000 --courses 20 --added 1 10 100
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.fake_embeddings import install_fake_embeddings
+from benchmarks.synthetic import generate_curriculum, generate_jobs
+from data_ingestion.curriculum_processor import process_curriculum
+from data_ingestion.job_cleaner import _process_descriptions, build_chunk_records
+from rag.coverage import CoverageEngine
+from rag.hybrid_retriever import HybridRetriever, retrieve_course_evidence
+from rag.vector_store import VectorStore
+from reasoning.artifact_graph import ArtifactGraph, trending_signature
+from reasoning.gap_analysis import build_prompt
+from skill_engine.skill_trends import calculate_trends, get_trending_skills
+
+
+def stale_courses(graph: ArtifactGraph, jobs: list, modules_by_course: dict, args) -> list:
+    """Record this corpus' fingerprints (as main.py does) and return the courses to re-analyse."""
+    skills_list, chunks_list = _process_descriptions([job["description"] for job in jobs])
+    chunks = [
+        chunk
+        for job_index, (job, skills, texts) in enumerate(zip(jobs, skills_list, chunks_list))
+        for chunk in build_chunk_records(job, skills, texts, job_index)
+    ]
+    skill_frequency = calculate_trends(skills_list)
+    trending = get_trending_skills(skill_frequency, len(jobs), threshold=args.threshold)
+    graph.record("trending", trending_signature(trending, skill_frequency))
+    graph.record("settings", {"threshold": args.threshold, "coverage": args.coverage,
+                              "tokenBudget": args.token_budget})
+
+    store = VectorStore(use_embedding_cache=False)
+    store.build_index([c["text"] for c in chunks], [c["metadata"] for c in chunks])
+    retriever = HybridRetriever(store)
+    all_modules = [module for modules in modules_by_course.values() for module in modules]
+    engine = CoverageEngine(store, all_modules) if args.coverage else None
+
+    stale = []
+    for course_id, modules in modules_by_course.items():
+        evidence = retrieve_course_evidence(retriever, modules, 3, 10)
+        coverage = engine.summary(course_id) if engine else None
+        prompt = build_prompt(evidence, modules, trending, skill_frequency, coverage=coverage,
+                              token_budget=args.token_budget)
+        graph.record(f"evidence:{course_id}", prompt)
+        graph.combine(f"prompt:{course_id}", ["trending", f"evidence:{course_id}", "settings"])
+        if graph.needs_update(f"result:{course_id}", [f"prompt:{course_id}"]):
+            stale.append(course_id)
+            graph.mark_built(f"result:{course_id}", [f"prompt:{course_id}"])
+    return stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=20_000)
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--added", type=int, nargs="+", default=[1, 10, 100],
+                        help="Postings appended before each rerun")
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--no-coverage", dest="coverage", action="store_false")
+    parser.add_argument("--token-budget", type=int, default=300, help="Prompt evidence budget (as main.py)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    install_fake_embeddings()
+    all_jobs = generate_jobs(args.jobs + sum(args.added), seed=args.seed)
+    jobs = all_jobs[:args.jobs]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "curriculum.json")
+        with open(path, "w") as f:
+            json.dump(generate_curriculum(args.courses, seed=args.seed), f)
+        _, modules = process_curriculum(path)
+        modules_by_course = {}
+        for module in modules:
+            modules_by_course.setdefault(module["metadata"]["courseId"], []).append(module)
+
+        graph = ArtifactGraph(os.path.join(tmp, "pipeline_state.db"))
+        print(f"[BENCH] {args.jobs:,} jobs, {len(modules_by_course)} courses, coverage {'on' if args.coverage else 'off'}")
+        start = time.perf_counter()
+        stale = stale_courses(graph, jobs, modules_by_course, args)
+        print(f"  ✓ first run: {len(stale)}/{len(modules_by_course)} courses analysed "
+              f"(fingerprints in {time.perf_counter() - start:.2f}s)")
+
+        stale = stale_courses(graph, jobs, modules_by_course, args)
+        print(f"  ✓ unchanged corpus: {len(stale)} courses re-analysed")
+
+        for added in args.added:
+            jobs = all_jobs[:len(jobs) + added]
+            stale = stale_courses(graph, jobs, modules_by_course, args)
+            print(f"  ✓ +{added} postings: {len(stale)}/{len(modules_by_course)} courses re-analysed {stale}")
+        graph.close()
+
+
+if __name__ == "__main__":
+    main()
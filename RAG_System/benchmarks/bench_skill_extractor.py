@@ -0,0 +1,33 @@
+"""
+Throughput of skill extraction on synthetic job descriptions.
+
+Output is checked against the original per-keyword matcher in
+tests/test_skill_extractor.py.
+
+Run from RAG_System:
+    python -m benchmarks.bench_skill_extractor --jobs 100000
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import generate_job_descriptions
+from skill_engine.skill_extractor import extract_skills_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=100_000, help="Number of synthetic job descriptions")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    print(f"[BENCH] Generating {args.jobs} synthetic job descriptions...")
+    texts = generate_job_descriptions(args.jobs, seed=args.seed)
+    
+    start = time.perf_counter()
+    extract_skills_batch(texts)
+    elapsed = time.perf_counter() - start
+    print(f"  ✓ extract_skills_batch: {elapsed:.2f}s ({args.jobs / elapsed:,.0f} jobs/s)")
+
+
+if __name__ == "__main__":
+    main()
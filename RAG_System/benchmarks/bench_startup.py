@@ -0,0 +1,94 @@
+"""
+Start-up cost of the pipeline entry points, measured in fresh interpreters.
+
+For each scenario this reports wall time, the slowest imports from
+`python -X importtime`, and whether the embedding model (langchain_huggingface /
+torch) or the Gemini SDK (google.generativeai) was imported. Run from RAG_System:
+    python -m benchmarks.bench_startup
+"""
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+RAG_DIR = Path(__file__).parent.parent
+
+HEAVY_MODULES = ("torch", "langchain_huggingface", "google.generativeai")
+
+SCENARIOS = {
+    "import main": "import main",
+    "trends only": (
+        "from data_ingestion.job_cleaner import iter_job_skills\n"
+        "from skill_engine.skill_matrix import JobSkillMatrix\n"
+        "from skill_engine.skill_trends import calculate_trends, get_trending_skills\n"
+        "matrix = JobSkillMatrix.from_skill_lists(iter_job_skills())\n"
+        "calculate_trends(matrix)\n"
+        "get_trending_skills(matrix)"
+    ),
+    "ingestion only": (
+        "import main\n"
+        "from data_ingestion.curriculum_processor import process_curriculum\n"
+        "from data_ingestion.job_cleaner import clean_jobs\n"
+        "process_curriculum()\n"
+        "clean_jobs()"
+    ),
+}
+
+# Appended to each scenario: report which heavy modules ended up loaded
+REPORT_HEAVY = (
+    "\nimport sys\n"
+    f"print('HEAVY:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+
+
+def parse_importtime(stderr: str, top: int) -> list:
+    """
+    Return the slowest imports from -X importtime output.
+    
+    Only the first two nesting levels are kept, so `main` and its direct
+    imports show up rather than every leaf module.
+    
+    Returns:
+        List of (cumulative microseconds, module name), slowest first
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative_us, module = line[len("import time:"):].split("|")
+        if not cumulative_us.strip().isdigit() or module.startswith("     "):
+            continue
+        rows.append((int(cumulative_us), module.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario (best is reported)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports to list")
+    args = parser.parse_args()
+    
+    for name, code in SCENARIOS.items():
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            proc = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", code + REPORT_HEAVY],
+                cwd=RAG_DIR, capture_output=True, text=True
+            )
+            elapsed = time.perf_counter() - start
+            if proc.returncode != 0:
+                raise SystemExit(f"  ❌ '{name}' failed:\n{proc.stderr[-2000:]}")
+            if best is None or elapsed < best[0]:
+                best = (elapsed, proc)
+        
+        elapsed, proc = best
+        heavy = next(line[6:] for line in proc.stdout.splitlines() if line.startswith("HEAVY:"))
+        print(f"[BENCH] {name}: {elapsed:.3f}s wall, heavy modules loaded: {heavy or 'none'}")
+        for cumulative_us, module in parse_importtime(proc.stderr, args.top):
+            print(f"    {cumulative_us / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Time to first recommendation: blocking vs streamed gap analysis.
+
+Uses the local stub client (benchmarks/fake_llm.py), which "generates" the
+response at a fixed rate, so the numbers reflect parsing strategy rather than
+network conditions. Also checks that both modes return the same modules and
+how many modules each recovers from a truncated response.
+
+Run from RAG_System:
+    python -m benchmarks.bench_streaming_analysis --modules 8 --chars-per-second 400
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.bench_batch_analysis import make_course_tasks
+from benchmarks.fake_llm import FakeGeminiModel
+from reasoning.gap_analysis import analyze_gap, iter_gap_analysis
+
+TRENDING = ["Python", "LLM", "RAG"]
+FREQUENCY = {"Python": 10, "LLM": 8, "RAG": 5}
+
+
+def run(model, stream: bool):
+    """Returns (result, seconds to first module, total seconds)."""
+    task = make_course_tasks(1)[0]
+    start = time.perf_counter()
+    first = []
+
+    def on_module(key, entry):
+        if not first:
+            first.append(time.perf_counter() - start)
+
+    result = analyze_gap(task["courseName"], task["courseId"], task["jobChunks"], task["modules"],
+                         TRENDING, FREQUENCY, use_cache=False, model=model, stream=stream, on_module=on_module)
+    total = time.perf_counter() - start
+    return result, (first[0] if first else None), total
+
+
+async def run_async(model):
+    task = make_course_tasks(1)[0]
+    start = time.perf_counter()
+    first = None
+    async for key, value in iter_gap_analysis(
+        course_name=task["courseName"], course_id=task["courseId"], retrieved_job_chunks=task["jobChunks"],
+        curriculum_modules=task["modules"], trending_skills=TRENDING, skill_frequency=FREQUENCY,
+        use_cache=False, model=model
+    ):
+        if first is None and key != "result":
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=8, help="Modules in the fake response")
+    parser.add_argument("--latency", type=float, default=0.5, help="Fake time to first token (s)")
+    parser.add_argument("--chars-per-second", type=float, default=400, help="Fake generation speed")
+    parser.add_argument("--truncate-at", type=float, default=0.6, help="Fraction kept in the truncation check")
+    args = parser.parse_args()
+
+    def model(truncate_at=None):
+        return FakeGeminiModel(latency=args.latency, jitter=0.0, modules=args.modules,
+                               chars_per_second=args.chars_per_second, truncate_at=truncate_at)
+
+    blocking, blocking_first, blocking_total = run(model(), stream=False)
+    streamed, streamed_first, streamed_total = run(model(), stream=True)
+    async_first, async_total = asyncio.run(run_async(model()))
+
+    print(f"\n[BENCH] blocking: first recommendation {blocking_first:.2f}s, total {blocking_total:.2f}s")
+    print(f"[BENCH] streamed: first recommendation {streamed_first:.2f}s, total {streamed_total:.2f}s "
+          f"(x{blocking_first / streamed_first:.1f} sooner)")
+    print(f"[BENCH] async iterator: first recommendation {async_first:.2f}s, total {async_total:.2f}s")
+
+    if streamed["modulesToAdd"] != blocking["modulesToAdd"]:
+        raise SystemExit("  ❌ Streamed result differs from the blocking result")
+    print("  ✓ Streamed and blocking results are identical")
+
+    truncated_blocking, _, _ = run(model(args.truncate_at), stream=False)
+    truncated_streamed, _, _ = run(model(args.truncate_at), stream=True)
+    print(f"[BENCH] truncated at {args.truncate_at:.0%}: blocking kept "
+          f"{len(truncated_blocking['modulesToAdd'])} modules"
+          f"{' (error)' if truncated_blocking.get('error') else ''}, "
+          f"streamed kept {len(truncated_streamed['modulesToAdd'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import re
+import zlib
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class FakeEmbeddings:
+    """
+    Deterministic, offline stand-in for HuggingFaceEmbeddings.
+
+    Each word token is hashed to one of `dim` signed buckets (feature
+    hashing) and the vector is L2-normalised, so texts sharing words are
+    close, results are identical across runs and no model is loaded.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self._buckets = {}  # token -> (bucket, sign), filled as tokens are seen
+
+    def _bucket(self, token: str):
+        bucket = self._buckets.get(token)
+        if bucket is None:
+            h = zlib.crc32(token.encode("utf-8"))
+            bucket = self._buckets[token] = (h % self.dim, 1.0 if h & 0x80000000 else -1.0)
+        return bucket
+
+    def embed_documents(self, texts):
+        rows, buckets, signs = [], [], []
+        for row, text in enumerate(texts):
+            for token in TOKEN_PATTERN.findall(text.lower()):
+                bucket, sign = self._buckets.get(token) or self._bucket(token)
+                rows.append(row)
+                buckets.append(bucket)
+                signs.append(sign)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(vectors, (np.array(rows, dtype=np.int64), np.array(buckets, dtype=np.int64)),
+                  np.array(signs, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def install_fake_embeddings(dim: int = 384) -> FakeEmbeddings:
+    """Make rag.vector_store use FakeEmbeddings instead of loading the real model."""
+    import rag.vector_store as vector_store
+    vector_store._embeddings = FakeEmbeddings(dim)
+    return vector_store._embeddings
@@ -0,0 +1,91 @@
+import json
+import random
+import threading
+import time
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """
+    Offline stand-in for a Gemini GenerativeModel.
+
+    generate_content sleeps for a random latency and then either returns a
+    valid gap analysis JSON, raises (simulating 429/5xx errors) or hangs past
+    any reasonable timeout. Outcomes are drawn from a seeded RNG.
+
+    With chars_per_second set, the response body also takes time to
+    generate: stream=True yields it in chunk_chars pieces as it is
+    "generated", otherwise the whole body is returned at the end.
+    truncate_at cuts the body to that fraction (like a max token stop).
+    """
+
+    model_name = "fake-gemini"
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.2, error_rate: float = 0.0,
+                 hang_rate: float = 0.0, hang_seconds: float = 3600.0, seed: int = 0,
+                 modules: int = 1, chars_per_second: float = None, chunk_chars: int = 40,
+                 truncate_at: float = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.modules = modules
+        self.chars_per_second = chars_per_second
+        self.chunk_chars = chunk_chars
+        self.truncate_at = truncate_at
+        self.calls = 0
+        self.errors = 0
+        self.hangs = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self):
+        with self._lock:
+            self.calls += 1
+            roll = self._rng.random()
+            delay = max(0.0, self._rng.uniform(self.latency - self.jitter, self.latency + self.jitter))
+            if roll < self.hang_rate:
+                self.hangs += 1
+                return "hang", self.hang_seconds
+            if roll < self.hang_rate + self.error_rate:
+                self.errors += 1
+                return "error", delay
+            return "ok", delay
+
+    def response_text(self, prompt: str) -> str:
+        text = json.dumps({
+            "modulesToDelete": [],
+            "modulesToAdd": [
+                {"title": f"Fake Module {i + 1}", "skills": ["Python", "LLM"],
+                 "reason": f"Prompt of {len(prompt)} chars"}
+                for i in range(self.modules)
+            ]
+        }, indent=2)
+        if self.truncate_at is not None:
+            text = text[:int(len(text) * self.truncate_at)]
+        return text
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        outcome, delay = self._draw()
+        time.sleep(delay)
+        if outcome != "ok":
+            raise RuntimeError("429 Resource has been exhausted (fake)")
+
+        text = self.response_text(prompt)
+        if stream:
+            return self._stream(text)
+        if self.chars_per_second:
+            time.sleep(len(text) / self.chars_per_second)
+        return FakeResponse(text)
+
+    def _stream(self, text: str):
+        for start in range(0, len(text), self.chunk_chars):
+            piece = text[start:start + self.chunk_chars]
+            if self.chars_per_second:
+                time.sleep(len(piece) / self.chars_per_second)
+            yield FakeResponse(piece)
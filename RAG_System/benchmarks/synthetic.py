@@ -0,0 +1,226 @@
+import json
+import os
+import random
+from typing import Iterator
+
+from skill_engine.skill_extractor import TECH_SKILLS_DB
+
+# Filler vocabulary for synthetic job descriptions
+FILLER_WORDS = [
+    "we", "are", "looking", "for", "an", "engineer", "to", "build", "and", "deploy",
+    "scalable", "systems", "with", "strong", "experience", "in", "the", "team", "will",
+    "work", "on", "production", "solutions", "design", "responsibilities", "requirements",
+    "tools", "develop", "models", "data", "services", "cloud", "platform", "customers",
+    "collaborate", "cross-functional", "ownership", "problem", "solving", "skills",
+]
+
+TITLES = [
+    "AI Engineer", "ML Engineer", "Data Scientist", "Backend Developer",
+    "Data Engineer", "MLOps Engineer", "GenAI Engineer", "Full Stack Developer",
+]
+
+COURSE_TOPICS = [
+    "Generative AI", "Machine Learning", "Data Engineering", "Cloud Computing",
+    "Web Development", "DevOps", "Deep Learning", "Natural Language Processing",
+    "Computer Vision", "Python Programming", "Databases", "MLOps",
+]
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+FIRST_NAMES = ["Alex", "Priya", "Ravi", "Sara", "Chen", "Ananya", "Omar", "Maria", "Kiran", "Lee"]
+LAST_NAMES = ["Chen", "Rao", "Sharma", "Khan", "Garcia", "Iyer", "Smith", "Reddy", "Patel", "Kim"]
+# Expertise that is not a TECH_SKILLS_DB skill, as in data/instructors.json
+SOFT_EXPERTISE = ["Software Architecture", "Clean Code", "Mentoring", "System Design", "Agile"]
+
+
+def iter_job_descriptions(n: int, seed: int = 42, words_per_job: int = 120) -> Iterator[str]:
+    """Lazily yield the descriptions of generate_job_descriptions (same seed -> same text)."""
+    rng = random.Random(seed)
+    keywords = [kw for kws in TECH_SKILLS_DB.values() for kw in kws]
+    
+    for _ in range(n):
+        words = rng.choices(FILLER_WORDS, k=words_per_job)
+        for _ in range(rng.randint(3, 12)):
+            keyword = rng.choice(keywords)
+            # Vary casing and punctuation around keywords
+            if rng.random() < 0.3:
+                keyword = keyword.title()
+            words.insert(rng.randrange(len(words) + 1), keyword + rng.choice(["", ",", ".", ""]))
+        yield " ".join(words)
+
+
+def generate_job_descriptions(n: int, seed: int = 42, words_per_job: int = 120) -> list[str]:
+    """
+    Generate n synthetic job descriptions mixing filler text and skill keywords.
+    
+    Args:
+        n: Number of descriptions
+        seed: Random seed (same seed -> same corpus)
+        words_per_job: Approximate description length in words
+        
+    Returns:
+        List of description strings
+    """
+    return list(iter_job_descriptions(n, seed, words_per_job))
+
+
+def iter_synthetic_jobs(n: int, seed: int = 42, words_per_job: int = 120) -> Iterator[dict]:
+    """Lazily yield the postings of generate_jobs, so millions never sit in memory at once."""
+    rng = random.Random(seed)
+    for i, description in enumerate(iter_job_descriptions(n, seed=seed, words_per_job=words_per_job)):
+        yield {
+            "id": 1_700_000_000_000 + i,
+            "title": rng.choice(TITLES),
+            "description": description,
+            "company": f"Company {rng.randrange(max(1, n // 10))}",
+            "location": rng.choice(["Hyderabad", "Bengaluru", "Pune", "Chennai", "Remote"]),
+            "salary": "",
+            "jobType": rng.choice(["Full-time", "Part-time", "Internship"]),
+            "postedAt": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00.000Z",
+        }
+
+
+def generate_jobs(n: int, seed: int = 42, words_per_job: int = 120) -> list[dict]:
+    """
+    Generate n synthetic job postings shaped like data/jobs.json entries.
+    
+    Args:
+        n: Number of postings
+        seed: Random seed (same seed -> same corpus)
+        words_per_job: Approximate description length in words
+        
+    Returns:
+        List of job dicts
+    """
+    return list(iter_synthetic_jobs(n, seed, words_per_job))
+
+
+def inject_near_duplicates(jobs: list, rate: float = 0.2, edits: int = 2, seed: int = 42):
+    """
+    Repost a share of the jobs, as job boards do.
+    
+    Each repost copies an earlier posting's description under a new id and
+    company, with `edits` words replaced, dropped or re-cased and random
+    whitespace changes, and is inserted at a random later position.
+    
+    Returns:
+        jobs: The postings with reposts mixed in
+        origin: List (one per posting) of the index of the original posting
+            for reposts, None for originals
+    """
+    rng = random.Random(seed)
+    keyed = [(float(i), job, None) for i, job in enumerate(jobs)]
+    for copy_id in range(int(len(jobs) * rate)):
+        source = rng.randrange(len(jobs))
+        words = jobs[source]["description"].split()
+        for _ in range(edits):
+            position = rng.randrange(len(words))
+            action = rng.random()
+            if action < 0.4:
+                words[position] = rng.choice(FILLER_WORDS)
+            elif action < 0.7 and len(words) > 1:
+                del words[position]
+            else:
+                words[position] = words[position].upper()
+        description = "".join(word + rng.choice([" ", " ", "  ", "\n"]) for word in words)
+        repost = dict(jobs[source], id=2_700_000_000_000 + copy_id, description=description,
+                      company=f"Recruiter {rng.randrange(100)}")
+        # Sort key after the original's, so reposts always come later
+        keyed.append((rng.uniform(source + 0.5, len(jobs)), repost, source))
+    keyed.sort(key=lambda item: item[0])
+    
+    position_of = {int(key): i for i, (key, _, source) in enumerate(keyed) if source is None}
+    return [job for _, job, _ in keyed], [None if source is None else position_of[source] for _, _, source in keyed]
+
+
+def generate_curriculum(n_courses: int, modules_per_course: int = 8, seed: int = 42) -> dict:
+    """
+    Generate a curriculum shaped like data/curriculum.json.
+    
+    Module descriptions mention 1-4 catalogue skills, so skill extraction and
+    matching have realistic work to do.
+    """
+    rng = random.Random(seed)
+    keywords = [kw for kws in TECH_SKILLS_DB.values() for kw in kws]
+    skills = list(TECH_SKILLS_DB)
+    
+    courses = []
+    for course_id in range(1, n_courses + 1):
+        topic = COURSE_TOPICS[(course_id - 1) % len(COURSE_TOPICS)]
+        modules = []
+        for module_id in range(1, modules_per_course + 1):
+            mentioned = rng.sample(keywords, rng.randint(1, 4))
+            filler = rng.choices(FILLER_WORDS, k=rng.randint(6, 20))
+            modules.append({
+                "id": module_id,
+                "title": f"{rng.choice(skills).title()} {rng.choice(['Basics', 'in Practice', 'Deep Dive', 'Projects'])}",
+                "shortDescription": " ".join(filler[:5]).capitalize() + ".",
+                "duration": f"{rng.choice([1, 1.5, 2, 2.5])} hours",
+                "lessons": rng.randint(4, 12),
+                "fullDescription": " ".join(filler + mentioned),
+            })
+        courses.append({
+            "id": course_id,
+            "courseName": topic if course_id <= len(COURSE_TOPICS) else f"{topic} {course_id}",
+            "description": f"Learn {topic.lower()} from the ground up.",
+            "instructor": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "duration": f"{rng.randint(4, 12)} weeks",
+            "level": rng.choice(LEVELS),
+            "enrolled": f"{rng.randint(100, 9999):,} students",
+            "modules": modules,
+        })
+    return {"courses": courses}
+
+
+def generate_instructors(n: int, course_names: list = None, seed: int = 42) -> dict:
+    """Generate instructors shaped like data/instructors.json (expertise mixes catalogue and soft skills)."""
+    rng = random.Random(seed)
+    skills = list(TECH_SKILLS_DB)
+    course_names = course_names or COURSE_TOPICS
+    
+    instructors = []
+    for instructor_id in range(1, n + 1):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        expertise = [skill.title() if len(skill) > 3 else skill.upper() for skill in rng.sample(skills, rng.randint(2, 6))]
+        expertise += rng.sample(SOFT_EXPERTISE, rng.randint(0, 2))
+        instructors.append({
+            "id": instructor_id,
+            "name": name,
+            "title": f"{rng.choice(['Senior', 'Lead', 'Principal'])} {rng.choice(TITLES)} & Instructor",
+            "bio": f"{name} has {rng.randint(3, 20)}+ years of industry experience.",
+            "image": f"https://api.dicebear.com/7.x/avataaars/svg?seed={instructor_id}",
+            "email": f"instructor{instructor_id}@academy.com",
+            "expertise": expertise,
+            "rating": round(rng.uniform(4.0, 5.0), 1),
+            "reviews": rng.randint(10, 5000),
+            "students": f"{rng.randint(1, 99)}K+",
+            "courses": rng.sample(course_names, min(len(course_names), rng.randint(1, 3))),
+        })
+    return {"instructors": instructors}
+
+
+def write_corpus(out_dir: str, n_jobs: int, n_courses: int = 20, n_instructors: int = 50,
+                 seed: int = 42, words_per_job: int = 120) -> dict:
+    """
+    Write jobs.json, curriculum.json and instructors.json to out_dir.
+    
+    Jobs are written one posting at a time, so even 1M postings need little memory.
+    
+    Returns:
+        Dict of file name -> path
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {name: os.path.join(out_dir, name) for name in ("jobs.json", "curriculum.json", "instructors.json")}
+    
+    with open(paths["jobs.json"], "w") as f:
+        f.write("[")
+        for i, job in enumerate(iter_synthetic_jobs(n_jobs, seed, words_per_job)):
+            f.write(("," if i else "") + "\n" + json.dumps(job))
+        f.write("\n]\n")
+    
+    curriculum = generate_curriculum(n_courses, seed=seed)
+    with open(paths["curriculum.json"], "w") as f:
+        json.dump(curriculum, f, indent=2)
+    
+    course_names = [course["courseName"] for course in curriculum["courses"]]
+    with open(paths["instructors.json"], "w") as f:
+        json.dump(generate_instructors(n_instructors, course_names, seed=seed), f, indent=2)
+    return paths
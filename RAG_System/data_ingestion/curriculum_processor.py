@@ -1,49 +1,70 @@
 import json
 from pathlib import Path
-from skill_engine.skill_extractor import extract_skills
+from data_ingestion.parallel import imap_ordered
+from skill_engine.skill_extractor import extract_skills_batch
 
-def process_curriculum(curriculum_path: str = None):
+DEFAULT_CURRICULUM_PATH = Path(__file__).parent.parent.parent / "data" / "curriculum.json"
+MODULE_BATCH_SIZE = 256  # Module descriptions per worker task in parallel mode
+
+def process_curriculum(curriculum_path: str = None, workers: int = 1):
     """
     Process curriculum JSON and extract all modules with metadata.
     
+    Args:
+        curriculum_path: Path to curriculum.json (defaults to data/curriculum.json)
+        workers: Number of processes used for skill extraction (1 = in-process).
+            Module order is the same for any value.
+    
     Returns:
         curriculum_dict: Original curriculum data
         all_modules: List of module chunks with metadata
     """
     if curriculum_path is None:
-        curriculum_path = Path(__file__).parent.parent.parent / "data" / "curriculum.json"
+        curriculum_path = DEFAULT_CURRICULUM_PATH
     
     with open(curriculum_path) as f:
         curriculum = json.load(f)
     
     all_modules = []
     
-    # Process each course
-    for course in curriculum.get("courses", []):
+    course_modules = [
+        (course, module)
+        for course in curriculum.get("courses", [])
+        for module in course.get("modules", [])
+    ]
+    
+    # Extract skills from all module descriptions in batches
+    descriptions = [module.get("fullDescription", "") for _, module in course_modules]
+    tasks = (
+        (None, descriptions[start:start + MODULE_BATCH_SIZE])
+        for start in range(0, len(descriptions), MODULE_BATCH_SIZE)
+    )
+    all_module_skills = [
+        skills
+        for _, batch_skills in imap_ordered(extract_skills_batch, tasks, workers)
+        for skills in batch_skills
+    ]
+    
+    # Process each module of each course
+    for (course, module), module_skills in zip(course_modules, all_module_skills):
         course_id = course.get("id")
         course_name = course.get("courseName", "")
+        module_id = module.get("id")
+        module_title = module.get("title", "")
+        module_desc = module.get("fullDescription", "")
         
-        # Process each module in the course
-        for module in course.get("modules", []):
-            module_id = module.get("id")
-            module_title = module.get("title", "")
-            module_desc = module.get("fullDescription", "")
-            
-            # Extract skills from module description
-            module_skills = extract_skills(module_desc)
-            
-            module_chunk = {
-                "text": f"{module_title}\n{module_desc}",
-                "metadata": {
-                    "courseId": course_id,
-                    "courseName": course_name,
-                    "moduleId": module_id,
-                    "moduleTitle": module_title,
-                    "moduleSkills": module_skills,
-                    "shortDescription": module.get("shortDescription", "")
-                }
+        module_chunk = {
+            "text": f"{module_title}\n{module_desc}",
+            "metadata": {
+                "courseId": course_id,
+                "courseName": course_name,
+                "moduleId": module_id,
+                "moduleTitle": module_title,
+                "moduleSkills": module_skills,
+                "shortDescription": module.get("shortDescription", "")
             }
-            
-            all_modules.append(module_chunk)
+        }
+        
+        all_modules.append(module_chunk)
     
     return curriculum, all_modules
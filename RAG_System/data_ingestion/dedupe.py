@@ -0,0 +1,224 @@
+import string
+import zlib
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from data_ingestion.job_table import clean_description
+
+DEFAULT_DEDUPE_THRESHOLD = 0.8  # Estimated Jaccard similarity of shingle sets at which a posting is a duplicate
+DEFAULT_NUM_PERM = 64  # MinHash permutations (signature length); estimate error ~ 1 / sqrt(num_perm)
+DEFAULT_BANDS = 16  # LSH bands of num_perm / bands rows; pairs above ~(1 / bands) ** (rows / num_perm) become candidates
+DEFAULT_SHINGLE_SIZE = 5  # Words per shingle
+DEDUPE_BATCH_SIZE = 256  # Postings hashed together
+
+PUNCTUATION_TO_SPACE = str.maketrans(string.punctuation, " " * len(string.punctuation))
+MERSENNE_PRIME = (1 << 61) - 1
+SHINGLE_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+class DuplicateDetector:
+    """
+    Streaming near-duplicate detection over job descriptions (MinHash + LSH).
+
+    Each cleaned description is reduced to its set of word shingles and a
+    MinHash signature of num_perm values; the share of equal values between
+    two signatures estimates the Jaccard similarity of their shingle sets.
+    Signatures are split into bands, and postings sharing a whole band land
+    in the same bucket, so only bucket mates are compared: a posting is
+    checked against a handful of candidates instead of every earlier one.
+
+    Postings are added in order and the first of a group is kept: canonical
+    holds, per posting seen, its own position or the position of the earlier
+    posting it duplicates. Only kept postings are stored (signature plus one
+    bucket entry per band, ~100 bytes per band).
+    """
+
+    def __init__(self, threshold: float = DEFAULT_DEDUPE_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                 bands: int = DEFAULT_BANDS, shingle_size: int = DEFAULT_SHINGLE_SIZE, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)  # odd
+        self._b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(1, MERSENNE_PRIME, size=self.rows, dtype=np.uint64)
+        self._word_ids = {}  # word -> row of _word_hash_table
+        self._word_hash_table = np.zeros(0, dtype=np.uint64)
+
+        self.canonical = []
+        self._positions = []  # Position of each stored (kept) signature
+        self._signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self._buckets = [{} for _ in range(bands)]  # band hash -> stored row, or list of rows
+
+    @property
+    def kept(self) -> list:
+        """Per posting seen: True if it is not a duplicate of an earlier one."""
+        return [position == canonical for position, canonical in enumerate(self.canonical)]
+
+    @property
+    def duplicates(self) -> int:
+        return len(self.canonical) - len(self._positions)
+
+    def shingles(self, descriptions: list):
+        """
+        32-bit word-shingle hashes of cleaned descriptions.
+
+        Returns:
+            doc_ids, hashes: Parallel arrays (int64, uint64), grouped by
+            description in order; a repeated shingle is listed once per
+            occurrence (MinHash only takes minima, so that is harmless)
+        """
+        word_ids = self._word_ids
+        lengths, words = [], []
+        for description in descriptions:
+            description_words = description.lower().translate(PUNCTUATION_TO_SPACE).split()
+            lengths.append(len(description_words))
+            words.extend(description_words)
+        ids = list(map(word_ids.get, words))
+        if None in ids:
+            for i, word_id in enumerate(ids):
+                if word_id is None:
+                    ids[i] = word_ids.setdefault(words[i], len(word_ids))
+        if not ids:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint64)
+        self._extend_word_hashes()
+        word_hashes = self._word_hash_table[np.array(ids, dtype=np.int64)]
+        lengths = np.array(lengths, dtype=np.int64)
+        word_docs = np.repeat(np.arange(len(descriptions)), lengths)
+
+        # Shingle starting at word i covers words i..i+size-1 of the same description;
+        # a description shorter than size contributes one shingle of all its words
+        first = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        offset = np.arange(len(ids)) - first[word_docs]
+        length = lengths[word_docs]
+        size = np.minimum(self.shingle_size, length)
+        starts = offset <= length - size
+        hashes = word_hashes.copy()
+        for step in range(1, self.shingle_size):
+            following = np.zeros_like(hashes)
+            following[:-step] = word_hashes[step:]
+            # Words beyond the shingle's own size contribute nothing
+            hashes = np.where(step < size, hashes * SHINGLE_MULTIPLIER + following, hashes)  # wraps mod 2**64
+        hashes = hashes[starts]
+        return word_docs[starts], (hashes >> np.uint64(32)) ^ (hashes & np.uint64(0xFFFFFFFF))
+
+    def signatures(self, descriptions: list) -> np.ndarray:
+        """
+        MinHash signatures of cleaned descriptions.
+
+        Returns:
+            uint32 array (descriptions x num_perm); a description without
+            words gets an all-0xFFFFFFFF row (never reported as a duplicate)
+        """
+        signatures = np.full((len(descriptions), self.num_perm), 0xFFFFFFFF, dtype=np.uint32)
+        doc_ids, hashes = self.shingles(descriptions)
+        if not len(hashes):
+            return signatures
+        # Multiply-shift hashing: the high 32 bits of a * x + b (mod 2**64), one (a, b) per permutation.
+        # Permutations x shingles, so each permutation's minima are taken over contiguous memory
+        permuted = self._a[:, None] * hashes
+        permuted += self._b[:, None]
+        starts = np.flatnonzero(np.diff(doc_ids, prepend=-1))
+        rows = doc_ids[starts]
+        minima = np.minimum.reduceat(permuted, starts, axis=1) >> np.uint64(32)
+        signatures[rows] = minima.T
+        return signatures
+
+    def add_batch(self, descriptions: list) -> list:
+        """
+        Add cleaned descriptions in order.
+
+        Returns:
+            Canonical position of each description (its own when it is kept)
+        """
+        signatures = self.signatures(descriptions)
+        band_keys = self._band_keys(signatures)
+        result = []
+        for signature, keys in zip(signatures, band_keys):
+            position = len(self.canonical)
+            match = None if (signature == 0xFFFFFFFF).all() else self._find(signature, keys)
+            if match is None:
+                self._store(signature, keys, position)
+                canonical = position
+            else:
+                canonical = self._positions[match]
+            self.canonical.append(canonical)
+            result.append(canonical)
+        return result
+
+    def filter(self, jobs: Iterable[dict], batch_size: int = DEDUPE_BATCH_SIZE) -> Iterator[dict]:
+        """Yield the jobs that are not near-duplicates of an earlier job, in order."""
+        seen = 0
+        batch = []
+        for job in jobs:
+            batch.append(job)
+            if len(batch) >= batch_size:
+                yield from self._filter_batch(batch)
+                seen += len(batch)
+                batch = []
+        if batch:
+            yield from self._filter_batch(batch)
+            seen += len(batch)
+        print(f"  ✓ Near-duplicate postings dropped: {self.duplicates} of {seen}")
+
+    def _filter_batch(self, jobs: list) -> Iterator[dict]:
+        start = len(self.canonical)
+        canonical = self.add_batch([clean_description(job.get("description", "")) for job in jobs])
+        for offset, (job, position) in enumerate(zip(jobs, canonical)):
+            if position == start + offset:
+                yield job
+
+    def _extend_word_hashes(self):
+        """CRC32 of the words added to _word_ids since the last call (stable across runs and processes)."""
+        known = len(self._word_hash_table)
+        if known < len(self._word_ids):
+            new_words = list(self._word_ids)[known:]
+            new_hashes = np.fromiter((zlib.crc32(word.encode("utf-8")) for word in new_words),
+                                     dtype=np.uint64, count=len(new_words))
+            self._word_hash_table = np.concatenate((self._word_hash_table, new_hashes))
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """One 64-bit key per (signature, band)."""
+        banded = signatures.astype(np.uint64).reshape(len(signatures), self.bands, self.rows)
+        return (banded * self._band_mix).sum(axis=2)  # wraps mod 2**64
+
+    def _find(self, signature: np.ndarray, keys: np.ndarray):
+        """Stored row of the most similar bucket mate at or above threshold, else None."""
+        candidates = set()
+        for buckets, key in zip(self._buckets, keys.tolist()):
+            rows = buckets.get(key)
+            if rows is None:
+                continue
+            if isinstance(rows, list):
+                candidates.update(rows)
+            else:
+                candidates.add(rows)
+        if not candidates:
+            return None
+        candidates = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        similarity = (self._signatures[candidates] == signature).mean(axis=1)
+        best = int(np.argmax(similarity))
+        return int(candidates[best]) if similarity[best] >= self.threshold else None
+
+    def _store(self, signature: np.ndarray, keys: np.ndarray, position: int):
+        row = len(self._positions)
+        if row == len(self._signatures):
+            grown = np.zeros((max(1024, 2 * row), self.num_perm), dtype=np.uint32)
+            grown[:row] = self._signatures[:row]
+            self._signatures = grown
+        self._signatures[row] = signature
+        self._positions.append(position)
+        for buckets, key in zip(self._buckets, keys.tolist()):
+            rows = buckets.get(key)
+            if rows is None:
+                buckets[key] = row
+            elif isinstance(rows, list):
+                rows.append(row)
+            else:
+                buckets[key] = [rows, row]
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+
+DEFAULT_STATE_PATH = Path(__file__).parent.parent.parent / "data" / "ingestion_state.db"
+
+
+def content_hash(text: str, salt: str = "") -> str:
+    """Stable hash of a job description (plus a processing signature salt)."""
+    return hashlib.sha256((salt + "\0" + text).encode("utf-8")).hexdigest()
+
+
+class IngestionState:
+    """
+    Persistent per-job ingestion results stored in SQLite.
+
+    Each row is keyed by the job id and remembers the hash of the description
+    it was computed from, the extracted skills and the chunks (JSON; the
+    job cleaner stores the cleaned description and its chunk spans). A job
+    whose hash is unchanged can reuse its row instead of being cleaned,
+    skill-matched and chunked again.
+    """
+
+    def __init__(self, state_path: str = None):
+        if state_path is None:
+            state_path = DEFAULT_STATE_PATH
+        Path(state_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(state_path))
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                job_key TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                skills TEXT NOT NULL,
+                chunks TEXT NOT NULL
+            )"""
+        )
+        self.conn.commit()
+
+    def get_many(self, keys: list) -> dict:
+        """
+        Load the stored jobs for a batch of keys.
+
+        Returns:
+            Dict of job_key: (content_hash, skills, chunks) for keys that exist
+        """
+        found = {}
+        keys = list(keys)
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT job_key, content_hash, skills, chunks FROM jobs WHERE job_key IN ({','.join('?' * len(batch))})",
+                batch
+            )
+            for key, digest, skills, chunks in rows:
+                found[key] = (digest, json.loads(skills), json.loads(chunks))
+        return found
+
+    def upsert(self, entries: list):
+        """
+        Insert or replace processed jobs.
+
+        Args:
+            entries: List of (job_key, content_hash, skills, chunks) tuples
+        """
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO jobs (job_key, content_hash, skills, chunks) VALUES (?, ?, ?, ?)",
+            [(key, digest, json.dumps(skills), json.dumps(chunks)) for key, digest, skills, chunks in entries]
+        )
+        self.conn.commit()
+
+    def prune(self, live_keys) -> int:
+        """
+        Delete jobs that are no longer present in the jobs file.
+
+        Returns:
+            Number of deleted rows
+        """
+        live_keys = set(live_keys)
+        stale = [
+            (key,) for (key,) in self.conn.execute("SELECT job_key FROM jobs")
+            if key not in live_keys
+        ]
+        if stale:
+            self.conn.executemany("DELETE FROM jobs WHERE job_key = ?", stale)
+            self.conn.commit()
+        return len(stale)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
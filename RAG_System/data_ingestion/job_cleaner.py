@@ -1,7 +1,26 @@
 import json
-import re
+from functools import partial
 from pathlib import Path
-from skill_engine.skill_extractor import extract_skills
+from typing import Iterable, Iterator
+from data_ingestion.dedupe import DuplicateDetector
+from data_ingestion.ingestion_state import IngestionState, content_hash
+from data_ingestion.job_table import JobTable, chunk_spans, clean_description
+from data_ingestion.json_stream import iter_json_records
+from data_ingestion.parallel import imap_ordered
+from skill_engine.skill_extractor import TECH_SKILLS_DB, extract_skills_batch
+
+DEFAULT_JOBS_PATH = Path(__file__).parent.parent.parent / "data" / "jobs.json"
+
+JOB_CHUNK_SIZE = 300
+JOB_CHUNK_OVERLAP = 50
+JOB_BATCH_SIZE = 256  # Postings processed together when streaming
+
+# Stored ingestion results are only valid for the same chunking, skill database and
+# stored shape (cleaned description + chunk spans)
+PROCESSING_SIGNATURE = content_hash(
+    json.dumps(TECH_SKILLS_DB, sort_keys=True),
+    f"chunk={JOB_CHUNK_SIZE}/{JOB_CHUNK_OVERLAP};spans"
+)
 
 def chunk_text(text: str, chunk_size: int = 400, overlap: int = 50) -> list[str]:
     """
@@ -25,53 +44,274 @@ def chunk_text(text: str, chunk_size: int = 400, overlap: int = 50) -> list[str]
     
     return chunks
 
-def clean_jobs(jobs_file_path: str = None):
+def _process_descriptions(descriptions: list[str], compact: bool = False):
+    """
+    Clean, skill-match and chunk raw job descriptions.
+    
+    Args:
+        compact: Return each job's cleaned description and chunk (start, end)
+            spans instead of chunk text copies (what JobTable.add_job stores)
+    
+    Returns:
+        skills_list: List of skill lists, one per description
+        chunks_list: List of chunk text lists, one per description, or of
+            (cleaned description, spans) pairs when compact
+    """
+    # Clean descriptions
+    clean_descs = [clean_description(description) for description in descriptions]
+    
+    # Extract skills from full job descriptions in one batch
+    skills_list = extract_skills_batch(clean_descs)
+    
+    # Chunk the job descriptions (200-500 tokens ~ 150-375 words)
+    if compact:
+        chunks_list = [
+            (clean_desc, chunk_spans(clean_desc, JOB_CHUNK_SIZE, JOB_CHUNK_OVERLAP))
+            for clean_desc in clean_descs
+        ]
+    else:
+        chunks_list = [
+            chunk_text(clean_desc, chunk_size=JOB_CHUNK_SIZE, overlap=JOB_CHUNK_OVERLAP)
+            for clean_desc in clean_descs
+        ]
+    
+    return skills_list, chunks_list
+
+def _span_texts(description: str, spans) -> list[str]:
+    """Chunk texts of a cleaned description from its chunk spans."""
+    return [description[start:end] for start, end in spans]
+
+def _job_key(job: dict, digest: str) -> str:
+    """Key a job by its id, falling back to its content hash when it has none."""
+    job_id = job.get("id")
+    return str(job_id) if job_id is not None else f"hash:{digest}"
+
+def _lookup_stored(jobs: list, state: IngestionState):
+    """
+    Look up stored results for a batch of jobs.
+    
+    Returns:
+        keys: List of job keys, one per job
+        digests: List of description hashes, one per job
+        skills_list: Stored skill lists (None for new/changed jobs)
+        chunks_list: Stored (cleaned description, spans) pairs (None for new/changed jobs)
+        misses: Indices of jobs that have to be (re)processed
+    """
+    descriptions = [job.get("description", "") for job in jobs]
+    digests = [content_hash(description, PROCESSING_SIGNATURE) for description in descriptions]
+    keys = [_job_key(job, digest) for job, digest in zip(jobs, digests)]
+    
+    stored = state.get_many(keys)
+    
+    skills_list = [None] * len(jobs)
+    chunks_list = [None] * len(jobs)
+    misses = []
+    for i, (key, digest) in enumerate(zip(keys, digests)):
+        entry = stored.get(key)
+        if entry is not None and entry[0] == digest:
+            skills_list[i] = entry[1]
+            chunks_list[i] = (entry[2]["description"], entry[2]["spans"])
+        else:
+            misses.append(i)
+    
+    return keys, digests, skills_list, chunks_list, misses
+
+def _batched(items: Iterable, batch_size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def iter_jobs(jobs_file_path: str = None) -> Iterator[dict]:
+    """
+    Stream raw job postings from a JSON array or JSON Lines file.
+    
+    Args:
+        jobs_file_path: Path to jobs file (defaults to data/jobs.json)
+    """
+    if jobs_file_path is None:
+        jobs_file_path = DEFAULT_JOBS_PATH
+    return iter_json_records(jobs_file_path)
+
+def iter_processed_jobs(jobs_file_path: str = None, state_path: str = None,
+                        incremental: bool = False, batch_size: int = JOB_BATCH_SIZE,
+                        workers: int = 1, dedupe: DuplicateDetector = None, compact: bool = False):
+    """
+    Stream jobs with their extracted skills and chunk texts.
+    
+    Postings are read and processed batch_size at a time, so memory stays
+    bounded regardless of the size of the jobs file.
+    
+    Args:
+        jobs_file_path: Path to jobs file (JSON array or JSON Lines)
+        state_path: SQLite ingestion state used when incremental is set
+        incremental: Reuse stored skills/chunks for unchanged jobs
+        batch_size: Number of postings processed together
+        workers: Number of processes cleaning/extracting/chunking batches
+            (1 = in-process). Output order does not depend on it.
+        dedupe: Optional DuplicateDetector; postings whose description
+            near-duplicates an earlier one are skipped before any processing
+            (dedupe.kept tells which file positions were yielded)
+        compact: Yield (cleaned description, chunk spans) instead of chunk
+            texts; chunk texts are then never built
+    
+    Yields:
+        (job, skills, chunk_texts) tuples in file order, or
+        (job, skills, (description, spans)) when compact
+    """
+    jobs = iter_jobs(jobs_file_path)
+    if dedupe is not None:
+        jobs = dedupe.filter(jobs, batch_size)
+    
+    if not incremental:
+        tasks = (
+            (batch, [job.get("description", "") for job in batch])
+            for batch in _batched(jobs, batch_size)
+        )
+        process = partial(_process_descriptions, compact=compact)
+        for batch, (skills_list, chunks_list) in imap_ordered(process, tasks, workers):
+            yield from zip(batch, skills_list, chunks_list)
+        return
+    
+    with IngestionState(state_path) as state:
+        live_keys = []
+        processed = 0
+        
+        # Stored results are looked up here; only the misses go to the workers
+        def lookup_tasks():
+            for batch in _batched(jobs, batch_size):
+                lookup = _lookup_stored(batch, state)
+                misses = lookup[-1]
+                yield (batch, lookup), [batch[i].get("description", "") for i in misses]
+        
+        # The state stores descriptions and spans; chunk texts are sliced from them on the way out
+        process = partial(_process_descriptions, compact=True)
+        for (batch, lookup), (new_skills, new_chunks) in imap_ordered(process, lookup_tasks(), workers):
+            keys, digests, skills_list, chunks_list, misses = lookup
+            for i, skills, chunks in zip(misses, new_skills, new_chunks):
+                skills_list[i], chunks_list[i] = skills, chunks
+            state.upsert([
+                (keys[i], digests[i], skills_list[i], {"description": chunks_list[i][0], "spans": chunks_list[i][1]})
+                for i in misses
+            ])
+            
+            live_keys.extend(keys)
+            processed += len(misses)
+            if not compact:
+                chunks_list = [_span_texts(description, spans) for description, spans in chunks_list]
+            yield from zip(batch, skills_list, chunks_list)
+        
+        # Only reached when the stream was fully consumed
+        removed = state.prune(live_keys)
+        print(f"  ✓ Incremental ingestion: {processed} new/changed, "
+              f"{len(live_keys) - processed} reused, {removed} removed")
+
+def build_chunk_records(job: dict, skills: list, chunks: list, job_index: int = None) -> list[dict]:
+    """
+    Create chunk records with metadata for one job.
+    
+    job_index is the job's position in the jobs file; it links chunks to
+    rows of a skill_matrix.JobSkillMatrix built from the same run.
+    """
+    title = job.get("title", "")
+    company = job.get("company", "")
+    location = job.get("location", "")
+    
+    return [
+        {
+            "text": chunk,
+            "metadata": {
+                "jobTitle": title,
+                "company": company,
+                "location": location,
+                "extractedSkills": skills,
+                "chunkIndex": i,
+                "totalChunks": len(chunks),
+                "jobIndex": job_index
+            }
+        }
+        for i, chunk in enumerate(chunks)
+    ]
+
+def iter_job_chunks(jobs_file_path: str = None, state_path: str = None,
+                    incremental: bool = False, batch_size: int = JOB_BATCH_SIZE,
+                    workers: int = 1, dedupe: DuplicateDetector = None) -> Iterator[dict]:
+    """
+    Lazily yield job chunk records (same shape as clean_jobs' job_chunks).
+    
+    Args: see iter_processed_jobs
+    """
+    processed = iter_processed_jobs(jobs_file_path, state_path, incremental, batch_size, workers, dedupe)
+    for job_index, (job, skills, chunks) in enumerate(processed):
+        yield from build_chunk_records(job, skills, chunks, job_index)
+
+def iter_job_skills(jobs_file_path: str = None, state_path: str = None,
+                    incremental: bool = False, batch_size: int = JOB_BATCH_SIZE,
+                    workers: int = 1, dedupe: DuplicateDetector = None) -> Iterator[list]:
+    """
+    Lazily yield the extracted skill list of each job (for trend calculation).
+    
+    Args: see iter_processed_jobs
+    """
+    for _, skills, _ in iter_processed_jobs(jobs_file_path, state_path, incremental, batch_size, workers, dedupe):
+        yield skills
+
+def load_job_table(jobs_file_path: str = None, state_path: str = None, incremental: bool = False,
+                   workers: int = 1, dedupe: DuplicateDetector = None) -> JobTable:
+    """
+    Ingest jobs into a columnar JobTable instead of per-chunk dicts.
+    
+    Args: see clean_jobs
+    
+    Returns:
+        JobTable whose `chunks` view matches clean_jobs' job_chunks
+    """
+    table = JobTable(JOB_CHUNK_SIZE, JOB_CHUNK_OVERLAP)
+    # No chunk texts are built: the table keeps the spans computed (or stored) upstream
+    processed = iter_processed_jobs(jobs_file_path, state_path, incremental, workers=workers, dedupe=dedupe,
+                                    compact=True)
+    for job, skills, (description, spans) in processed:
+        table.add_job(job, skills, description, spans)
+    return table
+
+def clean_jobs(jobs_file_path: str = None, state_path: str = None, incremental: bool = False,
+               workers: int = 1, compact: bool = False, dedupe: DuplicateDetector = None):
     """
     Clean and chunk job data with metadata extraction.
     
+    Args:
+        jobs_file_path: Path to jobs file, JSON array or JSON Lines
+            (defaults to data/jobs.json)
+        state_path: SQLite ingestion state used when incremental is set
+            (defaults to data/ingestion_state.db)
+        incremental: Reuse stored skills/chunks for jobs whose id and
+            description hash are unchanged since the last run
+        workers: Number of processes used for cleaning, skill extraction and
+            chunking (1 = in-process). Output is identical for any value.
+        compact: Store jobs once in a JobTable and return read-only views
+            (same contents, far less memory than one dict per chunk)
+        dedupe: Optional DuplicateDetector; near-duplicate postings are
+            dropped, so job indices count kept postings only
+    
     Returns:
         job_chunks: List of dicts with chunk text and metadata
+            (a ChunkList of ChunkView mappings when compact)
         job_skills_list: List of skill lists (for trend calculation)
     """
-    if jobs_file_path is None:
-        jobs_file_path = Path(__file__).parent.parent.parent / "data" / "jobs.json"
+    if compact:
+        table = load_job_table(jobs_file_path, state_path, incremental, workers, dedupe)
+        return table.chunks, table.job_skills
     
-    with open(jobs_file_path) as f:
-        jobs = json.load(f)
-
     job_chunks = []
     job_skills_list = []
     
-    for job in jobs:
-        title = job.get("title", "")
-        description = job.get("description", "")
-        company = job.get("company", "")
-        location = job.get("location", "")
-        
-        # Clean description
-        clean_desc = re.sub(r"\s+", " ", description).strip()
-        
-        # Extract skills from full job description
-        skills = extract_skills(clean_desc)
+    processed = iter_processed_jobs(jobs_file_path, state_path, incremental, workers=workers, dedupe=dedupe)
+    for job_index, (job, skills, chunks) in enumerate(processed):
         job_skills_list.append(skills)
-        
-        # Chunk the job description (200-500 tokens ~ 150-375 words)
-        chunks = chunk_text(clean_desc, chunk_size=300, overlap=50)
-        
-        # Create chunk records with metadata
-        for i, chunk in enumerate(chunks):
-            job_chunk = {
-                "text": chunk,
-                "metadata": {
-                    "jobTitle": title,
-                    "company": company,
-                    "location": location,
-                    "extractedSkills": skills,
-                    "chunkIndex": i,
-                    "totalChunks": len(chunks)
-                }
-            }
-            job_chunks.append(job_chunk)
+        job_chunks.extend(build_chunk_records(job, skills, chunks, job_index))
     
     return job_chunks, job_skills_list
-
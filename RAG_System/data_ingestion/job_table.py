@@ -0,0 +1,245 @@
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+from itertools import accumulate
+
+from skill_engine.skill_matrix import SkillVocabulary
+
+
+def clean_description(text: str) -> str:
+    """Collapse whitespace runs to single spaces and strip."""
+    return " ".join(text.split())
+
+
+def chunk_spans(text: str, chunk_size: int = 400, overlap: int = 50) -> list:
+    """
+    Character (start, end) spans of the chunks chunk_text would produce.
+
+    text must be cleaned (see clean_description): words are then separated by
+    single spaces, text[start:end] equals the corresponding chunk_text chunk
+    and chunks can be stored as offsets instead of copies.
+    """
+    if not text:
+        return []
+    words = text.split(" ")
+    # Word i ends at cumulative[i] + i (one space before each later word)
+    cumulative = list(accumulate(map(len, words)))
+    spans = []
+    for i in range(0, len(words), chunk_size - overlap):
+        last = min(i + chunk_size, len(words)) - 1
+        spans.append((cumulative[i] - len(words[i]) + i, cumulative[last] + last))
+    return spans
+
+
+class JobTable:
+    """
+    Columnar store of cleaned jobs and their chunks.
+
+    Each job is stored once: interned title/company/location, the cleaned
+    description and its skill ids (CSR arrays, extraction order kept).
+    Chunks are (job index, start, end) rows in typed arrays, so a chunk costs
+    12 bytes instead of a text copy and a metadata dict; its text is sliced
+    from the description when asked for.
+
+    `chunks` and `job_skills` expose the clean_jobs shapes as read-only views.
+    """
+
+    def __init__(self, chunk_size: int = 400, overlap: int = 50, vocabulary: SkillVocabulary = None):
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.vocabulary = vocabulary or SkillVocabulary()
+        self.titles = []
+        self.companies = []
+        self.locations = []
+        self.descriptions = []
+        self.skill_indptr = array("I", [0])
+        self.skill_ids = array("I")
+        self.chunk_indptr = array("I", [0])  # Chunks of job i are rows chunk_indptr[i]:chunk_indptr[i + 1]
+        self.chunk_job = array("I")
+        self.chunk_start = array("I")
+        self.chunk_end = array("I")
+        self.chunks = ChunkList(self)
+        self.job_skills = JobSkillsView(self)
+
+    @property
+    def num_jobs(self) -> int:
+        return len(self.titles)
+
+    def add_job(self, job: dict, skills: list, description: str = None, spans: list = None) -> int:
+        """
+        Append one job and its chunks.
+
+        Args:
+            job: Raw job posting
+            skills: Extracted skills of the job
+            description: Cleaned description (cleaned from job["description"] if omitted)
+            spans: Chunk (start, end) spans of description (computed with the
+                table's chunk size and overlap if omitted)
+
+        Returns:
+            The job's index
+        """
+        job_index = len(self.titles)
+        if description is None:
+            description = clean_description(job.get("description", ""))
+
+        self.titles.append(sys.intern(job.get("title", "") or ""))
+        self.companies.append(sys.intern(job.get("company", "") or ""))
+        self.locations.append(sys.intern(job.get("location", "") or ""))
+        self.descriptions.append(description)
+
+        self.skill_ids.extend(self.vocabulary.add(skill) for skill in skills)
+        self.skill_indptr.append(len(self.skill_ids))
+
+        if spans is None:
+            spans = chunk_spans(description, self.chunk_size, self.overlap)
+        self.chunk_job.extend([job_index] * len(spans))
+        self.chunk_start.extend(start for start, _ in spans)
+        self.chunk_end.extend(end for _, end in spans)
+        self.chunk_indptr.append(len(self.chunk_job))
+        return job_index
+
+    def skills(self, job_index: int) -> list:
+        """Skill names of a job, in extraction order."""
+        names = self.vocabulary.skills
+        return [names[i] for i in self.skill_ids[self.skill_indptr[job_index]:self.skill_indptr[job_index + 1]]]
+
+    def chunk_text(self, row: int) -> str:
+        return self.descriptions[self.chunk_job[row]][self.chunk_start[row]:self.chunk_end[row]]
+
+    def chunk_metadata(self, row: int) -> dict:
+        """Metadata dict of a chunk, shaped like build_chunk_records' records."""
+        job_index = self.chunk_job[row]
+        first = self.chunk_indptr[job_index]
+        return {
+            "jobTitle": self.titles[job_index],
+            "company": self.companies[job_index],
+            "location": self.locations[job_index],
+            "extractedSkills": self.skills(job_index),
+            "chunkIndex": row - first,
+            "totalChunks": self.chunk_indptr[job_index + 1] - first,
+            "jobIndex": job_index
+        }
+
+
+class ChunkView(Mapping):
+    """Read-only {"text", "metadata"} view of one JobTable chunk, built on access."""
+
+    __slots__ = ("table", "row")
+    KEYS = ("text", "metadata")
+
+    def __init__(self, table: JobTable, row: int):
+        self.table = table
+        self.row = row
+
+    def __getitem__(self, key):
+        if key == "text":
+            return self.table.chunk_text(self.row)
+        if key == "metadata":
+            return self.table.chunk_metadata(self.row)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return f"ChunkView(row={self.row}, job={self.table.chunk_job[self.row]})"
+
+    def to_dict(self) -> dict:
+        return {"text": self["text"], "metadata": self["metadata"]}
+
+
+class ChunkList(Sequence):
+    """Sequence of ChunkViews over a JobTable (stands in for clean_jobs' job_chunks list)."""
+
+    def __init__(self, table: JobTable):
+        self.table = table
+
+    def __len__(self):
+        return len(self.table.chunk_job)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ChunkView(self.table, row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("chunk index out of range")
+        return ChunkView(self.table, index)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield ChunkView(self.table, row)
+
+    @property
+    def texts(self) -> "ChunkFieldView":
+        """Chunk texts, sliced from the descriptions on access (e.g. VectorStore records)."""
+        return ChunkFieldView(self.table, self.table.chunk_text)
+
+    @property
+    def metadata(self) -> "ChunkFieldView":
+        """Chunk metadata dicts, built on access."""
+        return ChunkFieldView(self.table, self.table.chunk_metadata)
+
+    def iter_for_jobs(self, job_mask):
+        """
+        Yield views of the chunks whose job is selected, without building the others.
+
+        Args:
+            job_mask: Boolean sequence indexed by job index
+        """
+        indptr = self.table.chunk_indptr
+        for job_index, selected in enumerate(job_mask):
+            if selected:
+                for row in range(indptr[job_index], indptr[job_index + 1]):
+                    yield ChunkView(self.table, row)
+
+
+class ChunkFieldView(Sequence):
+    """Sequence of one field (text or metadata) of every JobTable chunk; grows with the table."""
+
+    def __init__(self, table: JobTable, getter):
+        self.table = table
+        self.getter = getter
+
+    def __len__(self):
+        return len(self.table.chunk_job)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.getter(row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("chunk index out of range")
+        return self.getter(index)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self.getter(row)
+
+
+class JobSkillsView(Sequence):
+    """Sequence of per-job skill lists over a JobTable (stands in for job_skills_list)."""
+
+    def __init__(self, table: JobTable):
+        self.table = table
+
+    def __len__(self):
+        return self.table.num_jobs
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.table.skills(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("job index out of range")
+        return self.table.skills(index)
+
+    def __iter__(self):
+        for job_index in range(len(self)):
+            yield self.table.skills(job_index)
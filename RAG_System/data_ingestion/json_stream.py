@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+from typing import Iterator
+
+JSONL_SUFFIXES = {".jsonl", ".ndjson"}
+
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_records(path: str, read_size: int = 1 << 20) -> Iterator[dict]:
+    """
+    Stream records one at a time from a JSON array file or a JSON Lines file.
+
+    Only the current record and one read buffer are held in memory, so
+    multi-GB job dumps can be processed without loading them whole.
+
+    Args:
+        path: Path to a `[...]` JSON array or a .jsonl/.ndjson file
+        read_size: Number of characters read from disk at a time
+
+    Yields:
+        Each record (usually a job dict) in file order
+    """
+    with open(path, encoding="utf-8") as f:
+        if Path(path).suffix.lower() in JSONL_SUFFIXES:
+            yield from _iter_json_lines(f)
+            return
+
+        # Sniff the format: a JSON array starts with '[', anything else is JSON Lines
+        head = f.read(read_size)
+        stripped = head.lstrip(_WHITESPACE)
+        if stripped.startswith("["):
+            yield from _iter_json_array(f, stripped[1:], read_size)
+        else:
+            f.seek(0)
+            yield from _iter_json_lines(f)
+
+
+def _iter_json_lines(f) -> Iterator[dict]:
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {e}") from e
+
+
+def _iter_json_array(f, buf: str, read_size: int) -> Iterator[dict]:
+    decoder = json.JSONDecoder()
+    pos = 0
+    eof = False
+
+    while True:
+        # Skip separators between elements
+        while pos < len(buf) and buf[pos] in _WHITESPACE + ",":
+            pos += 1
+
+        if pos == len(buf):
+            if eof:
+                raise ValueError("Unterminated JSON array")
+            buf, pos = f.read(read_size), 0
+            eof = not buf
+            continue
+
+        if buf[pos] == "]":
+            return
+
+        try:
+            record, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            record, end = None, None
+
+        # The element may be cut off by the buffer boundary; read more and retry.
+        # Reads grow geometrically so a record larger than the buffer stays linear.
+        if end is None or (end == len(buf) and not eof):
+            if eof:
+                raise ValueError(f"Invalid JSON array element near: {buf[pos:pos + 80]!r}")
+            more = f.read(max(read_size, len(buf) - pos))
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+
+        yield record
+        pos = end
@@ -0,0 +1,38 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+
+def imap_ordered(fn: Callable, tasks: Iterable, workers: int = 1) -> Iterator:
+    """
+    Apply fn to the argument of every (context, arg) task, preserving order.
+
+    With workers > 1 the calls run in a ProcessPoolExecutor. Only a few tasks
+    per worker are in flight at once, so a lazily produced (streamed) task
+    iterable is never read far ahead of the consumer. Results come back in
+    submission order, so output is deterministic for any worker count.
+
+    Args:
+        fn: Top-level (picklable) function taking one argument
+        tasks: Iterable of (context, arg) pairs; context stays in this process
+        workers: Number of worker processes (1 runs in-process)
+
+    Yields:
+        (context, fn(arg)) pairs in task order
+    """
+    if workers <= 1:
+        for context, arg in tasks:
+            yield context, fn(arg)
+        return
+
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for context, arg in tasks:
+            pending.append((context, executor.submit(fn, arg)))
+            if len(pending) >= max_pending:
+                context, future = pending.popleft()
+                yield context, future.result()
+        while pending:
+            context, future = pending.popleft()
+            yield context, future.result()
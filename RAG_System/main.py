@@ -1,107 +1,536 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from data_ingestion.job_cleaner import clean_jobs
-from data_ingestion.curriculum_processor import process_curriculum
+from data_ingestion.job_cleaner import DEFAULT_JOBS_PATH, clean_jobs, iter_job_chunks, iter_jobs, iter_processed_jobs
+from data_ingestion.curriculum_processor import DEFAULT_CURRICULUM_PATH, process_curriculum
+from data_ingestion.dedupe import DuplicateDetector
+from data_ingestion.job_table import ChunkList, clean_description
 from skill_engine.skill_extractor import extract_skills
-from skill_engine.skill_trends import calculate_trends, get_trending_skills
-from reasoning.gap_analysis import analyze_gap
+from skill_engine.skill_index import fuzzy_skill_pass
+from skill_engine.skill_matrix import JobSkillMatrix
+from skill_engine.skill_trends import calculate_trends, get_trending_skills, iter_matching_chunks
+from skill_engine.trend_engine import JOB_BATCH_SIZE as TREND_BATCH_SIZE, SkillTrendEngine
+from reasoning.gap_analysis import GEMINI_MODEL_NAME, GENERATION_CONFIG, analyze_gap, build_prompt
+from reasoning.artifact_graph import ArtifactGraph, file_fingerprint, trending_signature, write_if_changed
+from reasoning.batch_analysis import run_batch_gap_analysis
 from rag.vector_store import VectorStore
+from rag.hybrid_retriever import HybridRetriever, retrieve_course_evidence
+from rag.coverage import CoverageEngine
+from skill_engine.instructor_matching import DEFAULT_INSTRUCTORS_PATH, InstructorMatcher, instructor_readiness
+from observability.tracing import enable_tracing, span, write_trace
 
 import json
+from itertools import compress
 from pathlib import Path
 
 # ================== CONFIGURATION ==================
 SELECTED_COURSE_ID = 1  # Course ID for "Generative AI"
 SKILL_TRENDING_THRESHOLD = 0.30
+INCREMENTAL_INGESTION = True  # Reuse stored chunks/skills for unchanged jobs (data/ingestion_state.db)
+STREAM_INGESTION = False  # Stream jobs (JSON array or JSONL) instead of loading them all into memory (matching is then by keyword)
+MAX_EVIDENCE_CHUNKS = 10  # Matched job chunks passed to gap analysis
+RETRIEVAL_MODE = "hybrid"  # "hybrid": per-module BM25 candidates re-ranked by embeddings; "keyword": first trending-skill matches
+EVIDENCE_PER_MODULE = 3  # Hybrid matches taken per curriculum module
+HYBRID_ALPHA = 0.5  # Weight of embedding similarity vs BM25 in the fused hybrid score
+COVERAGE_ANALYSIS = True  # Score module x job coverage from embeddings for the prompt (hybrid mode only)
+COVERAGE_THRESHOLD = 0.4  # Cosine similarity at which a module counts as covering a job chunk
+PROMPT_TOKEN_BUDGET = 300  # Tokens of the whole prompt; evidence chosen by relevance + MMR fills what the template and coverage gaps leave (None = fixed slices)
+INSTRUCTOR_MATCHING = True  # Rank instructors (data/instructors.json) for each proposed module
+INGESTION_WORKERS = 1  # Processes for cleaning/skill extraction/chunking (1 = single process)
+DEDUPE_THRESHOLD = 0.8  # Drop postings whose description near-duplicates an earlier one (MinHash Jaccard estimate; None = keep all)
+FUZZY_SKILL_MATCHING = False  # Second skill pass: map frequent job phrases to catalogue skills by embedding similarity (data/skill_index)
+FUZZY_SKILL_THRESHOLD = 0.75  # Cosine similarity at which a phrase counts as a catalogue skill
+COMPACT_CHUNKS = True  # Keep jobs in a columnar JobTable; chunks are lazy views instead of dicts
+TREND_WINDOWS = (7, 30, 90)  # Rolling windows (days) for rising-skill detection
+TREND_HALF_LIFE_DAYS = 30.0  # Half-life of the decayed skill demand score
+RECOMPUTE_CHANGED_ONLY = True  # Re-analyse only courses whose trending skills, evidence or settings changed (data/pipeline_state.db)
+FORCE_LLM_REFRESH = False  # Ignore cached gap analysis responses (data/llm_cache.db) and call Gemini again
+ANALYZE_ALL_COURSES = False  # Run gap analysis for every course concurrently instead of SELECTED_COURSE_ID
+ANALYSIS_WORKERS = 4  # Courses analysed at the same time when ANALYZE_ALL_COURSES is set
+LLM_REQUESTS_PER_MINUTE = 10  # Shared Gemini request budget across analysis workers
+LLM_MAX_RETRIES = 3  # Retries per course (exponential backoff) on API or parse errors
+COURSE_TIMEOUT_SECONDS = 120  # Time allowed per course, including retries
+STREAM_LLM_RESPONSE = True  # Stream Gemini output and print each recommendation as soon as it is complete
+TRACE_FILE = None  # e.g. "pipeline_trace.json": record per-stage timings, memory and counters (None = tracing off)
 
-# ================== STEP 1: Load Data ==================
-print("[STEP 1] Loading curriculum and job data...")
-curriculum, all_curriculum_modules = process_curriculum()
-job_chunks, job_skills_list = clean_jobs()
-print(f"  ✓ Loaded {len(all_curriculum_modules)} curriculum modules")
-print(f"  ✓ Loaded {len(job_chunks)} job chunks from {len(job_skills_list)} jobs")
-
-# Get selected course
-selected_course = None
-selected_course_modules = []
-
-for course in curriculum.get("courses", []):
-    if course["id"] == SELECTED_COURSE_ID:
-        selected_course = course
-        selected_course_modules = [
-            m for m in all_curriculum_modules 
-            if m["metadata"].get("courseId") == SELECTED_COURSE_ID
-        ]
-        break
-
-if not selected_course:
-    print(f"  ❌ Course ID {SELECTED_COURSE_ID} not found")
-    exit(1)
-
-SELECTED_COURSE = selected_course["courseName"]
-print(f"  ✓ Selected course: {SELECTED_COURSE} (ID: {SELECTED_COURSE_ID})")
-print(f"  ✓ Found {len(selected_course_modules)} modules for this course")
-
-# ================== STEP 2: Calculate Skill Trends ==================
-print("\n[STEP 2] Calculating skill trends from all jobs...")
-skill_frequency = calculate_trends(job_skills_list)
-trending_skills = get_trending_skills(skill_frequency, len(job_skills_list), SKILL_TRENDING_THRESHOLD)
-print(f"  ✓ Found {len(skill_frequency)} unique skills")
-print(f"  ✓ {len(trending_skills)} trending skills (>= 30% frequency)")
-print(f"  Sample trending skills: {trending_skills[:10]}")
-
-# ================== STEP 3: Match Jobs to Course ==================
-print(f"\n[STEP 3] Matching jobs to '{SELECTED_COURSE}' course...")
-
-matched_job_chunks = []
-for chunk in job_chunks:
-    job_skills = chunk["metadata"].get("extractedSkills", [])
-    if any(skill.lower() in [s.lower() for s in trending_skills] for skill in job_skills):
-        matched_job_chunks.append(chunk)
-
-print(f"  ✓ Matched {len(matched_job_chunks)} jobs with course skills")
-
-print("\n  Matched Jobs:")
-for i, chunk in enumerate(matched_job_chunks[:10], 1):
-    job_title = chunk["metadata"].get("jobTitle")
-    company = chunk["metadata"].get("company")
-    skills = chunk["metadata"].get("extractedSkills", [])
-    print(f"    {i}. {job_title} @ {company}")
-    print(f"       Skills: {', '.join(skills[:5])}")
-
-retrieved_job_chunks = matched_job_chunks[:10]
-
-# ================== STEP 4: Gap Analysis ==================
-print(f"\n[STEP 4] Running gap analysis for '{SELECTED_COURSE}'...")
-print("  Analyzing curriculum against matched job market data...")
-
-gap_analysis_result = analyze_gap(
-    course_name=SELECTED_COURSE,
-    course_id=SELECTED_COURSE_ID,
-    retrieved_job_chunks=retrieved_job_chunks,
-    curriculum_modules=selected_course_modules,
-    trending_skills=trending_skills,
-    skill_frequency=skill_frequency
-)
-
-print("\n" + "="*60)
-print(f"CURRICULUM GAP ANALYSIS RESULTS - {SELECTED_COURSE}")
-print("="*60)
-
-print(json.dumps(gap_analysis_result, indent=2))
-
-# Save to RAG_System directory (for watch script to copy)
-rag_output_file = Path(__file__).parent / f"gap_analysis_{SELECTED_COURSE_ID}.json"
-with open(rag_output_file, "w") as f:
-    json.dump(gap_analysis_result, f, indent=2)
-
-# Also save to Frontend/public directory
-output_dir = Path(__file__).parent.parent / "Frontend" / "public"
-output_dir.mkdir(parents=True, exist_ok=True)  # Create directory if it doesn't exist
-output_file = output_dir / f"gap_analysis_{SELECTED_COURSE_ID}.json"
-with open(output_file, "w") as f:
-    json.dump(gap_analysis_result, f, indent=2)
-print(f"\n✓ Results saved to: {rag_output_file}")
-print(f"✓ Results saved to: {output_file}")
 
+def output_files(course_id: int) -> list:
+    """gap_analysis_<id>.json in RAG_System (for the watch script) and in Frontend/public."""
+    return [
+        Path(__file__).parent / f"gap_analysis_{course_id}.json",
+        Path(__file__).parent.parent / "Frontend" / "public" / f"gap_analysis_{course_id}.json",
+    ]
+
+
+def save_gap_analysis(course_id: int, gap_analysis_result: dict):
+    """Write the result files atomically, leaving files that already hold this result untouched."""
+    text = json.dumps(gap_analysis_result, indent=2)
+    print()
+    for output_file in output_files(course_id):
+        if write_if_changed(output_file, text):
+            print(f"✓ Results saved to: {output_file}")
+        else:
+            print(f"✓ Results unchanged: {output_file}")
+
+
+def new_detector():
+    """A fresh near-duplicate detector (None when DEDUPE_THRESHOLD is None); same input -> same postings kept."""
+    return DuplicateDetector(DEDUPE_THRESHOLD) if DEDUPE_THRESHOLD is not None else None
+
+
+def is_complete(result: dict) -> bool:
+    """True for a full analysis; failed and truncated (partial, streamed) results are retried next run."""
+    return not result.get("error") and not result.get("truncated")
+
+
+def analysis_settings() -> dict:
+    """Settings that change a course's prompt or result (part of every course's fingerprint)."""
+    return {
+        "trendingThreshold": SKILL_TRENDING_THRESHOLD,
+        "dedupeThreshold": DEDUPE_THRESHOLD,
+        "fuzzySkills": FUZZY_SKILL_THRESHOLD if FUZZY_SKILL_MATCHING else None,
+        "retrievalMode": retrieval_mode(),
+        "maxEvidenceChunks": MAX_EVIDENCE_CHUNKS,
+        "evidencePerModule": EVIDENCE_PER_MODULE,
+        "hybridAlpha": HYBRID_ALPHA,
+        "coverage": [COVERAGE_ANALYSIS, COVERAGE_THRESHOLD],
+        "promptTokenBudget": PROMPT_TOKEN_BUDGET,
+        "instructorMatching": INSTRUCTOR_MATCHING,
+        "model": [GEMINI_MODEL_NAME, GENERATION_CONFIG],
+    }
+
+
+class IngestedJobs:
+    """Result of ingest_jobs: chunks, per-job skills and what is needed to extend them later."""
+
+    def __init__(self, job_chunks, job_skills_list, detector, fuzzy, jobs_file_path: str = None):
+        self.job_chunks = job_chunks
+        self.job_skills_list = job_skills_list
+        self.detector = detector  # DuplicateDetector that kept these jobs (None when dedupe is off)
+        self.fuzzy = fuzzy  # Resolved FuzzySkillPass (None when FUZZY_SKILL_MATCHING is off)
+        self.jobs_file_path = jobs_file_path
+
+    def kept_jobs(self, jobs=None):
+        """The postings that were kept, in job_skills_list order (re-read from the jobs file unless given)."""
+        jobs = iter_jobs(self.jobs_file_path) if jobs is None else jobs
+        return compress(jobs, self.detector.kept) if self.detector is not None else iter(jobs)
+
+
+def ingest_jobs(jobs_file_path: str = None, incremental: bool = INCREMENTAL_INGESTION,
+                workers: int = INGESTION_WORKERS) -> IngestedJobs:
+    """
+    Load, de-duplicate and skill-tag every posting (the in-memory path; the service uses it too).
+
+    Chunk metadata keeps the exact skill matches; with FUZZY_SKILL_MATCHING the
+    per-job skill lists (job x skill counts, trends) also get the fuzzy ones.
+    """
+    detector = new_detector()
+    job_chunks, job_skills_list = clean_jobs(
+        jobs_file_path, incremental=incremental, workers=workers, compact=COMPACT_CHUNKS, dedupe=detector
+    )
+    ingested = IngestedJobs(job_chunks, job_skills_list, detector, None, jobs_file_path)
+    if FUZZY_SKILL_MATCHING:
+        with span("fuzzy_skills") as s:
+            ingested.job_skills_list, ingested.fuzzy = fuzzy_skill_pass(
+                (clean_description(job.get("description", "")) for job in ingested.kept_jobs()),
+                job_skills_list, threshold=FUZZY_SKILL_THRESHOLD
+            )
+            s.add("phrases", len(ingested.fuzzy.phrase_ids))
+            s.add("matched", len(ingested.fuzzy.phrase_skill))
+        print(f"  ✓ Fuzzy skill pass matched {len(ingested.fuzzy.phrase_skill)} phrases: "
+              f"{sorted(ingested.fuzzy.matched_phrases().items())[:10]}")
+        print(f"  Emerging skill candidates: {[c['phrase'] for c in ingested.fuzzy.emerging_skills(top=10)]}")
+    return ingested
+
+
+def load_vector_store(job_chunks) -> VectorStore:
+    """
+    Dense index over the job chunks, saved to data/vector_index.
+
+    The saved index is reused when the chunks are unchanged and extended when
+    chunks were only appended. A ChunkList is indexed through its lazy views,
+    so no chunk text or metadata is copied.
+    """
+    if isinstance(job_chunks, ChunkList):
+        texts, metadata = job_chunks.texts, job_chunks.metadata
+    else:
+        texts, metadata = [], []
+        for chunk in job_chunks:
+            texts.append(chunk["text"])
+            metadata.append(chunk["metadata"])
+    vector_store = VectorStore()
+    reused = vector_store.load_or_build(texts, metadata)
+    print(f"  ✓ {'Loaded' if reused else 'Built'} vector index over {len(texts)} job chunks")
+    return vector_store
+
+
+def retrieval_mode() -> str:
+    """
+    The retrieval mode main() runs with: RETRIEVAL_MODE, except "keyword" under STREAM_INGESTION.
+
+    Hybrid retrieval holds every chunk in memory (dense vectors, BM25
+    postings and the chunk texts returned as evidence), which is what
+    streaming ingestion exists to avoid.
+    """
+    if STREAM_INGESTION and RETRIEVAL_MODE == "hybrid":
+        return "keyword"
+    return RETRIEVAL_MODE
+
+
+def build_retriever(job_chunks, vector_store: VectorStore = None):
+    """
+    Hybrid retriever over the job chunks (None unless RETRIEVAL_MODE is "hybrid").
+
+    Uses the given vector store, or loads one (see load_vector_store); the
+    BM25 index is built in memory.
+    """
+    if RETRIEVAL_MODE != "hybrid":
+        return None
+    return HybridRetriever(vector_store or load_vector_store(job_chunks), alpha=HYBRID_ALPHA)
+
+
+def build_coverage_engine(retriever, curriculum_modules: list):
+    """Module x job similarity pass shared by every course (None without a retriever or with coverage off)."""
+    if retriever is None or not COVERAGE_ANALYSIS:
+        return None
+    return CoverageEngine(retriever.vector_store, curriculum_modules, threshold=COVERAGE_THRESHOLD)
+
+
+def keyword_evidence(job_chunks, trending_skills: list, skill_matrix) -> tuple:
+    """
+    The first MAX_EVIDENCE_CHUNKS chunks mentioning a trending skill (the "keyword" retrieval mode).
+
+    Returns:
+        evidence, matched_count: job_chunks may be a stream; only the kept chunks are held
+    """
+    evidence = []
+    matched_count = 0
+    for chunk in iter_matching_chunks(job_chunks, trending_skills, skill_matrix):
+        matched_count += 1
+        if len(evidence) < MAX_EVIDENCE_CHUNKS:
+            evidence.append(chunk)
+    return evidence, matched_count
+
+
+def course_task(course: dict, modules: list, trending_skills: list, skill_frequency: dict, retriever=None,
+                coverage_engine=None, evidence: list = None) -> dict:
+    """
+    Prompt inputs of one course: its modules, job evidence and coverage summary,
+    plus the prompt built from them.
+
+    With a retriever the evidence is the hybrid matches of the course's own
+    modules; otherwise it is the given keyword evidence (shared by all courses).
+    The prompt's evidence is embedded through the retriever's embedding cache,
+    so an unchanged course never loads the embedding model.
+    """
+    if retriever is not None:
+        evidence = retrieve_course_evidence(retriever, modules, EVIDENCE_PER_MODULE, MAX_EVIDENCE_CHUNKS) if modules else []
+    task = {
+        "courseId": course["id"],
+        "courseName": course["courseName"],
+        "modules": modules,
+        "jobChunks": evidence or [],
+        "coverage": coverage_engine.summary(course["id"]) if coverage_engine is not None else None,
+    }
+    task["prompt"] = build_prompt(task["jobChunks"], modules, trending_skills, skill_frequency,
+                                  coverage=task["coverage"], token_budget=PROMPT_TOKEN_BUDGET,
+                                  embed_fn=retriever.vector_store.embed if retriever is not None else None)
+    return task
+
+
+def attach_instructor_readiness(result: dict, matcher=None) -> dict:
+    """Add instructorReadiness (ranked instructors per proposed module) to a successful result."""
+    if matcher is not None and not result.get("error"):
+        with span("instructor_matching") as s:
+            result["instructorReadiness"] = instructor_readiness(result, matcher)
+            s.add("modules", len(result["instructorReadiness"]))
+    return result
+
+
+def analyze_course(task: dict, trending_skills: list, skill_frequency: dict, matcher=None, **options) -> dict:
+    """
+    Gap analysis of one course_task with the configured prompt budget, plus instructor readiness.
+
+    Used by main() and the service, so both write the same gap_analysis_<id>.json
+    for the same inputs. Extra options (force_refresh, stream, on_module, model)
+    go to analyze_gap.
+    """
+    result = analyze_gap(
+        course_name=task["courseName"],
+        course_id=task["courseId"],
+        retrieved_job_chunks=task["jobChunks"],
+        curriculum_modules=task["modules"],
+        trending_skills=trending_skills,
+        skill_frequency=skill_frequency,
+        coverage=task["coverage"],
+        token_budget=PROMPT_TOKEN_BUDGET,
+        prompt=task["prompt"],
+        **options
+    )
+    return attach_instructor_readiness(result, matcher)
+
+
+def main():
+    # Fingerprints of the inputs and of each course's prompt inputs, kept between runs
+    graph = ArtifactGraph() if RECOMPUTE_CHANGED_ONLY else None
+    run_inputs = ["jobs", "curriculum", "instructors", "settings", "scope"]
+    if graph is not None:
+        graph.record("jobs", digest=file_fingerprint(DEFAULT_JOBS_PATH))
+        graph.record("curriculum", digest=file_fingerprint(DEFAULT_CURRICULUM_PATH))
+        graph.record("instructors", digest=file_fingerprint(DEFAULT_INSTRUCTORS_PATH) if INSTRUCTOR_MATCHING else "off")
+        graph.record("settings", analysis_settings())
+        graph.record("scope", "all" if ANALYZE_ALL_COURSES else SELECTED_COURSE_ID)
+        if not FORCE_LLM_REFRESH and not graph.needs_update("run", run_inputs) and all(
+            path.exists() for course_id in target_course_ids() for path in output_files(course_id)
+        ):
+            print("✓ Jobs, curriculum and settings unchanged since the last run; gap analyses are up to date")
+            return
+
+    def needs_analysis(task: dict) -> bool:
+        """Record the fingerprint of the course's prompt; True if its analysis must be rerun."""
+        if graph is None:
+            return True
+        course_id = task["courseId"]
+        graph.record(f"evidence:{course_id}", task["prompt"])
+        graph.combine(f"prompt:{course_id}", ["trending", f"evidence:{course_id}", "settings"])
+        return (
+            FORCE_LLM_REFRESH
+            or graph.needs_update(f"result:{course_id}", [f"prompt:{course_id}", "instructors"])
+            or not all(path.exists() for path in output_files(course_id))
+        )
+
+    # ================== STEP 1: Load Data ==================
+    print("[STEP 1] Loading curriculum and job data...")
+    with span("process_curriculum") as s:
+        curriculum, all_curriculum_modules = process_curriculum(workers=INGESTION_WORKERS)
+        s.add("modules", len(all_curriculum_modules))
+    print(f"  ✓ Loaded {len(all_curriculum_modules)} curriculum modules")
+    # Windowed trend state persists between runs; only new or edited postings are counted
+    trend_engine = SkillTrendEngine.load(windows=TREND_WINDOWS, half_life_days=TREND_HALF_LIFE_DAYS)
+    new_jobs = 0
+    with span("ingest_jobs", streaming=STREAM_INGESTION) as s:
+        if STREAM_INGESTION:
+            def job_skills_stream():
+                nonlocal new_jobs
+                batch = []
+                # compact: chunk texts are not needed here, so they are never built
+                for job, skills, _ in iter_processed_jobs(incremental=INCREMENTAL_INGESTION, workers=INGESTION_WORKERS,
+                                                          dedupe=new_detector(), compact=True):
+                    batch.append((job, skills))
+                    if len(batch) >= TREND_BATCH_SIZE:
+                        new_jobs += trend_engine.add_jobs(batch)
+                        batch = []
+                    yield skills
+                new_jobs += trend_engine.add_jobs(batch)
+        
+            # Only the job x skill matrix is kept; chunks are streamed again in step 3
+            skill_matrix = JobSkillMatrix.from_skill_lists(job_skills_stream())
+            print(f"  ✓ Indexed skills of {skill_matrix.num_jobs} jobs (chunks will be streamed)")
+        else:
+            ingested = ingest_jobs()
+            job_chunks, job_skills_list = ingested.job_chunks, ingested.job_skills_list
+            skill_matrix = JobSkillMatrix.from_skill_lists(job_skills_list)
+            new_jobs = trend_engine.add_jobs(zip(ingested.kept_jobs(), job_skills_list))
+            s.add("chunks", len(job_chunks))
+            print(f"  ✓ Loaded {len(job_chunks)} job chunks from {len(job_skills_list)} jobs")
+        # Postings no longer in jobs.json (or now dropped as duplicates) leave the trends
+        removed_jobs = trend_engine.remove_unseen()
+        s.add("jobs", skill_matrix.num_jobs)
+        s.add("new_jobs", new_jobs)
+        s.add("removed_jobs", removed_jobs)
+    trend_engine.save()
+
+    # Get selected course
+    selected_course = None
+    selected_course_modules = []
+
+    for course in curriculum.get("courses", []):
+        if course["id"] == SELECTED_COURSE_ID:
+            selected_course = course
+            selected_course_modules = [
+                m for m in all_curriculum_modules 
+                if m["metadata"].get("courseId") == SELECTED_COURSE_ID
+            ]
+            break
+
+    if ANALYZE_ALL_COURSES:
+        SELECTED_COURSE = "all courses"
+        print(f"  ✓ Analyzing all {len(curriculum.get('courses', []))} courses")
+    elif not selected_course:
+        print(f"  ❌ Course ID {SELECTED_COURSE_ID} not found")
+        exit(1)
+    else:
+        SELECTED_COURSE = selected_course["courseName"]
+        print(f"  ✓ Selected course: {SELECTED_COURSE} (ID: {SELECTED_COURSE_ID})")
+        print(f"  ✓ Found {len(selected_course_modules)} modules for this course")
+
+    # ================== STEP 2: Calculate Skill Trends ==================
+    print("\n[STEP 2] Calculating skill trends from all jobs...")
+    with span("calculate_trends") as s:
+        skill_frequency = calculate_trends(skill_matrix)
+        trending_skills = get_trending_skills(skill_matrix, threshold=SKILL_TRENDING_THRESHOLD)
+        s.add("skills", len(skill_frequency))
+        s.add("trending", len(trending_skills))
+    if graph is not None:
+        graph.record("skill_counts", skill_frequency)
+        graph.record("trending", trending_signature(trending_skills, skill_frequency))
+        print(f"  ✓ Changed since the last run: {', '.join(graph.changed) or 'nothing'}")
+    print(f"  ✓ Found {len(skill_frequency)} unique skills")
+    print(f"  ✓ {len(trending_skills)} trending skills (>= 30% frequency)")
+    print(f"  Sample trending skills: {trending_skills[:10]}")
+    print(f"  ✓ Trend state updated with {new_jobs} new or edited jobs, {removed_jobs} removed "
+          f"({trend_engine.total_jobs} tracked)")
+    for days in TREND_WINDOWS:
+        rising = trend_engine.rising_skills(days, top=5)
+        print(f"  Rising skills ({days}d): {[skill for skill, _ in rising]}")
+
+    # ================== STEP 3: Match Jobs to Course ==================
+    print(f"\n[STEP 3] Matching jobs to '{SELECTED_COURSE}' course...")
+
+    if retrieval_mode() != RETRIEVAL_MODE:
+        print(f"  ⚠️  Jobs are streamed, so matching uses keyword retrieval instead of {RETRIEVAL_MODE} "
+              f"(set STREAM_INGESTION = False for {RETRIEVAL_MODE} retrieval)")
+    with span("matching", mode=retrieval_mode()) as s:
+        if STREAM_INGESTION:
+            chunk_source = iter_job_chunks(incremental=INCREMENTAL_INGESTION, workers=INGESTION_WORKERS,
+                                           dedupe=new_detector())
+        else:
+            chunk_source = job_chunks
+
+        # Built once: saved dense index (data/vector_index) plus an in-memory BM25 index
+        retriever = build_retriever(chunk_source) if retrieval_mode() == "hybrid" else None
+        # Module x job similarity pass, shared by every course (blocked, memory-bounded)
+        coverage_engine = build_coverage_engine(retriever, all_curriculum_modules)
+        keyword_chunks = None
+        if retriever is None:
+            # Only the first MAX_EVIDENCE_CHUNKS matches are kept, so a stream stays bounded
+            keyword_chunks, matched_count = keyword_evidence(chunk_source, trending_skills, skill_matrix)
+        selected_task = course_task(selected_course, selected_course_modules, trending_skills, skill_frequency,
+                                    retriever, coverage_engine, keyword_chunks) if selected_course else None
+        retrieved_job_chunks = selected_task["jobChunks"] if selected_task else keyword_chunks or []
+        if retriever is not None:
+            matched_count = len(retrieved_job_chunks)
+        s.add("matched", matched_count)
+
+    if retriever is not None:
+        print(f"  ✓ Retrieved {matched_count} job chunks for the course modules (hybrid BM25 + embeddings)")
+    else:
+        print(f"  ✓ Matched {matched_count} jobs with course skills")
+
+    print("\n  Matched Jobs:")
+    for i, chunk in enumerate(retrieved_job_chunks, 1):
+        job_title = chunk["metadata"].get("jobTitle")
+        company = chunk["metadata"].get("company")
+        skills = chunk["metadata"].get("extractedSkills", [])
+        print(f"    {i}. {job_title} @ {company}")
+        print(f"       Skills: {', '.join(skills[:5])}")
+
+    # ================== STEP 4: Gap Analysis ==================
+    matcher = InstructorMatcher.from_file() if INSTRUCTOR_MATCHING else None
+
+    def finish(course_id: int, result: dict):
+        """Save the result; complete results are not re-analysed until their inputs change."""
+        save_gap_analysis(course_id, result)
+        if graph is not None and is_complete(result):
+            graph.mark_built(f"result:{course_id}", [f"prompt:{course_id}", "instructors"], result)
+
+    if ANALYZE_ALL_COURSES:
+        print(f"\n[STEP 4] Running gap analysis for all courses ({ANALYSIS_WORKERS} workers, "
+              f"{LLM_REQUESTS_PER_MINUTE} requests/min)...")
+        course_tasks = []
+        for course in curriculum.get("courses", []):
+            modules = [m for m in all_curriculum_modules if m["metadata"].get("courseId") == course["id"]]
+            # With a retriever each course gets the chunks closest to its own modules
+            task = course_task(course, modules, trending_skills, skill_frequency, retriever, coverage_engine,
+                               evidence=keyword_chunks)
+            if needs_analysis(task):
+                course_tasks.append(task)
+        unchanged = len(curriculum.get("courses", [])) - len(course_tasks)
+        if unchanged:
+            print(f"  ✓ {unchanged} courses unchanged since their last analysis (skipped)")
+
+        # Each course's file is written as soon as that course finishes
+        with span("gap_analysis") as s:
+            s.add("courses", len(course_tasks))
+            results = run_batch_gap_analysis(
+                course_tasks,
+                trending_skills=trending_skills,
+                skill_frequency=skill_frequency,
+                on_result=lambda course_id, result: finish(course_id, attach_instructor_readiness(result, matcher)),
+                max_workers=ANALYSIS_WORKERS,
+                requests_per_minute=LLM_REQUESTS_PER_MINUTE,
+                max_retries=LLM_MAX_RETRIES,
+                timeout=COURSE_TIMEOUT_SECONDS,
+                force_refresh=FORCE_LLM_REFRESH,
+                token_budget=PROMPT_TOKEN_BUDGET
+            )
+        failed = [course_id for course_id, result in results.items() if result.get("error")]
+        partial = [course_id for course_id, result in results.items() if result.get("truncated")]
+        print(f"\n✓ Analyzed {len(results) - len(failed)}/{len(results)} courses")
+        if failed:
+            print(f"  ❌ Failed courses: {sorted(failed)}")
+        if partial:
+            print(f"  ⚠️  Truncated responses (retried next run): {sorted(partial)}")
+        if not failed and not partial and graph is not None:
+            graph.mark_built("run", run_inputs)
+        return
+
+    coverage = selected_task["coverage"]
+    if coverage is not None:
+        print(f"\n  Coverage: {coverage['coveredShare']:.0%} of {coverage['totalChunks']} job chunks")
+        print(f"    Most demanded modules: {[m['title'] for m in coverage['modules'][:3]]}")
+        print(f"    Under-served skills: {[s['skill'] for s in coverage['underservedSkills'][:5]]}")
+
+    if not needs_analysis(selected_task):
+        print(f"\n[STEP 4] Trending skills and evidence for '{SELECTED_COURSE}' unchanged; "
+              f"keeping {output_files(SELECTED_COURSE_ID)[0].name}")
+        graph.mark_built("run", run_inputs)
+        return
+
+    print(f"\n[STEP 4] Running gap analysis for '{SELECTED_COURSE}'...")
+    print("  Analyzing curriculum against matched job market data...")
+
+    with span("gap_analysis") as s:
+        s.add("courses")
+        gap_analysis_result = analyze_course(
+            selected_task,
+            trending_skills=trending_skills,
+            skill_frequency=skill_frequency,
+            matcher=matcher,
+            force_refresh=FORCE_LLM_REFRESH,
+            stream=STREAM_LLM_RESPONSE,
+            on_module=lambda key, entry: print(f"  → {key}: {entry.get('title', entry) if isinstance(entry, dict) else entry}")
+        )
+
+    print("\n" + "="*60)
+    print(f"CURRICULUM GAP ANALYSIS RESULTS - {SELECTED_COURSE}")
+    print("="*60)
+
+    finish(SELECTED_COURSE_ID, gap_analysis_result)
+    if graph is not None and is_complete(gap_analysis_result):
+        graph.mark_built("run", run_inputs)
+    print(json.dumps(gap_analysis_result, indent=2))
+    for readiness in gap_analysis_result.get("instructorReadiness", []):
+        if readiness["hireExternally"]:
+            print(f"  ⚠️  {readiness['title']}: hire externally (missing {', '.join(readiness['missingSkills'])})")
+        else:
+            print(f"  ✓ {readiness['title']}: {readiness['candidates'][0]['name']} "
+                  f"({readiness['candidates'][0]['coverage']:.0%} of skills)")
+
+def target_course_ids() -> list:
+    """Ids of the courses this configuration writes results for."""
+    if not ANALYZE_ALL_COURSES:
+        return [SELECTED_COURSE_ID]
+    with open(DEFAULT_CURRICULUM_PATH) as f:
+        return [course["id"] for course in json.load(f).get("courses", [])]
+
+# Guarded so worker processes (spawned with INGESTION_WORKERS > 1) do not rerun the pipeline
+if __name__ == "__main__":
+    if TRACE_FILE:
+        enable_tracing(TRACE_FILE)
+    try:
+        with span("pipeline"):
+            main()
+    finally:
+        if TRACE_FILE:
+            print(f"✓ Trace saved to: {write_trace()}")
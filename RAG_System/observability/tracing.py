@@ -0,0 +1,267 @@
+import functools
+import json
+import threading
+import time
+from collections import deque
+
+try:
+    import resource  # Unix only; peak RSS is not reported elsewhere
+except ImportError:
+    resource = None
+
+METRIC_PREFIX = "curriculum_pipeline"
+MAX_TRACE_SPANS = 100_000  # Finished spans kept for the trace file (oldest dropped first)
+
+
+def max_rss_mb():
+    """Peak resident set size of this process in MB, or None where unavailable."""
+    if resource is None:
+        return None
+    # ru_maxrss is KB on Linux (bytes on macOS)
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class Span:
+    """
+    One timed region of work.
+
+    Records wall time, CPU time of the running thread and the process peak RSS
+    at exit, plus attributes (set) and numeric counters (add) such as items
+    processed, cache hits or tokens used.
+    """
+
+    def __init__(self, tracer, name: str, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.parent = None
+        self.attrs = attrs
+        self.counters = {}
+        self.start = None
+        self.wall = None
+        self.cpu = None
+        self.max_rss_mb = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def add(self, counter: str, value=1):
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def __enter__(self):
+        stack = self.tracer._stack()
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.start = time.time()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.wall = time.perf_counter() - self._wall_start
+        self.cpu = time.thread_time() - self._cpu_start
+        self.max_rss_mb = max_rss_mb()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        stack = self.tracer._stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        self.tracer._finish(self)
+        return False
+
+    def to_dict(self) -> dict:
+        record = {
+            "name": self.name,
+            "parent": self.parent,
+            "start": round(self.start, 6),
+            "wallSeconds": round(self.wall, 6),
+            "cpuSeconds": round(self.cpu, 6),
+            "maxRssMB": self.max_rss_mb,
+        }
+        if self.counters:
+            record["counters"] = self.counters
+        if self.attrs:
+            record["attrs"] = self.attrs
+        return record
+
+
+class _NoopSpan:
+    """Returned by span() while tracing is disabled; every method does nothing."""
+
+    def set(self, **attrs):
+        pass
+
+    def add(self, counter: str, value=1):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Collects finished spans and aggregates them per span name.
+
+    Aggregates (calls, wall/CPU seconds, counter totals) back the Prometheus
+    output and are kept for the lifetime of the tracer; individual spans are
+    kept up to max_spans for the JSON trace file. Thread-safe: each thread
+    has its own span stack, so parents are tracked per thread.
+    """
+
+    def __init__(self, trace_path: str = None, max_spans: int = MAX_TRACE_SPANS):
+        self.trace_path = trace_path
+        self.spans = deque(maxlen=max_spans)
+        self.totals = {}  # span name -> {"calls", "wallSeconds", "cpuSeconds", "errors", "counters"}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def span(self, name: str, **attrs) -> Span:
+        return Span(self, name, attrs)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            self.spans.append(span.to_dict())
+            totals = self.totals.get(span.name)
+            if totals is None:
+                totals = self.totals[span.name] = {
+                    "calls": 0, "wallSeconds": 0.0, "cpuSeconds": 0.0, "errors": 0, "counters": {}
+                }
+            totals["calls"] += 1
+            totals["wallSeconds"] += span.wall
+            totals["cpuSeconds"] += span.cpu
+            totals["errors"] += "error" in span.attrs
+            for counter, value in span.counters.items():
+                totals["counters"][counter] = totals["counters"].get(counter, 0) + value
+
+    def summary(self) -> dict:
+        """Per-span-name aggregates."""
+        with self._lock:
+            return {
+                name: dict(totals, counters=dict(totals["counters"]))
+                for name, totals in self.totals.items()
+            }
+
+    def write_trace(self, path: str = None) -> str:
+        """
+        Write finished spans and aggregates as JSON.
+
+        Returns:
+            The path written
+        """
+        path = path or self.trace_path
+        if path is None:
+            raise ValueError("No trace path given")
+        with self._lock:
+            spans = list(self.spans)
+        with open(path, "w") as f:
+            json.dump({"spans": spans, "summary": self.summary(), "maxRssMB": max_rss_mb()}, f, indent=2)
+        return path
+
+    def render_prometheus(self) -> str:
+        """Aggregates in the Prometheus text exposition format."""
+        summary = self.summary()
+        lines = []
+
+        def family(metric, metric_type, help_text, samples):
+            lines.append(f"# HELP {METRIC_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{metric} {metric_type}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels)
+                lines.append(f"{METRIC_PREFIX}_{metric}{{{label_text}}} {value}" if label_text
+                             else f"{METRIC_PREFIX}_{metric} {value}")
+
+        family("span_calls_total", "counter", "Finished spans per stage.",
+               [((("span", name),), totals["calls"]) for name, totals in summary.items()])
+        family("span_errors_total", "counter", "Spans that exited with an exception.",
+               [((("span", name),), totals["errors"]) for name, totals in summary.items()])
+        family("span_wall_seconds_total", "counter", "Wall-clock time spent in each stage.",
+               [((("span", name),), round(totals["wallSeconds"], 6)) for name, totals in summary.items()])
+        family("span_cpu_seconds_total", "counter", "CPU time of the running thread in each stage.",
+               [((("span", name),), round(totals["cpuSeconds"], 6)) for name, totals in summary.items()])
+        family("span_counter_total", "counter", "Items, cache hits/misses and tokens recorded by stages.",
+               [((("span", name), ("counter", counter)), value)
+                for name, totals in summary.items() for counter, value in totals["counters"].items()])
+        rss = max_rss_mb()
+        if rss is not None:
+            family("max_rss_bytes", "gauge", "Peak resident set size of the process.",
+                   [((), int(rss * 2**20))])
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# Disabled by default: span() then returns NOOP_SPAN without allocating anything
+_tracer = None
+
+
+def enable_tracing(trace_path: str = None, max_spans: int = MAX_TRACE_SPANS) -> Tracer:
+    """Start recording spans process-wide (replaces any previous tracer)."""
+    global _tracer
+    _tracer = Tracer(trace_path, max_spans)
+    return _tracer
+
+
+def disable_tracing():
+    global _tracer
+    _tracer = None
+
+
+def get_tracer():
+    """The active Tracer, or None while tracing is disabled."""
+    return _tracer
+
+
+def span(name: str, **attrs):
+    """
+    Context manager timing a block as a span named name.
+
+    Usage:
+        with span("clean_jobs") as s:
+            ...
+            s.add("jobs", len(jobs))
+    """
+    tracer = _tracer
+    if tracer is None:
+        return NOOP_SPAN
+    return tracer.span(name, **attrs)
+
+
+def traced(name: str = None):
+    """Decorator running each call of the function inside span(name or qualified name)."""
+    def decorator(fn):
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with tracer.span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render_prometheus() -> str:
+    """Prometheus text for the active tracer (empty while tracing is disabled)."""
+    return _tracer.render_prometheus() if _tracer is not None else ""
+
+
+def write_trace(path: str = None):
+    """Write the active tracer's JSON trace; returns the path, or None while disabled."""
+    if _tracer is None:
+        return None
+    return _tracer.write_trace(path)
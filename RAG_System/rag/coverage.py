@@ -0,0 +1,219 @@
+import numpy as np
+
+from observability.tracing import span
+from rag.vector_store import embed_texts
+from skill_engine.skill_matrix import JobSkillMatrix
+
+DEFAULT_BLOCK_SIZE = 8192  # Job chunks per similarity block (block memory: modules x block x 4 bytes)
+DEFAULT_COVERAGE_THRESHOLD = 0.4  # Cosine similarity at which a module covers a job chunk
+DEFAULT_TOP_K = 20  # Best matches averaged into a module's meanTopSimilarity
+DEFAULT_UNCOVERED_SAMPLE = 5000  # Chunks sampled (per course) for clustering uncovered demand
+DEFAULT_CLUSTERS = 5
+
+
+def _normalise(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def spherical_kmeans(vectors: np.ndarray, n_clusters: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """
+    Cluster unit vectors by cosine similarity.
+
+    Returns:
+        Cluster label per vector
+    """
+    n_clusters = min(n_clusters, len(vectors))
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=n_clusters, replace=False)]
+    labels = np.zeros(len(vectors), dtype=np.int64)
+    for _ in range(iterations):
+        labels = np.argmax(vectors @ centroids.T, axis=1)
+        for cluster in range(n_clusters):
+            members = vectors[labels == cluster]
+            if len(members):
+                centroids[cluster] = _normalise(members.sum(axis=0))
+    return labels
+
+
+class CoverageEngine:
+    """
+    How well curriculum modules cover job demand, from embeddings.
+
+    compute() embeds every module once and streams the job chunk vectors of
+    a VectorStore in blocks, so the module x job cosine matrix is never held
+    in full. Per block and per course it accumulates: chunks each module
+    covers (similarity >= threshold), chunks each module is the best match
+    for, each module's top-k similarities, per-skill covered counts (through
+    a chunk x skill CSR matrix) and a stride sample of uncovered chunks.
+
+    summary(course_id) turns these into a ranked summary for gap analysis.
+    """
+
+    def __init__(self, vector_store, modules: list, threshold: float = DEFAULT_COVERAGE_THRESHOLD,
+                 block_size: int = DEFAULT_BLOCK_SIZE, top_k: int = DEFAULT_TOP_K,
+                 uncovered_sample: int = DEFAULT_UNCOVERED_SAMPLE, clusters: int = DEFAULT_CLUSTERS,
+                 seed: int = 0):
+        self.vector_store = vector_store
+        self.modules = modules
+        self.threshold = threshold
+        self.block_size = block_size
+        self.top_k = top_k
+        self.uncovered_sample = uncovered_sample
+        self.clusters = clusters
+        self.seed = seed
+        self.course_rows = {}
+        for row, module in enumerate(modules):
+            self.course_rows.setdefault(module["metadata"].get("courseId"), []).append(row)
+        self._stats = None
+
+    def compute(self):
+        """Run the blocked similarity pass (once; later calls are no-ops)."""
+        if self._stats is not None:
+            return self
+        store = self.vector_store
+        num_chunks = len(store.texts)
+        num_modules = len(self.modules)
+
+        chunk_skills = JobSkillMatrix.from_skill_lists(meta.get("extractedSkills", []) for meta in store.metadata)
+        skill_counts = np.diff(chunk_skills.indptr)
+        stride = max(1, num_chunks // self.uncovered_sample)
+
+        demand = np.zeros(num_modules, dtype=np.int64)
+        best_match = np.zeros(num_modules, dtype=np.int64)
+        top = np.full((num_modules, min(self.top_k, max(1, num_chunks))), -np.inf, dtype=np.float32)
+        courses = {
+            course_id: {
+                "rows": np.array(rows),
+                "covered": 0,
+                "skillCovered": np.zeros(len(chunk_skills.vocabulary), dtype=np.int64),
+                "uncoveredSample": [],
+            }
+            for course_id, rows in self.course_rows.items()
+        }
+
+        with span("coverage.compute") as s:
+            s.add("modules", num_modules)
+            s.add("chunks", num_chunks)
+            module_vectors = _normalise(embed_texts([module["text"] for module in self.modules]))
+            for start in range(0, num_chunks, self.block_size):
+                end = min(start + self.block_size, num_chunks)
+                ids = np.arange(start, end)
+                similarities = module_vectors @ _normalise(store.vectors(ids)).T  # modules x block
+                matches = similarities >= self.threshold
+
+                demand += matches.sum(axis=1)
+                merged = np.concatenate((top, similarities), axis=1)
+                top = np.partition(merged, -top.shape[1], axis=1)[:, -top.shape[1]:]
+
+                postings = slice(chunk_skills.indptr[start], chunk_skills.indptr[end])
+                block_skill_ids = chunk_skills.indices[postings]
+                for stats in courses.values():
+                    course_similarities = similarities[stats["rows"]]
+                    best = np.argmax(course_similarities, axis=0)
+                    covered = course_similarities[best, np.arange(len(ids))] >= self.threshold
+                    np.add.at(best_match, stats["rows"][best[covered]], 1)
+                    stats["covered"] += int(covered.sum())
+                    covered_postings = np.repeat(covered, skill_counts[start:end])
+                    stats["skillCovered"] += np.bincount(block_skill_ids[covered_postings],
+                                                         minlength=len(stats["skillCovered"]))
+                    uncovered_ids = ids[~covered]
+                    stats["uncoveredSample"].extend(uncovered_ids[uncovered_ids % stride == 0].tolist())
+
+        self._stats = {
+            "chunkSkills": chunk_skills,
+            "skillDemand": chunk_skills.skill_frequency(),
+            "demand": demand,
+            "bestMatch": best_match,
+            "top": top,
+            "courses": courses,
+            "stride": stride,
+        }
+        return self
+
+    def summary(self, course_id, max_skills: int = 10) -> dict:
+        """
+        Ranked coverage summary of one course.
+
+        Returns:
+            Dict with totalChunks, coveredShare, modules (ranked by demandCount),
+            underservedSkills (skills with uncovered job chunks, most left
+            uncovered first) and uncoveredClusters (largest first); None for
+            an unknown course
+        """
+        self.compute()
+        stats = self._stats
+        course = stats["courses"].get(course_id)
+        if course is None:
+            return None
+        num_chunks = len(self.vector_store.texts)
+
+        modules = []
+        for row in course["rows"]:
+            meta = self.modules[row]["metadata"]
+            top = stats["top"][row]
+            top = top[np.isfinite(top)]
+            modules.append({
+                "moduleId": meta.get("moduleId"),
+                "title": meta.get("moduleTitle"),
+                "skills": meta.get("moduleSkills", []),
+                "demandCount": int(stats["demand"][row]),
+                "bestMatchCount": int(stats["bestMatch"][row]),
+                "meanTopSimilarity": round(float(top.mean()), 4) if len(top) else 0.0,
+            })
+        modules.sort(key=lambda m: (-m["demandCount"], -m["meanTopSimilarity"]))
+
+        taught = {skill.lower() for module in modules for skill in module["skills"]}
+        vocabulary = stats["chunkSkills"].vocabulary
+        underserved = []
+        for skill, count in stats["skillDemand"].items():
+            covered = int(course["skillCovered"][vocabulary.get(skill)])
+            if covered >= count:
+                continue  # Every job chunk asking for it is covered
+            underserved.append({
+                "skill": skill,
+                "jobChunks": count,
+                "coveredShare": round(covered / count, 4),
+                "inCurriculum": skill.lower() in taught,
+            })
+        underserved.sort(key=lambda s: (-(s["jobChunks"] * (1 - s["coveredShare"])), s["skill"]))
+
+        return {
+            "courseId": course_id,
+            "totalChunks": num_chunks,
+            "coveredShare": round(course["covered"] / num_chunks, 4) if num_chunks else 0.0,
+            "threshold": self.threshold,
+            "modules": modules,
+            "underservedSkills": underserved[:max_skills],
+            "uncoveredClusters": self._clusters(course["uncoveredSample"], stats["stride"]),
+        }
+
+    def _clusters(self, sample_ids: list, stride: int) -> list:
+        """Cluster sampled uncovered chunks and describe each cluster by its skills and titles."""
+        if not sample_ids:
+            return []
+        ids = np.array(sample_ids, dtype=np.int64)
+        with span("coverage.cluster") as s:
+            s.add("chunks", len(ids))
+            labels = spherical_kmeans(_normalise(self.vector_store.vectors(ids)), self.clusters, seed=self.seed)
+
+        clusters = []
+        for label in np.unique(labels):
+            members = ids[labels == label]
+            skill_counts = {}
+            titles = []
+            for chunk_id in members.tolist():
+                meta = self.vector_store.metadata[chunk_id]
+                for skill in meta.get("extractedSkills", []):
+                    skill_counts[skill] = skill_counts.get(skill, 0) + 1
+                title = meta.get("jobTitle")
+                if title and title not in titles and len(titles) < 3:
+                    titles.append(title)
+            clusters.append({
+                "estimatedChunks": int(len(members) * stride),
+                "topSkills": [skill for skill, _ in sorted(skill_counts.items(), key=lambda kv: (-kv[1], kv[0]))[:5]],
+                "sampleTitles": titles,
+            })
+        clusters.sort(key=lambda c: -c["estimatedChunks"])
+        return clusters
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "embedding_cache"
+DEFAULT_MAX_ENTRIES = 200_000  # ~300 MB of float32 vectors at dim 384
+DEFAULT_BATCH_SIZE = 64
+
+VECTORS_FILE = "vectors.f32"
+INDEX_FILE = "index.db"
+
+
+def text_key(model_name: str, text: str) -> str:
+    """Content address of an embedding: model name plus a hash of the text."""
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    On-disk, size-bounded LRU cache of embedding vectors.
+
+    Vectors live in a memory-mapped float32 file with one row per slot;
+    a small SQLite table maps each content key to its slot and last-use time.
+    When all max_entries slots are taken, the least recently used entries
+    are evicted and their slots reused.
+
+    Meant for one writer process at a time; threads of that process (e.g.
+    the service's request and update threads) may share one instance.
+    """
+
+    def __init__(self, cache_dir: str = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.cache_dir / INDEX_FILE), check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, slot INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.commit()
+
+        self.dim = None
+        self.vectors = None
+        row = self.conn.execute("SELECT value FROM meta WHERE name = 'layout'").fetchone()
+        if row is not None:
+            layout = json.loads(row[0])
+            if layout["max_entries"] == max_entries:
+                self._open_vectors(layout["dim"], mode="r+")
+            else:
+                # Capacity changed: start over rather than remap slots
+                self.clear()
+
+    def _open_vectors(self, dim: int, mode: str):
+        self.dim = dim
+        self.vectors = np.memmap(
+            self.cache_dir / VECTORS_FILE, dtype=np.float32, mode=mode, shape=(self.max_entries, dim)
+        )
+
+    def _init_layout(self, dim: int):
+        self._open_vectors(dim, mode="w+")
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES ('layout', ?)",
+            (json.dumps({"dim": dim, "max_entries": self.max_entries}),)
+        )
+        self.conn.commit()
+
+    def clear(self):
+        """Drop every cached vector."""
+        self.conn.execute("DELETE FROM entries")
+        self.conn.execute("DELETE FROM meta")
+        self.conn.commit()
+        self.vectors = None
+        self.dim = None
+        (self.cache_dir / VECTORS_FILE).unlink(missing_ok=True)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _lookup(self, keys: list) -> dict:
+        found = {}
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT key, slot FROM entries WHERE key IN ({','.join('?' * len(batch))})", batch
+            )
+            found.update(rows)
+        return found
+
+    def _allocate(self, count: int) -> list:
+        """Reserve up to count slots, evicting least recently used entries if needed."""
+        used = len(self)
+        free = list(range(used, min(self.max_entries, used + count)))
+        shortfall = min(count, self.max_entries) - len(free)
+        if shortfall > 0:
+            evicted = self.conn.execute(
+                "SELECT key, slot FROM entries ORDER BY last_used LIMIT ?", (shortfall,)
+            ).fetchall()
+            self.conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in evicted])
+            free.extend(slot for _, slot in evicted)
+        return free
+
+    def embed(self, texts: list, embed_fn, model_name: str, batch_size: int = DEFAULT_BATCH_SIZE) -> np.ndarray:
+        """
+        Return embeddings for texts, calling embed_fn only for cache misses.
+
+        Args:
+            texts: Texts to embed
+            embed_fn: Function taking a list of texts and returning a list of vectors
+                (e.g. HuggingFaceEmbeddings.embed_documents)
+            model_name: Embedding model name (part of the cache key)
+            batch_size: Number of missed texts passed to embed_fn per call
+
+        Returns:
+            float32 array of shape (len(texts), dim), in text order
+        """
+        if not texts:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        with self._lock:
+            return self._embed(texts, embed_fn, model_name, batch_size)
+
+    def _embed(self, texts: list, embed_fn, model_name: str, batch_size: int) -> np.ndarray:
+        keys = [text_key(model_name, text) for text in texts]
+        slots = self._lookup(list(set(keys))) if self.vectors is not None else {}
+
+        # Identical texts within one call are embedded once
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in slots and key not in missing:
+                missing[key] = text
+
+        fresh = {}
+        missing_keys = list(missing)
+        for start in range(0, len(missing_keys), batch_size):
+            batch_keys = missing_keys[start:start + batch_size]
+            vectors = np.asarray(embed_fn([missing[key] for key in batch_keys]), dtype=np.float32)
+            fresh.update(zip(batch_keys, vectors))
+
+        if fresh and self.vectors is None:
+            self._init_layout(next(iter(fresh.values())).shape[0])
+
+        # Copy hits out before any eviction can reuse their slots
+        result = np.empty((len(texts), self.dim), dtype=np.float32)
+        for i, key in enumerate(keys):
+            result[i] = fresh[key] if key in fresh else self.vectors[slots[key]]
+
+        now = time.time_ns()
+        self.conn.executemany(
+            "UPDATE entries SET last_used = ? WHERE key = ?", [(now, key) for key in slots]
+        )
+        if fresh:
+            free = self._allocate(len(fresh))
+            stored = list(zip(fresh.items(), free))
+            for (_, vector), slot in stored:
+                self.vectors[slot] = vector
+            self.vectors.flush()
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, slot, last_used) VALUES (?, ?, ?)",
+                [(key, slot, now) for (key, _), slot in stored]
+            )
+        self.conn.commit()
+
+        hits = sum(1 for key in keys if key in slots)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return result
+
+    def close(self):
+        self.conn.close()
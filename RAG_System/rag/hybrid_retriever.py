@@ -0,0 +1,277 @@
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+from observability.tracing import span
+from rag.vector_store import SKILL_FIELDS, embed_texts
+
+TOKEN_PATTERN = re.compile(r"\w+")
+SKILL_TERM_PREFIX = "skill:"  # Skill terms are indexed apart from words of the same spelling
+
+DEFAULT_K1 = 1.5
+DEFAULT_B = 0.75
+DEFAULT_ALPHA = 0.5  # Weight of dense similarity in the fused score (1 - alpha for BM25)
+DEFAULT_CANDIDATES = 100  # BM25 candidates re-ranked per query
+MAX_DF_RATIO = 0.5  # Word terms in more than this share of chunks are ignored (stop words); skill terms never are
+
+
+def record_terms(text: str, skills=()) -> list:
+    """Index terms of a record: lowercased word tokens plus one term per skill."""
+    terms = TOKEN_PATTERN.findall(text.lower())
+    terms.extend(SKILL_TERM_PREFIX + skill.lower() for skill in skills)
+    return terms
+
+
+def _record_skills(meta: dict) -> list:
+    skills = []
+    for field in SKILL_FIELDS:
+        skills.extend(meta.get(field) or [])
+    return skills
+
+
+class BM25Index:
+    """
+    Inverted index with Okapi BM25 weights over a fixed set of records.
+
+    Postings are stored per term in CSR form (term_indptr into doc_ids and
+    weights), and each posting holds its precomputed BM25 weight, so scoring
+    a query is one scatter-add of each query term's postings into a dense
+    score array, then a partial sort for the top k.
+    """
+
+    def __init__(self, term_ids: dict, term_indptr: np.ndarray, doc_ids: np.ndarray,
+                 weights: np.ndarray, num_docs: int):
+        self.term_ids = term_ids
+        self.term_indptr = term_indptr
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.num_docs = num_docs
+
+    @classmethod
+    def build(cls, term_lists, k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        """
+        Index records given as lists of terms (see record_terms).
+
+        Returns:
+            BM25Index
+        """
+        term_ids = {}
+        posting_terms, posting_docs, posting_tfs, doc_lengths = [], [], [], []
+        for doc, terms in enumerate(term_lists):
+            counts = Counter(terms)
+            posting_terms.extend(term_ids.setdefault(term, len(term_ids)) for term in counts)
+            posting_docs.extend([doc] * len(counts))
+            posting_tfs.extend(counts.values())
+            doc_lengths.append(len(terms))
+
+        num_docs = len(doc_lengths)
+        posting_terms = np.array(posting_terms, dtype=np.int64)
+        doc_ids = np.array(posting_docs, dtype=np.int32)
+        tfs = np.array(posting_tfs, dtype=np.float32)
+        doc_lengths = np.array(doc_lengths, dtype=np.float32)
+
+        # Group postings by term (stable, so doc ids stay sorted within a term)
+        order = np.argsort(posting_terms, kind="stable")
+        posting_terms, doc_ids, tfs = posting_terms[order], doc_ids[order], tfs[order]
+        df = np.bincount(posting_terms, minlength=len(term_ids))
+        term_indptr = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+
+        idf = np.log(1.0 + (num_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+        avg_length = float(doc_lengths.mean()) if num_docs else 0.0
+        norm = k1 * (1 - b + b * doc_lengths[doc_ids] / max(avg_length, 1e-9))
+        weights = idf[posting_terms] * tfs * (k1 + 1) / (tfs + norm)
+        return cls(term_ids, term_indptr, doc_ids, weights.astype(np.float32), num_docs)
+
+    def search(self, terms, k: int, max_df_ratio: float = MAX_DF_RATIO):
+        """
+        Top k records by BM25 score for a query.
+
+        Word terms in more than max_df_ratio of the records are skipped as
+        stop words. Skill terms are always scored: the most in-demand skills
+        are exactly the frequent ones, and idf already weights them down.
+
+        Returns:
+            doc_ids, scores: Arrays sorted by descending score (records
+            sharing no indexed term with the query are not returned)
+        """
+        max_df = max(1, int(self.num_docs * max_df_ratio))
+        scores = None
+        for term in set(terms):
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            start, end = self.term_indptr[term_id], self.term_indptr[term_id + 1]
+            if end - start <= max_df or term.startswith(SKILL_TERM_PREFIX):
+                if scores is None:
+                    scores = np.zeros(self.num_docs, dtype=np.float32)
+                # A term lists each record once, so the fancy-indexed add does not drop repeats
+                scores[self.doc_ids[start:end]] += self.weights[start:end]
+        if scores is None:
+            return np.array([], dtype=np.int32), np.array([], dtype=np.float32)
+
+        # BM25 weights are positive: a zero score means no shared term
+        matched = np.count_nonzero(scores)
+        if matched > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.flatnonzero(scores)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return top.astype(np.int32), scores[top]
+
+
+class HybridRetriever:
+    """
+    Sparse candidate generation with dense re-ranking over a VectorStore.
+
+    A BM25 index over the store's texts and skills is built once. Each query
+    takes the top `candidates` records by BM25 (topped up from the store's
+    dense index when BM25 finds fewer than k), re-ranks them by cosine
+    similarity to the query embedding and orders them by
+    alpha * dense + (1 - alpha) * BM25, both min-max normalised over the
+    candidates. Only the candidates' vectors are touched, so cost does not
+    grow with the corpus beyond the postings of the query terms.
+    """
+
+    def __init__(self, vector_store, alpha: float = DEFAULT_ALPHA, candidates: int = DEFAULT_CANDIDATES,
+                 k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        self.vector_store = vector_store
+        self.alpha = alpha
+        self.candidates = candidates
+        with span("bm25.build") as s:
+            s.add("records", len(vector_store.texts))
+            self.sparse_index = BM25Index.build(
+                (record_terms(text, _record_skills(meta))
+                 for text, meta in zip(vector_store.texts, vector_store.metadata)),
+                k1=k1, b=b
+            )
+
+    def retrieve(self, query: str, k: int = 10, skills=()) -> list:
+        """Top k records for a query (skills are matched against the records' skill terms)."""
+        return self.retrieve_batch([query], k, [skills])[0]
+
+    def retrieve_batch(self, queries, k: int = 10, skills_list=None) -> list:
+        """
+        Hybrid top k for many queries, with one embedding call for all of them.
+
+        Args:
+            queries: List of query strings
+            k: Results per query
+            skills_list: Optional list (one per query) of skills to match
+
+        Returns:
+            List (one per query) of lists of {"id", "text", "metadata", "score",
+            "sparseScore", "denseScore"} results, best first
+        """
+        if not queries:
+            return []
+        skills_list = skills_list or [()] * len(queries)
+
+        with span("bm25.search") as s:
+            s.add("queries", len(queries))
+            candidates = [
+                self.sparse_index.search(record_terms(query, skills), max(k, self.candidates))
+                for query, skills in zip(queries, skills_list)
+            ]
+        query_vectors = None
+        short = [i for i, (ids, _) in enumerate(candidates) if len(ids) < k]
+        if short or self.alpha != 0:
+            query_vectors = embed_texts(list(queries))
+        if short:
+            self._backfill(candidates, short, query_vectors[short], k)
+        if self.alpha == 0 or not any(len(ids) for ids, _ in candidates):
+            dense = [None] * len(queries)
+        else:
+            dense = self._dense_scores(query_vectors, candidates)
+
+        results = []
+        for (ids, sparse), dense_scores in zip(candidates, dense):
+            if not len(ids):
+                results.append([])
+                continue
+            fused = (1 - self.alpha) * _min_max(sparse)
+            if dense_scores is not None:
+                fused = fused + self.alpha * _min_max(dense_scores)
+            order = np.argsort(-fused, kind="stable")[:k]
+            results.append([
+                {
+                    "id": int(ids[i]),
+                    "text": self.vector_store.texts[ids[i]],
+                    "metadata": self.vector_store.metadata[ids[i]],
+                    "score": float(fused[i]),
+                    "sparseScore": float(sparse[i]),
+                    "denseScore": None if dense_scores is None else float(dense_scores[i]),
+                }
+                for i in order
+            ])
+        return results
+
+    def _backfill(self, candidates: list, short: list, query_vectors, k: int):
+        """Top up queries with fewer than k BM25 candidates from the dense index (sparse score 0)."""
+        with span("dense.backfill") as s:
+            s.add("queries", len(short))
+            dense_ids = self.vector_store.search_ids(query_vectors, k + max(len(candidates[i][0]) for i in short))
+            for i, row in zip(short, dense_ids):
+                ids, sparse = candidates[i]
+                taken = set(ids.tolist())
+                extra = [doc for doc in row if doc >= 0 and doc not in taken][:k - len(ids)]
+                candidates[i] = (
+                    np.concatenate((ids, np.array(extra, dtype=np.int32))),
+                    np.concatenate((sparse, np.zeros(len(extra), dtype=np.float32))),
+                )
+
+    def _dense_scores(self, query_vectors, candidates) -> list:
+        """Cosine similarity of each query to its own candidates."""
+        query_vectors = _normalise(query_vectors)
+        all_ids = np.unique(np.concatenate([ids for ids, _ in candidates]))
+        with span("dense.rerank") as s:
+            s.add("candidates", len(all_ids))
+            vectors = _normalise(self.vector_store.vectors(all_ids))
+            rows = {doc: row for row, doc in enumerate(all_ids.tolist())}
+            return [
+                vectors[[rows[doc] for doc in ids.tolist()]] @ query_vector if len(ids) else None
+                for (ids, _), query_vector in zip(candidates, query_vectors)
+            ]
+
+
+def retrieve_course_evidence(retriever: HybridRetriever, course_modules: list, per_module: int = 3,
+                             limit: int = 10) -> list:
+    """
+    Job chunks relevant to a course: the best hybrid matches for each module.
+
+    Modules are queried by their text and skills in one batch. Results are
+    taken round-robin across modules (best of each module first), skipping
+    chunks already taken, until limit chunks are collected.
+
+    Returns:
+        List of {"text", "metadata"} job chunks
+    """
+    results = retriever.retrieve_batch(
+        [module["text"] for module in course_modules],
+        k=per_module,
+        skills_list=[module["metadata"].get("moduleSkills", []) for module in course_modules]
+    )
+    evidence = []
+    seen = set()
+    for rank in range(per_module):
+        for module_results in results:
+            if rank < len(module_results) and module_results[rank]["id"] not in seen:
+                seen.add(module_results[rank]["id"])
+                evidence.append({"text": module_results[rank]["text"], "metadata": module_results[rank]["metadata"]})
+                if len(evidence) >= limit:
+                    return evidence
+    return evidence
+
+
+def _normalise(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def _min_max(scores: np.ndarray) -> np.ndarray:
+    low, high = float(scores.min()), float(scores.max())
+    if math.isclose(low, high):
+        return np.ones_like(scores)
+    return (scores - low) / (high - low)
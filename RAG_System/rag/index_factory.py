@@ -0,0 +1,110 @@
+import math
+
+import faiss
+import numpy as np
+
+# Supported VectorStore index types
+#   flat     - exact brute-force L2 (IndexFlatL2), the default
+#   hnsw     - graph-based ANN, no training, tune with ef_search
+#   ivf_flat - inverted file over full vectors, tune with nprobe
+#   ivf_pq   - inverted file + product quantization (~16x smaller), tune with nprobe
+#   ivf_sq8  - inverted file + int8 scalar quantization (4x smaller), tune with nprobe
+#   sq8      - brute force over int8 scalar-quantized vectors (4x smaller)
+INDEX_TYPES = ("flat", "hnsw", "ivf_flat", "ivf_pq", "ivf_sq8", "sq8")
+
+DEFAULT_HNSW_M = 32
+DEFAULT_TRAIN_SAMPLE = 100_000
+MIN_POINTS_PER_CENTROID = 39  # FAISS warns below this many training points per list
+
+
+def default_nlist(n: int) -> int:
+    """Number of IVF lists for n vectors: ~4*sqrt(n), bounded by the training data."""
+    return max(1, min(int(4 * math.sqrt(n)), n // MIN_POINTS_PER_CENTROID))
+
+
+def default_pq_m(dim: int) -> int:
+    """Largest PQ sub-quantizer count <= dim/8 that divides dim (8 dims per code byte)."""
+    for m in range(max(1, dim // 8), 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+def build_faiss_index(vectors: np.ndarray, index_type: str = "flat", nlist: int = None,
+                      pq_m: int = None, hnsw_m: int = DEFAULT_HNSW_M,
+                      train_sample: int = DEFAULT_TRAIN_SAMPLE, seed: int = 0):
+    """
+    Build and fill a FAISS index of the requested type.
+
+    Indexes that need training (IVF, PQ, SQ) are trained on a random sample
+    of at most train_sample vectors, then all vectors are added.
+
+    Args:
+        vectors: float32 array of shape (n, dim)
+        index_type: One of INDEX_TYPES
+        nlist: IVF list count (defaults to default_nlist(n))
+        pq_m: PQ sub-quantizers for ivf_pq (defaults to default_pq_m(dim))
+        hnsw_m: HNSW graph degree
+        train_sample: Maximum number of vectors used for training
+        seed: Seed for the training sample
+
+    Returns:
+        A filled FAISS index
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index_type '{index_type}'. Expected one of {INDEX_TYPES}")
+
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, dim = vectors.shape
+
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(dim)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, hnsw_m)
+    elif index_type == "sq8":
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit)
+    else:
+        nlist = nlist or default_nlist(n)
+        quantizer = faiss.IndexFlatL2(dim)
+        if index_type == "ivf_flat":
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist)
+        elif index_type == "ivf_sq8":
+            index = faiss.IndexIVFScalarQuantizer(quantizer, dim, nlist, faiss.ScalarQuantizer.QT_8bit)
+        else:
+            # 8-bit codes need 256 centroids per sub-quantizer; use fewer bits on small corpora
+            nbits = min(8, max(1, int(math.log2(max(2, min(n, train_sample) // MIN_POINTS_PER_CENTROID)))))
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, pq_m or default_pq_m(dim), nbits)
+
+    if not index.is_trained:
+        if n > train_sample:
+            rng = np.random.default_rng(seed)
+            sample = vectors[np.sort(rng.choice(n, size=train_sample, replace=False))]
+        else:
+            sample = vectors
+        index.train(sample)
+
+    index.add(vectors)
+    return index
+
+
+def set_search_params(index, nprobe: int = None, ef_search: int = None):
+    """
+    Tune the recall/speed tradeoff of an index in place.
+
+    Args:
+        index: FAISS index built by build_faiss_index (or loaded from disk)
+        nprobe: IVF lists visited per query (ignored for non-IVF indexes)
+        ef_search: HNSW candidate list size (ignored for non-HNSW indexes)
+    """
+    if nprobe is not None:
+        try:
+            faiss.extract_index_ivf(index).nprobe = nprobe
+        except RuntimeError:
+            pass
+    if ef_search is not None and hasattr(index, "hnsw"):
+        index.hnsw.efSearch = ef_search
+
+
+def index_memory_bytes(index) -> int:
+    """Approximate memory held by an index (its serialized size)."""
+    return int(faiss.serialize_index(index).nbytes)
@@ -1,62 +1,573 @@
+import hashlib
+import json
+import math
+import os
+import threading
+from pathlib import Path
+
 import faiss
 import numpy as np
-from langchain_huggingface import HuggingFaceEmbeddings
 
-embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+from observability.tracing import span
+from rag.embedding_cache import DEFAULT_BATCH_SIZE, EmbeddingCache
+from rag.index_factory import build_faiss_index, set_search_params
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Bump when the on-disk layout written by VectorStore.save changes
+INDEX_FORMAT_VERSION = 1
+DEFAULT_INDEX_DIR = Path(__file__).parent.parent.parent / "data" / "vector_index"
+INDEX_FILE = "index.faiss"
+HEADER_FILE = "header.json"
+RECORDS_FILE = "records.jsonl"
+
+# Metadata fields searched by the "skill" filter (job chunks / curriculum modules)
+SKILL_FIELDS = ("extractedSkills", "moduleSkills")
+# Over-fetch factor when an index type cannot apply an IDSelector during search
+FILTER_OVERFETCH = 10
+# IVF lists probed by a filtered search: enough to hold this many times k allowed ids on average
+FILTER_PROBE_MARGIN = 8
+
+_embeddings = None
+_embeddings_lock = threading.Lock()
 
-def create_index(texts):
-    vectors = embeddings.embed_documents(texts)
-    dim = len(vectors[0])
+def get_embeddings():
+    """
+    Return the shared HuggingFaceEmbeddings model, loading it on first use.
+    
+    Importing langchain_huggingface pulls in torch and the model weights, so it
+    is deferred until something actually needs an embedding. Thread-safe.
+    """
+    global _embeddings
+    if _embeddings is None:
+        with _embeddings_lock:
+            if _embeddings is None:
+                from langchain_huggingface import HuggingFaceEmbeddings
+                _embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_NAME)
+    return _embeddings
+
+def __getattr__(name):
+    # Keep `from rag.vector_store import embeddings` working without eager loading
+    if name == "embeddings":
+        return get_embeddings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _embed_documents(texts):
+    return get_embeddings().embed_documents(texts)
+
+def embed_texts(texts, cache: EmbeddingCache = None, batch_size: int = DEFAULT_BATCH_SIZE) -> np.ndarray:
+    """
+    Embed texts in batches, going through the embedding cache when given.
+    
+    Returns:
+        float32 array of shape (len(texts), dim)
+    """
+    with span("embedding") as s:
+        s.add("texts", len(texts))
+        if cache is not None:
+            hits_before, misses_before = cache.hits, cache.misses
+            # Full cache hits never load the model
+            vectors = cache.embed(texts, _embed_documents, EMBEDDING_MODEL_NAME, batch_size)
+            s.add("cache_hits", cache.hits - hits_before)
+            s.add("cache_misses", cache.misses - misses_before)
+            return vectors
+        
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            vectors.extend(_embed_documents(texts[start:start + batch_size]))
+        return np.array(vectors, dtype=np.float32)
+
+def create_index(texts, cache: EmbeddingCache = None):
+    vectors = embed_texts(texts, cache)
+    dim = vectors.shape[1]
 
     index = faiss.IndexFlatL2(dim)
-    index.add(np.array(vectors).astype("float32"))
+    index.add(vectors)
 
     return index
 
+def compute_fingerprint(texts, metadata) -> str:
+    """
+    Fingerprint of everything a saved index depends on.
+    
+    Covers the format version, embedding model, texts and metadata, so an
+    index saved for different inputs is detected as stale.
+    """
+    return _fingerprints(texts, metadata)[1]
+
+def _fingerprints(texts, metadata, prefix: int = None) -> tuple:
+    """
+    compute_fingerprint of the first `prefix` records and of all records, in one pass.
+    
+    Returns:
+        prefix_fingerprint (None if there are fewer than prefix records), fingerprint
+    """
+    def finish(digest, count):
+        digest.update(str(count).encode("utf-8"))
+        return digest.hexdigest()
+    
+    digest = hashlib.sha256(f"{INDEX_FORMAT_VERSION}\0{EMBEDDING_MODEL_NAME}".encode("utf-8"))
+    prefix_fingerprint = None
+    count = 0
+    for text, meta in zip(texts, metadata):
+        if count == prefix:
+            prefix_fingerprint = finish(digest.copy(), count)
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(json.dumps(meta, sort_keys=True, default=str).encode("utf-8"))
+        count += 1
+    if count == prefix:
+        prefix_fingerprint = finish(digest.copy(), count)
+    return prefix_fingerprint, finish(digest, count)
+
+def _read_header(path) -> dict:
+    try:
+        with open(Path(path) / HEADER_FILE) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _fsync_file(path):
+    """Flush a file written by another library (e.g. faiss.write_index) to disk."""
+    with open(path, "rb+") as f:
+        os.fsync(f.fileno())
+
 
 class VectorStore:
     """Vector store using FAISS for efficient retrieval."""
     
-    def __init__(self):
+    def __init__(self, use_embedding_cache: bool = True, cache_dir: str = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, index_type: str = "flat",
+                 index_params: dict = None, nprobe: int = None, ef_search: int = None):
+        """
+        Args:
+            use_embedding_cache: Reuse embeddings of previously seen texts
+                (content-addressed, stored under data/embedding_cache)
+            cache_dir: Embedding cache directory override
+            batch_size: Number of texts embedded per model call
+            index_type: FAISS index type, see rag.index_factory.INDEX_TYPES
+                ("flat" is exact; hnsw/ivf_* /sq8 trade recall for speed or memory)
+            index_params: Build options for build_faiss_index (nlist, pq_m, hnsw_m, train_sample)
+            nprobe: IVF lists searched per query
+            ef_search: HNSW search breadth
+        """
         self.index = None
         self.texts = []
         self.metadata = []
         self.embeddings_cache = []
+        self.fingerprint = None
+        self._filter_indexes = {}
+        self.use_embedding_cache = use_embedding_cache
+        self.cache_dir = cache_dir
+        self.batch_size = batch_size
+        self._embedding_cache = None
+        self.last_build_stats = {}
+        self.index_type = index_type
+        self.index_params = index_params or {}
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+    
+    def _get_embedding_cache(self):
+        if self.use_embedding_cache and self._embedding_cache is None:
+            self._embedding_cache = EmbeddingCache(self.cache_dir)
+        return self._embedding_cache
     
     def build_index(self, texts, metadata):
-        """Build FAISS index from texts and metadata."""
+        """
+        Build FAISS index from texts and metadata.
+        
+        texts and metadata may be any sequences (e.g. the lazy ChunkList.texts
+        and .metadata views); they are kept as given, not copied.
+        """
         self.texts = texts
         self.metadata = metadata
+        self.fingerprint = compute_fingerprint(texts, metadata)
+        self._filter_indexes = {}
         
-        # Generate embeddings
-        self.embeddings_cache = embeddings.embed_documents(texts)
+        # Generate embeddings (only cache misses reach the model)
+        cache = self._get_embedding_cache()
+        hits_before, misses_before = (cache.hits, cache.misses) if cache else (0, 0)
+        self.embeddings_cache = embed_texts(texts, cache, self.batch_size)
+        if cache:
+            self.last_build_stats = {
+                "hits": cache.hits - hits_before,
+                "misses": cache.misses - misses_before,
+            }
+            print(f"  ✓ Embedding cache: {self.last_build_stats['hits']} hits, "
+                  f"{self.last_build_stats['misses']} misses")
         
         # Create FAISS index
-        dim = len(self.embeddings_cache[0])
-        self.index = faiss.IndexFlatL2(dim)
-        self.index.add(np.array(self.embeddings_cache).astype("float32"))
+        with span("faiss.build", index_type=self.index_type) as s:
+            s.add("vectors", len(self.embeddings_cache))
+            self.index = build_faiss_index(self.embeddings_cache, self.index_type, **self.index_params)
+            set_search_params(self.index, self.nprobe, self.ef_search)
+    
+    def add(self, texts, metadata):
+        """
+        Append records to a built index without re-embedding the existing ones.
+        
+        New texts go through the embedding cache; falls back to a full rebuild
+        if the index refuses the additions.
+        """
+        if self.index is None:
+            raise ValueError("Index not built. Call build_index() first.")
+        if not texts:
+            return
+        self.extend(list(self.texts) + list(texts), list(self.metadata) + list(metadata))
+    
+    def extend(self, texts, metadata):
+        """
+        Index the records of texts/metadata past the ones already indexed.
+        
+        texts and metadata must start with the store's current records, e.g.
+        ChunkList views that grew through JobTable.add_job; they replace the
+        store's sequences. Only the new texts are embedded (through the
+        embedding cache); falls back to a full rebuild if the index refuses
+        the additions.
+        """
+        if self.index is None:
+            raise ValueError("Index not built. Call build_index() first.")
+        start = self.index.ntotal
+        if len(texts) < start or len(metadata) != len(texts):
+            raise ValueError(f"Expected at least the {start} indexed records, got {len(texts)}")
+        if len(texts) == start:
+            return
+        
+        vectors = embed_texts(list(texts[start:]), self._get_embedding_cache(), self.batch_size)
+        try:
+            self.index.add(vectors)
+        except RuntimeError:
+            self.build_index(texts, metadata)
+            return
+        
+        self.texts = texts
+        self.metadata = metadata
+        self.fingerprint = None  # Computed by save() (load_or_build already knows it)
+        self._filter_indexes = {}
+        if len(self.embeddings_cache):
+            self.embeddings_cache = np.vstack((self.embeddings_cache, vectors))
+    
+    def embed(self, texts) -> np.ndarray:
+        """Embed texts (e.g. prompt evidence) through the store's embedding cache."""
+        return embed_texts(list(texts), self._get_embedding_cache(), self.batch_size)
+    
+    def retrieve(self, query, k=10, filters=None):
+        """Retrieve top k chunks similar to query (optionally metadata-filtered)."""
+        return self.retrieve_batch([query], k, filters)[0]
+    
+    def vectors(self, ids) -> np.ndarray:
+        """
+        Embeddings of the records ids, without a search.
+        
+        Taken from the in-memory embeddings after build_index, reconstructed
+        from the index after load() when the index type stores vectors, and
+        re-embedded (through the embedding cache) otherwise.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(self.embeddings_cache):
+            return np.asarray(self.embeddings_cache)[ids]
+        try:
+            return self.index.reconstruct_batch(ids)
+        except RuntimeError:
+            return embed_texts([self.texts[i] for i in ids], self._get_embedding_cache(), self.batch_size)
     
-    def retrieve(self, query, k=10):
-        """Retrieve top k chunks similar to query."""
+    def _field_index(self, field):
+        """
+        Map each value of a metadata field to the sorted ids of records having it.
+        
+        List-valued fields (e.g. extractedSkills) index every element, and the
+        virtual field "skill" covers both extractedSkills and moduleSkills.
+        Built on first use and reused for every later filtered query.
+        """
+        if field not in self._filter_indexes:
+            source_fields = SKILL_FIELDS if field == "skill" else (field,)
+            ids_by_value = {}
+            for idx, meta in enumerate(self.metadata):
+                for source_field in source_fields:
+                    value = meta.get(source_field)
+                    values = value if isinstance(value, (list, tuple, set)) else [value]
+                    for v in values:
+                        if field == "skill" and isinstance(v, str):
+                            v = v.lower()
+                        ids_by_value.setdefault(v, []).append(idx)
+            self._filter_indexes[field] = {
+                value: np.unique(np.array(ids, dtype=np.int64)) for value, ids in ids_by_value.items()
+            }
+        return self._filter_indexes[field]
+    
+    def filter_ids(self, filters):
+        """
+        Resolve metadata filters to the ids of matching records.
+        
+        Args:
+            filters: Dict of field: value or field: list of accepted values,
+                e.g. {"courseId": 1}, {"location": ["Pune", "Remote"], "skill": "docker"}.
+                Fields are ANDed, values within a field are ORed.
+            
+        Returns:
+            Sorted int64 array of matching ids
+        """
+        ids = None
+        for field, wanted in filters.items():
+            values = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            if field == "skill":
+                values = [v.lower() if isinstance(v, str) else v for v in values]
+            field_index = self._field_index(field)
+            matched = [field_index[v] for v in values if v in field_index]
+            matched = np.unique(np.concatenate(matched)) if matched else np.array([], dtype=np.int64)
+            ids = matched if ids is None else np.intersect1d(ids, matched, assume_unique=True)
+        return ids if ids is not None else np.arange(len(self.texts), dtype=np.int64)
+    
+    def retrieve_batch(self, queries, k=10, filters=None):
+        """
+        Retrieve top k chunks for many queries with one embedding call and one search.
+        
+        Args:
+            queries: List of query strings
+            k: Results per query
+            filters: Optional metadata filters applied to every query (see filter_ids)
+            
+        Returns:
+            List (one per query) of lists of {"text", "metadata"} results
+        """
         if self.index is None:
             raise ValueError("Index not built. Call build_index() first.")
+        if not queries:
+            return []
         
-        # Embed the query
-        query_embedding = embeddings.embed_documents([query])
+        # Embed all queries at once
+        with span("embedding.query") as s:
+            s.add("texts", len(queries))
+            query_matrix = np.array(_embed_documents(list(queries)), dtype=np.float32)
         
-        # Search
-        distances, indices = self.index.search(
-            np.array(query_embedding).astype("float32"), 
-            k=min(k, len(self.texts))
-        )
+        allowed = None
+        if filters:
+            allowed = self.filter_ids(filters)
+            if len(allowed) == 0:
+                return [[] for _ in queries]
+        
+        indices = self.search_ids(query_matrix, k, allowed)
         
         # Build results with text and metadata
-        results = []
-        for idx in indices[0]:
-            if 0 <= idx < len(self.texts):
-                results.append({
-                    "text": self.texts[idx],
-                    "metadata": self.metadata[idx]
-                })
-        
-        return results
+        return [
+            [
+                {"text": self.texts[idx], "metadata": self.metadata[idx]}
+                for idx in row if 0 <= idx < len(self.texts)
+            ]
+            for row in indices
+        ]
+    
+    def search_ids(self, query_matrix, k=10, allowed=None):
+        """
+        Ids of the top k records for each query embedding (-1 pads missing results).
+        
+        Args:
+            query_matrix: float32 array of query embeddings (queries x dim)
+            k: Results per query
+            allowed: Optional sorted int64 array of the only ids to return (see filter_ids)
+        """
+        if self.index is None:
+            raise ValueError("Index not built. Call build_index() first.")
+        query_matrix = np.ascontiguousarray(query_matrix, dtype=np.float32)
+        k = min(k, len(self.texts) if allowed is None else len(allowed))
+        if k <= 0:
+            return np.full((len(query_matrix), 0), -1, dtype=np.int64)
+        with span("faiss.search", k=k, filtered=allowed is not None) as s:
+            s.add("queries", len(query_matrix))
+            if allowed is None or len(allowed) == len(self.texts):
+                _, indices = self.index.search(query_matrix, k)
+            else:
+                indices = self._search_filtered(query_matrix, k, allowed)
+        return indices
+    
+    def _search_filtered(self, query_matrix, k, allowed):
+        """
+        Search restricted to allowed ids via a FAISS IDSelector.
+        
+        IVF indexes probe more lists the fewer ids are allowed (the lists
+        visited must hold about k allowed ids, at nprobe=1 a selective filter
+        finds next to nothing), and queries still short of k results are
+        searched again over every list.
+        """
+        selector = faiss.IDSelectorBatch(allowed)
+        ivf = None
+        try:
+            ivf = faiss.extract_index_ivf(self.index)
+            nprobe = min(ivf.nlist, max(ivf.nprobe, math.ceil(FILTER_PROBE_MARGIN * k * ivf.nlist / len(allowed))))
+            params = faiss.SearchParametersIVF(sel=selector, nprobe=nprobe)
+        except RuntimeError:
+            if hasattr(self.index, "hnsw"):
+                params = faiss.SearchParametersHNSW(sel=selector, efSearch=self.index.hnsw.efSearch)
+            else:
+                params = faiss.SearchParameters(sel=selector)
+        
+        try:
+            _, indices = self.index.search(query_matrix, k, params=params)
+            short = (indices < 0).any(axis=1)
+            if ivf is not None and nprobe < ivf.nlist and short.any():
+                params = faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nlist)
+                _, indices[short] = self.index.search(query_matrix[short], k, params=params)
+            return indices
+        except RuntimeError:
+            # Index type without selector support: over-fetch and filter
+            allowed_set = set(allowed.tolist())
+            _, candidates = self.index.search(query_matrix, min(len(self.texts), k * FILTER_OVERFETCH))
+            return [[idx for idx in row if idx in allowed_set][:k] for row in candidates]
+    
+    def save(self, path=None):
+        """
+        Save the FAISS index, texts and metadata to a directory.
+        
+        Layout: index.faiss (FAISS binary), header.json (version, model,
+        fingerprint, sizes) and records.jsonl (one {"text", "metadata"} per line,
+        in index order).
+        """
+        if self.index is None:
+            raise ValueError("Index not built. Call build_index() first.")
+        
+        path = Path(path or DEFAULT_INDEX_DIR)
+        path.mkdir(parents=True, exist_ok=True)
+        
+        # The old header goes first: from here until the new header is in place the
+        # directory reads as incomplete, so a crash never pairs it with new files
+        (path / HEADER_FILE).unlink(missing_ok=True)
+        
+        # Each file is written under a temp name and renamed over the old one. A store
+        # that memory-mapped the old index.faiss keeps reading the old (unlinked) file
+        index_tmp = path / (INDEX_FILE + ".tmp")
+        faiss.write_index(self.index, str(index_tmp))
+        _fsync_file(index_tmp)
+        os.replace(index_tmp, path / INDEX_FILE)
+        
+        records_tmp = path / (RECORDS_FILE + ".tmp")
+        with open(records_tmp, "w", encoding="utf-8") as f:
+            for text, meta in zip(self.texts, self.metadata):
+                f.write(json.dumps({"text": text, "metadata": meta}, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(records_tmp, path / RECORDS_FILE)
+        
+        # Header last: a directory without a header is treated as incomplete
+        if self.fingerprint is None:
+            self.fingerprint = compute_fingerprint(self.texts, self.metadata)
+        header = {
+            "version": INDEX_FORMAT_VERSION,
+            "model": EMBEDDING_MODEL_NAME,
+            "fingerprint": self.fingerprint,
+            "count": len(self.texts),
+            "dim": self.index.d,
+            "indexType": self.index_type,
+            "indexParams": self.index_params,
+        }
+        header_tmp = path / (HEADER_FILE + ".tmp")
+        with open(header_tmp, "w") as f:
+            json.dump(header, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(header_tmp, path / HEADER_FILE)
+    
+    def load(self, path=None, expected_fingerprint=None, mmap=True, texts=None, metadata=None) -> bool:
+        """
+        Load an index saved with save().
+        
+        The FAISS index is memory-mapped by default, so a cold start is a file
+        open rather than an embedding pass.
+        
+        Args:
+            path: Directory written by save() (defaults to data/vector_index)
+            expected_fingerprint: If given, reject an index built from other inputs
+            mmap: Memory-map the FAISS index instead of reading it into RAM
+            texts, metadata: Records the caller already holds, starting with the
+                saved ones (records.jsonl is then not read and they are kept
+                as given). Records past the saved ones are added (see extend).
+            
+        Returns:
+            True if loaded; False if missing, from another format/model, or stale
+        """
+        path = Path(path or DEFAULT_INDEX_DIR)
+        header = _read_header(path)
+        if header is None:
+            return False
+        
+        if header.get("version") != INDEX_FORMAT_VERSION or header.get("model") != EMBEDDING_MODEL_NAME:
+            return False
+        if expected_fingerprint is not None and header.get("fingerprint") != expected_fingerprint:
+            return False
+        if header.get("indexType") != self.index_type or header.get("indexParams") != self.index_params:
+            return False
+        
+        count = header.get("count")
+        if texts is not None:
+            if not isinstance(count, int) or len(texts) < count or len(metadata) != len(texts):
+                return False
+            # Not every memory-mapped index type accepts additions; the extended index is saved again anyway
+            mmap = mmap and len(texts) == count
+        
+        flags = (faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY) if mmap else 0
+        try:
+            try:
+                index = faiss.read_index(str(path / INDEX_FILE), flags)
+            except RuntimeError:
+                if not mmap:
+                    raise
+                # Not every index type supports memory mapping
+                index = faiss.read_index(str(path / INDEX_FILE))
+        except RuntimeError:
+            return False
+        
+        if texts is None:
+            texts = []
+            metadata = []
+            try:
+                with open(path / RECORDS_FILE, encoding="utf-8") as f:
+                    for line in f:
+                        record = json.loads(line)
+                        texts.append(record["text"])
+                        metadata.append(record["metadata"])
+            except (OSError, json.JSONDecodeError, KeyError, TypeError):
+                # Missing or half-written records: rebuild rather than fail
+                return False
+            if len(texts) != count:
+                return False
+        
+        if index.ntotal != count:
+            return False
+        
+        set_search_params(index, self.nprobe, self.ef_search)
+        self.index = index
+        self.embeddings_cache = []
+        self.fingerprint = header.get("fingerprint")
+        self._filter_indexes = {}
+        self.texts = texts
+        self.metadata = metadata
+        if len(texts) > count:
+            self.extend(texts, metadata)
+        return True
+    
+    def load_or_build(self, texts, metadata, path=None):
+        """
+        Load the saved index if it matches texts/metadata, else rebuild and save it.
+        
+        When the records only gained entries since the save (e.g. postings
+        appended to jobs.json), the saved index is loaded, just the new
+        records are embedded and added, and the result is saved. texts and
+        metadata are kept as given (see build_index).
+        
+        Returns:
+            True if the saved index was reused (possibly extended), False if it was rebuilt
+        """
+        header = _read_header(path or DEFAULT_INDEX_DIR)
+        count = header.get("count") if header else None
+        saved_fingerprint, fingerprint = _fingerprints(texts, metadata, count if isinstance(count, int) else None)
+        if saved_fingerprint is not None and self.load(path, saved_fingerprint, texts=texts, metadata=metadata):
+            if len(texts) > count:
+                self.fingerprint = fingerprint
+                self.save(path)
+                print(f"  ✓ Added {len(texts) - count} new records to the saved vector index")
+            return True
+        
+        self.build_index(texts, metadata)
+        self.save(path)
+        return False
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+DEFAULT_GRAPH_STATE_PATH = Path(__file__).parent.parent.parent / "data" / "pipeline_state.db"
+FILE_HASH_BLOCK = 1 << 20  # Bytes read at a time when fingerprinting input files
+
+
+def fingerprint(value) -> str:
+    """Stable hash of a JSON-serialisable value (dict keys are sorted)."""
+    payload = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_fingerprint(path) -> str:
+    """Hash of a file's contents ("missing" if it does not exist)."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(FILE_HASH_BLOCK), b""):
+                digest.update(block)
+    except FileNotFoundError:
+        return "missing"
+    return digest.hexdigest()
+
+
+def write_if_changed(path, text: str) -> bool:
+    """
+    Write text to path atomically, unless the file already holds exactly that text.
+
+    The text goes to a temp file in the same directory which then replaces
+    path, so readers (e.g. the watch script) never see a half-written file.
+
+    Returns:
+        True if the file was written
+    """
+    path = Path(path)
+    data = text.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return True
+
+
+def trending_signature(trending_skills: list, skill_frequency: dict) -> list:
+    """Trending skills in demand order: what the prompt shows of the skill counts."""
+    return sorted(trending_skills, key=lambda skill: (-skill_frequency.get(skill, 0), skill))
+
+
+class ArtifactGraph:
+    """
+    Fingerprints of pipeline artefacts, persisted in SQLite between runs.
+
+    Cheap artefacts (input files, skill counts, the trending set, a course's
+    rendered prompt) are computed every run and recorded by the fingerprint of
+    their value. Expensive ones (a course's gap analysis) are keyed by the
+    fingerprints of the artefacts they depend on: needs_update() is True
+    when any of those changed since the artefact was last built, and
+    mark_built() records the new inputs once it has been built successfully.
+    A failed build is therefore retried on the next run.
+    """
+
+    def __init__(self, state_path: str = None):
+        if state_path is None:
+            state_path = DEFAULT_GRAPH_STATE_PATH
+        Path(state_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(state_path))
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS artifacts (
+                name TEXT PRIMARY KEY,
+                inputs TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )"""
+        )
+        self.conn.commit()
+        self.stored = {
+            name: (inputs, digest)
+            for name, inputs, digest in self.conn.execute("SELECT name, inputs, fingerprint FROM artifacts")
+        }
+        self.current = {}  # name: fingerprint seen this run
+        self.changed = []  # recorded artefacts whose fingerprint differs from the last run
+
+    def record(self, name: str, value=None, digest: str = None) -> str:
+        """
+        Record an artefact computed this run.
+
+        Args:
+            value: The artefact (fingerprinted with fingerprint())
+            digest: Precomputed fingerprint, instead of value
+
+        Returns:
+            The artefact's fingerprint
+        """
+        digest = digest or fingerprint(value)
+        self.current[name] = digest
+        if self.stored.get(name, ("", None))[1] != digest:
+            self.changed.append(name)
+            self._save(name, "", digest)
+        return digest
+
+    def combine(self, name: str, inputs: list) -> str:
+        """Record an artefact fully determined by others (e.g. a prompt by its inputs)."""
+        return self.record(name, digest=self.input_key(inputs))
+
+    def input_key(self, inputs: list) -> str:
+        """Fingerprint of the current fingerprints of the named artefacts."""
+        return fingerprint([[name, self.current[name]] for name in sorted(inputs)])
+
+    def needs_update(self, name: str, inputs: list) -> bool:
+        """True if name was never built or any of its inputs changed since."""
+        return self.stored.get(name, (None, None))[0] != self.input_key(inputs)
+
+    def mark_built(self, name: str, inputs: list, value=None):
+        """Record that name was built from the current fingerprints of inputs."""
+        digest = fingerprint(value)
+        self.current[name] = digest
+        self._save(name, self.input_key(inputs), digest)
+
+    def _save(self, name: str, inputs: str, digest: str):
+        self.stored[name] = (inputs, digest)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO artifacts (name, inputs, fingerprint, updated_at) VALUES (?, ?, ?, ?)",
+            (name, inputs, digest, time.time())
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,209 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import reasoning.gap_analysis as gap_analysis
+from reasoning.gap_analysis import GEMINI_MODEL_NAME, analyze_gap
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_REQUESTS_PER_MINUTE = 10
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_SECONDS = 2.0
+DEFAULT_COURSE_TIMEOUT = 120.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`;
+    acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float = None) -> bool:
+        """
+        Take one token, waiting for a refill if needed.
+
+        Returns:
+            False if no token became available within timeout, else True
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class RateLimitedModel:
+    """
+    Model proxy that takes a limiter token for each generate_content call.
+
+    Passed to analyze_gap instead of the model itself, so prompts answered
+    from the LLM response cache cost no token (a fully cached re-run does not
+    wait on the request budget). The wrapped model defaults to the shared
+    Gemini model, created on the first real call.
+    """
+
+    def __init__(self, model, limiter: TokenBucket, deadline: float = None):
+        self.model = model
+        self.limiter = limiter
+        self.deadline = deadline  # time.monotonic() after which no token is waited for
+        # Same cache key as the unwrapped model
+        self.model_name = getattr(model, "model_name", GEMINI_MODEL_NAME) if model is not None else GEMINI_MODEL_NAME
+
+    def generate_content(self, *args, **kwargs):
+        timeout = None if self.deadline is None else self.deadline - time.monotonic()
+        if (timeout is not None and timeout <= 0) or not self.limiter.acquire(timeout=timeout):
+            raise TimeoutError("No LLM request budget before the course deadline")
+        if self.model is None:
+            self.model = gap_analysis.get_model()
+            config = kwargs.get("generation_config")
+            if isinstance(config, dict):
+                # analyze_gap built the config before the client existed
+                kwargs["generation_config"] = gap_analysis._generation_config(**config)
+        return self.model.generate_content(*args, **kwargs)
+
+
+def _call_with_timeout(fn, timeout: float):
+    """Run fn in a daemon thread and wait at most timeout seconds for it."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = fn()
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        # The call cannot be cancelled; it is abandoned and its result ignored
+        raise TimeoutError(f"LLM call exceeded {timeout:.0f}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def _analyze_course(task: dict, trending_skills: list, skill_frequency: dict, limiter: TokenBucket,
+                    max_retries: int, backoff_seconds: float, timeout: float, model, force_refresh: bool,
+                    use_cache: bool, token_budget: int = None) -> dict:
+    """Run analyze_gap for one course with rate-limited API calls, retries and an overall deadline."""
+    deadline = time.monotonic() + timeout
+    last_error = None
+
+    # Without a key, analyze_gap answers from the cache or reports the missing key itself
+    if model is not None or gap_analysis.LLM_AVAILABLE:
+        model = RateLimitedModel(model, limiter, deadline)
+
+    for attempt in range(max_retries + 1):
+        if deadline - time.monotonic() <= 0:
+            break
+        try:
+            return _call_with_timeout(
+                lambda: analyze_gap(
+                    course_name=task["courseName"],
+                    course_id=task["courseId"],
+                    retrieved_job_chunks=task["jobChunks"],
+                    curriculum_modules=task["modules"],
+                    trending_skills=trending_skills,
+                    skill_frequency=skill_frequency,
+                    force_refresh=force_refresh,
+                    use_cache=use_cache,
+                    model=model,
+                    raise_errors=True,
+                    coverage=task.get("coverage"),
+                    token_budget=token_budget,
+                    prompt=task.get("prompt")
+                ),
+                deadline - time.monotonic()
+            )
+        except TimeoutError as e:
+            last_error = e
+            break
+        except Exception as e:
+            last_error = e
+            if attempt < max_retries:
+                # Exponential backoff, never past the course deadline
+                delay = backoff_seconds * (2 ** attempt)
+                time.sleep(max(0.0, min(delay, deadline - time.monotonic())))
+
+    return {
+        "modulesToDelete": [],
+        "modulesToAdd": [],
+        "error": str(last_error) if last_error else f"Timed out after {timeout:.0f}s"
+    }
+
+
+def run_batch_gap_analysis(course_tasks: list, trending_skills: list, skill_frequency: dict,
+                           on_result=None, max_workers: int = DEFAULT_MAX_WORKERS,
+                           requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                           max_retries: int = DEFAULT_MAX_RETRIES,
+                           backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+                           timeout: float = DEFAULT_COURSE_TIMEOUT,
+                           model=None, force_refresh: bool = False,
+                           use_cache: bool = True, token_budget: int = None) -> dict:
+    """
+    Run gap analysis for many courses concurrently.
+
+    API calls share one token-bucket limiter (requests_per_minute across all
+    workers); responses from the LLM cache do not count against it. Failed
+    calls are retried with exponential backoff, and each course has an
+    overall timeout covering all of its attempts.
+
+    Args:
+        course_tasks: List of dicts with courseId, courseName, modules and jobChunks
+            (and optionally coverage and the prompt built from them, see analyze_gap)
+        trending_skills: List of trending skills (shared by all courses)
+        skill_frequency: Dict of skill: count
+        on_result: Callback(course_id, result) invoked as soon as each course
+            finishes (e.g. to write gap_analysis_<id>.json)
+        max_workers: Courses analysed at the same time
+        requests_per_minute: LLM request budget
+        max_retries: Retries per course after the first attempt
+        backoff_seconds: First retry delay (doubled on each retry)
+        timeout: Seconds allowed per course, across retries
+        model: Optional injected LLM client (see analyze_gap)
+        force_refresh: Ignore cached responses and call the API again
+        use_cache: Read/write the on-disk LLM response cache
+        token_budget: Token budget per prompt (see analyze_gap)
+
+    Returns:
+        Dict of course_id: result
+    """
+    limiter = TokenBucket(rate=requests_per_minute / 60.0, capacity=max(1, min(max_workers, requests_per_minute)))
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _analyze_course, task, trending_skills, skill_frequency, limiter,
+                max_retries, backoff_seconds, timeout, model, force_refresh, use_cache, token_budget
+            ): task["courseId"]
+            for task in course_tasks
+        }
+        for future in as_completed(futures):
+            course_id = futures[future]
+            results[course_id] = future.result()
+            if on_result is not None:
+                on_result(course_id, results[course_id])
+
+    return results
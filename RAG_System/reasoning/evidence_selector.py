@@ -0,0 +1,157 @@
+import json
+
+import numpy as np
+
+CHARS_PER_TOKEN = 4  # Rough English/JSON average for Gemini tokenizers
+DEFAULT_TOKEN_BUDGET = 300  # Tokens of evidence (skills + modules + job chunks + reserved sections) per prompt
+DEFAULT_DIVERSITY = 0.3  # MMR trade-off: 0 = pure relevance, 1 = pure novelty
+# Share of the budget offered to each section in turn; unspent tokens roll over to the next
+SECTION_SHARES = (("skills", 0.2), ("modules", 0.4), ("jobEvidence", 1.0))
+MAX_JOB_SKILLS = 8  # Skills listed per job evidence item
+MAX_MODULE_SKILLS = 5  # Skills listed per module
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text (no tokenizer call)."""
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+def _item_tokens(item) -> int:
+    # +1 for the separator between items in a JSON list
+    return estimate_tokens(json.dumps(item)) + 1
+
+
+def _normalise(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def _scale(scores) -> np.ndarray:
+    scores = np.asarray(scores, dtype=np.float32)
+    if not len(scores):
+        return scores
+    low, high = float(scores.min()), float(scores.max())
+    return np.ones_like(scores) if high - low < 1e-9 else (scores - low) / (high - low)
+
+
+def mmr_select(vectors: np.ndarray, relevance, costs, budget: int, diversity: float = DEFAULT_DIVERSITY) -> list:
+    """
+    Greedy maximal-marginal-relevance selection under a token budget.
+
+    Each step takes the item maximising
+    (1 - diversity) * relevance - diversity * (max similarity to the items
+    already taken), skipping items that no longer fit the budget.
+
+    Args:
+        vectors: Unit-norm item embeddings (items x dim)
+        relevance: Relevance per item, scaled to [0, 1]
+        costs: Token cost per item
+        budget: Tokens available
+
+    Returns:
+        Indices of the selected items, in selection order
+    """
+    relevance = np.asarray(relevance, dtype=np.float32)
+    costs = np.asarray(costs)
+    available = costs <= budget
+    redundancy = np.zeros(len(relevance), dtype=np.float32)
+    selected = []
+    while available.any():
+        scores = np.where(available, (1 - diversity) * relevance - diversity * redundancy, -np.inf)
+        best = int(np.argmax(scores))
+        selected.append(best)
+        budget -= costs[best]
+        redundancy = np.maximum(redundancy, vectors @ vectors[best])
+        available[best] = False
+        available &= costs <= budget
+    return selected
+
+
+def select_evidence(job_chunks: list, curriculum_modules: list, trending_skills: list, skill_frequency: dict,
+                    embed_fn, token_budget: int = DEFAULT_TOKEN_BUDGET, diversity: float = DEFAULT_DIVERSITY,
+                    coverage: dict = None, reserved_tokens: int = 0) -> dict:
+    """
+    Pick the skills, modules and job evidence for a gap-analysis prompt.
+
+    Candidates are embedded once (embed_fn), ranked by relevance and
+    de-duplicated with MMR, section by section, within token_budget:
+    - skills: trending skills (all of them, not the first 10) by job frequency
+    - modules: by demand from coverage when given, else by similarity to the
+      job chunks
+    - job evidence: by similarity to the course modules plus the share of
+      trending skills a chunk mentions
+
+    Args:
+        embed_fn: Callable(list of texts) -> array of embeddings
+        coverage: Optional course summary from rag.coverage.CoverageEngine.summary
+        reserved_tokens: Tokens of other prompt sections (e.g. the coverage
+            gaps) charged against token_budget before any evidence is picked
+
+    Returns:
+        Dict with skills, modules and jobEvidence (prompt-ready lists, most
+        relevant first), candidates (counts offered per section) and
+        estimatedTokens (evidence plus reserved tokens)
+    """
+    skills = list(trending_skills) or sorted(skill_frequency, key=lambda s: -skill_frequency[s])[:50]
+    demand = {m["moduleId"]: m["demandCount"] for m in coverage["modules"]} if coverage else {}
+    module_items = [
+        {
+            "id": m["metadata"].get("moduleId"),
+            "title": m["metadata"].get("moduleTitle"),
+            "skills": m["metadata"].get("moduleSkills", [])[:MAX_MODULE_SKILLS],
+        }
+        for m in curriculum_modules
+    ]
+    job_items = [
+        {
+            "jobTitle": c["metadata"].get("jobTitle"),
+            "skills": c["metadata"].get("extractedSkills", [])[:MAX_JOB_SKILLS],
+        }
+        for c in job_chunks
+    ]
+
+    texts = skills + [m["text"] for m in curriculum_modules] + [c["text"] for c in job_chunks]
+    vectors = _normalise(embed_fn(texts)) if texts else np.zeros((0, 1), dtype=np.float32)
+    skill_vectors = vectors[:len(skills)]
+    module_vectors = vectors[len(skills):len(skills) + len(module_items)]
+    job_vectors = vectors[len(skills) + len(module_items):]
+
+    trending = {s.lower() for s in trending_skills}
+    relevance = {
+        "skills": _scale([skill_frequency.get(s, 0) for s in skills]),
+        "modules": _scale(
+            [demand.get(item["id"], 0) for item in module_items] if demand
+            else (module_vectors @ job_vectors.mean(axis=0) if len(job_vectors) else np.ones(len(module_items)))
+        ),
+        "jobEvidence": _scale(
+            0.5 * _scale(job_vectors @ module_vectors.mean(axis=0) if len(module_vectors) else np.ones(len(job_items)))
+            + 0.5 * np.array([
+                sum(s.lower() in trending for s in item["skills"]) / max(1, len(item["skills"]))
+                for item in job_items
+            ], dtype=np.float32)
+        ),
+    }
+    sections = {
+        "skills": (skills, skill_vectors),
+        "modules": (module_items, module_vectors),
+        "jobEvidence": (job_items, job_vectors),
+    }
+
+    selection = {"candidates": {}, "estimatedTokens": reserved_tokens}
+    token_budget = max(0, token_budget - reserved_tokens)
+    remaining = token_budget
+    carried = 0
+    for name, share in SECTION_SHARES:
+        items, item_vectors = sections[name]
+        section_budget = int(token_budget * share) + carried if share < 1 else remaining
+        section_budget = min(section_budget, remaining)
+        costs = [_item_tokens(item) for item in items]
+        chosen = mmr_select(item_vectors, relevance[name], costs, section_budget, diversity) if items else []
+        spent = sum(costs[i] for i in chosen)
+        selection[name] = [items[i] for i in chosen]
+        selection["candidates"][name] = len(items)
+        selection["estimatedTokens"] += spent
+        remaining -= spent
+        carried = section_budget - spent
+    return selection
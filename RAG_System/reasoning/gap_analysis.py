@@ -1,21 +1,82 @@
+import asyncio
 import json
 import os
-import google.generativeai as genai
+import re
+import threading
 
-# Initialize Gemini client using API key from environment
-api_key = os.getenv("GOOGLE_API_KEY")
-if not api_key:
-    print("⚠️  GEMINI_API_KEY environment variable not set")
-    print("    Set it with: $env:GEMINI_API_KEY='your-api-key'")
-    LLM_AVAILABLE = False
-else:
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel("models/gemini-2.5-flash")
-    LLM_AVAILABLE = True
+from observability.tracing import span
+from reasoning.evidence_selector import estimate_tokens, select_evidence
+from reasoning.llm_cache import LLMResponseCache, response_cache_key
+from reasoning.stream_parser import RESULT_KEYS, GapResponseStreamParser
+
+GEMINI_MODEL_NAME = "models/gemini-2.5-flash"
+GENERATION_CONFIG = {
+    "temperature": 0.0,
+    "max_output_tokens": 4096,  # Increased to ensure complete response
+    "top_p": 1.0,
+}
+LOG_RAW_RESPONSE = False  # Print the full raw Gemini response (debugging only)
+# Simplified RAG prompt with explicit JSON schema; {context} holds the course's sections
+PROMPT_TEMPLATE = """You are a curriculum gap analyzer. Return ONLY valid JSON.
+
+{context}
+
+Return JSON in this exact format:
+{{
+  "modulesToDelete": [],
+  "modulesToAdd": [
+    {{"title": "Module Name", "skills": ["skill1"], "reason": "Reason"}}
+  ]
+}}"""
+
+# The API key is read from the environment at import; the client is created lazily
+LLM_AVAILABLE = bool(os.getenv("GOOGLE_API_KEY"))
+
+_genai = None
+_model = None
+_response_cache = None
+_client_lock = threading.Lock()
+
+def get_model():
+    """
+    Return the shared Gemini GenerativeModel, configuring the client on first use.
+    
+    google.generativeai is slow to import, so trends-only and ingestion-only
+    runs never pay for it. Thread-safe. Returns None when no API key is set.
+    """
+    global _genai, _model
+    if not LLM_AVAILABLE:
+        return None
+    if _model is None:
+        with _client_lock:
+            if _model is None:
+                import google.generativeai as genai
+                genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+                _genai = genai
+                _model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    return _model
+
+def get_response_cache():
+    """Return the shared on-disk LLM response cache (data/llm_cache.db), opened on first use."""
+    global _response_cache
+    if _response_cache is None:
+        with _client_lock:
+            if _response_cache is None:
+                _response_cache = LLMResponseCache()
+    return _response_cache
+
+def _generation_config(**kwargs):
+    if _genai is None:
+        # Injected (e.g. stub) models accept a plain dict
+        return kwargs
+    return _genai.types.GenerationConfig(**kwargs)
 
 
 def analyze_gap(course_name: str, course_id: int, retrieved_job_chunks: list, curriculum_modules: list, 
-                trending_skills: list, skill_frequency: dict) -> dict:
+                trending_skills: list, skill_frequency: dict, force_refresh: bool = False,
+                use_cache: bool = True, model=None, raise_errors: bool = False,
+                stream: bool = False, on_module=None, coverage: dict = None,
+                token_budget: int = None, embed_fn=None, prompt: str = None) -> dict:
     """
     Analyze curriculum gaps using Gemini API.
     Analyzes jobs matched to the specific course.
@@ -27,121 +88,114 @@ def analyze_gap(course_name: str, course_id: int, retrieved_job_chunks: list, cu
         curriculum_modules: List of curriculum modules for this course
         trending_skills: List of trending skills
         skill_frequency: Dict of skill: count
+        force_refresh: Ignore a cached response and call the API again
+        use_cache: Read/write the on-disk response cache (data/llm_cache.db)
+        model: Object with a Gemini-style generate_content(prompt, generation_config=...)
+            (defaults to the shared Gemini model; pass a stub for offline runs)
+        raise_errors: Raise API and parse errors instead of returning an error
+            result (lets callers such as batch_analysis retry)
+        stream: Stream the response and parse it incrementally; a truncated
+            response keeps the entries completed before the cut
+        on_module: Callback(key, entry) called for each modulesToAdd /
+            modulesToDelete entry as soon as it is complete
+        coverage: Course summary from rag.coverage.CoverageEngine.summary; when
+            given, the prompt lists every module ranked by covered demand plus
+            the under-served skills and uncovered job clusters
+        token_budget: Prompt token budget; when given, skills, modules and
+            job evidence are chosen by relevance with MMR de-duplication
+            (reasoning.evidence_selector) instead of fixed slices, in what is
+            left after the template and the coverage gaps section
+        embed_fn: Callable(texts) -> embeddings used by the selector
+            (defaults to the shared embedding model)
+        prompt: Prompt already built with build_prompt from these inputs
+            (e.g. by main.py to fingerprint it); built here when omitted
         
     Returns:
         Dict with modulesToDelete and modulesToAdd
     """
     
-    if not LLM_AVAILABLE:
+    if prompt is None:
+        prompt = build_prompt(retrieved_job_chunks, curriculum_modules, trending_skills, skill_frequency,
+                              coverage=coverage, token_budget=token_budget, embed_fn=embed_fn)
+    prompt_tokens = estimate_tokens(prompt)
+    print(f"    ✓ Prompt: ~{prompt_tokens} tokens (estimated)")
+
+    generation_config = dict(GENERATION_CONFIG)
+    model_name = getattr(model, "model_name", GEMINI_MODEL_NAME) if model is not None else GEMINI_MODEL_NAME
+    cache_key = response_cache_key(model_name, generation_config, prompt)
+    cache = get_response_cache() if use_cache else None
+    
+    # Unchanged inputs are answered from the on-disk cache without an API call
+    if cache is not None and not force_refresh:
+        with span("llm.cache") as s:
+            cached = cache.get(cache_key)
+            s.add("hits" if cached is not None else "misses")
+        if cached is not None:
+            print(f"    ✓ Using cached gap analysis (prompt unchanged)")
+            _emit_entries(cached, on_module)
+            return cached
+
+    # Checked after the cache lookup: a cached prompt is answered even without a key
+    if model is None and not LLM_AVAILABLE:
+        print("⚠️  GEMINI_API_KEY environment variable not set")
+        print("    Set it with: $env:GEMINI_API_KEY='your-api-key'")
         print("  ❌ Gemini API not available. Skipping gap analysis.")
         return {
             "modulesToDelete": [],
             "modulesToAdd": [],
             "error": "Gemini API key not configured"
         }
-    
-    # Build Section A: Retrieved Job Market Evidence from vector_store
-    job_evidence = []
-    for chunk in retrieved_job_chunks[:3]:  # Limit to top 3 chunks
-        evidence = {
-            "jobTitle": chunk["metadata"].get("jobTitle"),
-            "extractedSkills": chunk["metadata"].get("extractedSkills", [])
-        }
-        job_evidence.append(evidence)
-    
-    # Build Section B: Current Curriculum Modules (simplified)
-    curriculum_context = []
-    for module in curriculum_modules[:8]:  # Limit to first 8 modules
-        module_info = {
-            "id": module["metadata"].get("moduleId"),
-            "title": module["metadata"].get("moduleTitle"),
-            "skills": module["metadata"].get("moduleSkills", [])[:5]  # Top 5 skills per module
-        }
-        curriculum_context.append(module_info)
-    
-    # Construct simplified RAG prompt with explicit JSON schema
-    prompt = f"""You are a curriculum gap analyzer. Return ONLY valid JSON.
-
-**Job Market Skills:**
-{json.dumps(trending_skills[:10])}
-
-**Current Modules:**
-{json.dumps([{"id": m["metadata"].get("moduleId"), "title": m["metadata"].get("moduleTitle")} for m in curriculum_modules[:5]])}
-
-Return JSON in this exact format:
-{{
-  "modulesToDelete": [],
-  "modulesToAdd": [
-    {{"title": "Module Name", "skills": ["skill1"], "reason": "Reason"}}
-  ]
-}}"""
 
     try:
+        # The Gemini client is only created when the cache cannot answer
+        if model is None:
+            model = get_model()
+        
+        if stream:
+            result, complete = _generate_streaming(model, prompt, generation_config, on_module, prompt_tokens)
+            if result is not None and (complete or any(result[key] for key in RESULT_KEYS)):
+                if complete and cache is not None:
+                    cache.put(cache_key, model_name, result)
+                if not complete:
+                    # Partial results are returned but never cached
+                    print(f"    ⚠️  Response was truncated; kept {len(result['modulesToAdd'])} complete modules")
+                    result["truncated"] = True
+                return result
+            
+            print(f"    ❌ Could not extract valid JSON from streamed response")
+            if raise_errors:
+                raise ValueError("Could not parse Gemini API response")
+            return {
+                "modulesToDelete": [],
+                "modulesToAdd": [],
+                "error": "Could not parse Gemini API response"
+            }
+        
         # Call Gemini API with increased token limit
-        response = model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.0,
-                max_output_tokens=4096,  # Increased to ensure complete response
-                top_p=1.0
+        with span("llm.generate", model=model_name, stream=False) as s:
+            s.add("prompt_tokens_estimated", prompt_tokens)
+            response = model.generate_content(
+                prompt,
+                generation_config=_generation_config(**generation_config)
             )
-        )
+            response_text = response.text.strip()
+            s.add("response_chars", len(response_text))
+            _record_token_usage(s, response)
         
-        response_text = response.text.strip()
         print(f"\n    [DEBUG] Response length: {len(response_text)}")
-        print(f"    [DEBUG] Full response:\n{response_text}")
-        
-        import re
+        if LOG_RAW_RESPONSE:
+            print(f"    [DEBUG] Full response:\n{response_text}")
         
-        # Remove markdown code blocks
-        response_text = re.sub(r'```(?:json)?\s*\n?', '', response_text)
-        response_text = re.sub(r'\n?```', '', response_text)
-        response_text = response_text.strip()
-        
-        # Try to parse as JSON directly
-        try:
-            result = json.loads(response_text)
-            if isinstance(result, dict) and "modulesToDelete" in result and "modulesToAdd" in result:
-                print(f"    ✓ Successfully parsed JSON")
-                return result
-        except json.JSONDecodeError as e:
-            print(f"    [DEBUG] Direct parse error: {e}")
-        
-        # Extract JSON from text if wrapped in other content
-        json_match = re.search(r'\{[\s\S]*\}', response_text)
-        if json_match:
-            json_str = json_match.group(0)
-            try:
-                result = json.loads(json_str)
-                if isinstance(result, dict) and "modulesToDelete" in result and "modulesToAdd" in result:
-                    print(f"    ✓ Parsed extracted JSON")
-                    return result
-            except json.JSONDecodeError:
-                pass
-        
-        # Try to fix incomplete JSON by completing it
-        if response_text.startswith('{'):
-            # Count braces to see if JSON is incomplete
-            open_braces = response_text.count('{')
-            close_braces = response_text.count('}')
-            
-            if open_braces > close_braces:
-                # Try to complete the JSON
-                print(f"    [DEBUG] Incomplete JSON detected (open: {open_braces}, close: {close_braces})")
-                
-                # Add missing closing braces
-                missing_braces = open_braces - close_braces
-                completed_json = response_text + (' ]' if not response_text.rstrip().endswith(']') else '') + ('}' * missing_braces)
-                
-                try:
-                    result = json.loads(completed_json)
-                    if isinstance(result, dict) and "modulesToDelete" in result and "modulesToAdd" in result:
-                        print(f"    ✓ Parsed completed JSON")
-                        return result
-                except json.JSONDecodeError:
-                    pass
+        result, response_text = parse_gap_response(response_text)
+        if result is not None:
+            if cache is not None:
+                cache.put(cache_key, model_name, result)
+            _emit_entries(result, on_module)
+            return result
         
         print(f"    ❌ Could not extract valid JSON from response")
+        if raise_errors:
+            raise ValueError("Could not parse Gemini API response")
         
         return {
             "modulesToDelete": [],
@@ -152,8 +206,220 @@ Return JSON in this exact format:
         
     except Exception as e:
         print(f"  ❌ Gemini API error: {e}")
+        if raise_errors:
+            raise
         return {
             "modulesToDelete": [],
             "modulesToAdd": [],
             "error": str(e)
-        }
\ No newline at end of file
+        }
+
+def build_prompt(retrieved_job_chunks: list, curriculum_modules: list, trending_skills: list,
+                 skill_frequency: dict, coverage: dict = None, token_budget: int = None, embed_fn=None) -> str:
+    """
+    The gap analysis prompt for one course, exactly as sent to the model.
+
+    Args:
+        retrieved_job_chunks: List of matched jobs for the course
+        curriculum_modules: List of curriculum modules for the course
+        trending_skills: List of trending skills
+        skill_frequency: Dict of skill: count
+        coverage: Course summary from rag.coverage.CoverageEngine.summary
+        token_budget: Prompt token budget (see analyze_gap)
+        embed_fn: Callable(texts) -> embeddings used by the selector, e.g.
+            VectorStore.embed so unchanged texts are embedding cache hits
+
+    Returns:
+        The prompt text
+    """
+    if token_budget is not None:
+        # Relevance-ranked, de-duplicated evidence that fits the token budget
+        # The template, headers and coverage gaps are always sent, so they are paid for first
+        gaps = f"\n\n{_coverage_gaps_section(coverage)}" if coverage is not None else ""
+        fixed = PROMPT_TEMPLATE.format(context=_evidence_context({"skills": [], "modules": [], "jobEvidence": []}) + gaps)
+        with span("evidence.select") as s:
+            selection = select_evidence(
+                retrieved_job_chunks, curriculum_modules, trending_skills, skill_frequency,
+                embed_fn or _default_embed_fn, token_budget, coverage=coverage,
+                reserved_tokens=estimate_tokens(fixed)
+            )
+            s.add("evidence_tokens", selection["estimatedTokens"])
+        context = _evidence_context(selection) + gaps
+    else:
+        context = f"**Job Market Skills:**\n{json.dumps(trending_skills[:10])}\n\n{_modules_section(curriculum_modules, coverage)}"
+    return PROMPT_TEMPLATE.format(context=context)
+
+def _evidence_context(selection: dict) -> str:
+    """Prompt sections of a select_evidence selection."""
+    return (
+        f"**Job Market Skills:**\n{json.dumps(selection['skills'])}\n\n"
+        f"**Current Modules:**\n{json.dumps(selection['modules'])}\n\n"
+        f"**Job Market Evidence:**\n{json.dumps(selection['jobEvidence'])}"
+    )
+
+def _modules_section(curriculum_modules: list, coverage: dict = None) -> str:
+    """Prompt section describing the current modules (ranked by coverage when available)."""
+    if coverage is None:
+        modules = [{"id": m["metadata"].get("moduleId"), "title": m["metadata"].get("moduleTitle")}
+                   for m in curriculum_modules[:5]]
+        return f"**Current Modules:**\n{json.dumps(modules)}"
+    
+    modules = [{"id": m["moduleId"], "title": m["title"], "jobDemand": m["demandCount"]}
+               for m in coverage["modules"]]
+    return f"**Current Modules (ranked by job demand they cover):**\n{json.dumps(modules)}\n\n{_coverage_gaps_section(coverage)}"
+
+def _coverage_gaps_section(coverage: dict) -> str:
+    skills = [{"skill": s["skill"], "jobChunks": s["jobChunks"], "coveredShare": s["coveredShare"]}
+              for s in coverage["underservedSkills"]]
+    clusters = [c["topSkills"] for c in coverage["uncoveredClusters"]]
+    return (
+        f"**Under-served Skills ({coverage['coveredShare']:.0%} of job chunks covered):**\n{json.dumps(skills)}\n\n"
+        f"**Uncovered Job Clusters (top skills):**\n{json.dumps(clusters)}"
+    )
+
+def _default_embed_fn(texts):
+    # Imported on use: the embedding model is only needed for budgeted prompts
+    from rag.vector_store import embed_texts
+    return embed_texts(texts)
+
+def _generate_streaming(model, prompt: str, generation_config: dict, on_module=None, prompt_tokens: int = None):
+    """Stream a response through GapResponseStreamParser, emitting entries as they complete."""
+    parser = GapResponseStreamParser()
+    with span("llm.generate", model=getattr(model, "model_name", GEMINI_MODEL_NAME), stream=True) as s:
+        s.add("prompt_tokens_estimated", prompt_tokens or estimate_tokens(prompt))
+        response = model.generate_content(
+            prompt,
+            generation_config=_generation_config(**generation_config),
+            stream=True
+        )
+        for chunk in response:
+            s.add("chunks")
+            for key, entry in parser.feed(chunk.text):
+                if on_module is not None:
+                    on_module(key, entry)
+        s.add("response_chars", parser.length)
+        # A finished stream carries the usage of the whole response
+        _record_token_usage(s, response)
+    
+    print(f"\n    [DEBUG] Streamed response length: {parser.length}")
+    return parser.finish()
+
+def _record_token_usage(s, response):
+    """Add Gemini usage_metadata token counts (when the response has them) to span s."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    for counter, field in (("prompt_tokens", "prompt_token_count"),
+                           ("output_tokens", "candidates_token_count"),
+                           ("total_tokens", "total_token_count")):
+        value = getattr(usage, field, None)
+        if value:
+            s.add(counter, value)
+
+def _emit_entries(result: dict, on_module=None):
+    if on_module is None:
+        return
+    for key in RESULT_KEYS:
+        for entry in result.get(key, []):
+            on_module(key, entry)
+
+async def iter_gap_analysis(analyze_fn=None, **kwargs):
+    """
+    Async iterator over a streamed gap analysis.
+    
+    Runs analyze_fn (default analyze_gap) with stream=True in a worker thread.
+    
+    Args:
+        analyze_fn: Function accepting analyze_gap's stream/on_module arguments
+        **kwargs: Arguments for analyze_fn
+        
+    Yields:
+        ("modulesToAdd" | "modulesToDelete", entry) as each entry completes,
+        then ("result", full result dict)
+    """
+    analyze_fn = analyze_fn or analyze_gap
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    
+    def on_module(key, entry):
+        loop.call_soon_threadsafe(queue.put_nowait, (key, entry))
+    
+    def run():
+        try:
+            event = ("result", analyze_fn(stream=True, on_module=on_module, **kwargs))
+        except Exception as e:
+            event = ("error", e)
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+    
+    loop.run_in_executor(None, run)
+    while True:
+        key, value = await queue.get()
+        if key == "error":
+            raise value
+        yield key, value
+        if key == "result":
+            return
+
+def parse_gap_response(response_text: str):
+    """
+    Extract the gap analysis JSON from a raw LLM response.
+    
+    Tries, in order: the text itself, the outermost {...} block, and the text
+    with missing closing brackets added (for truncated output).
+    
+    Returns:
+        result: Parsed dict with modulesToDelete and modulesToAdd, or None
+        response_text: The response with markdown code fences removed
+    """
+    # Remove markdown code blocks
+    response_text = re.sub(r'```(?:json)?\s*\n?', '', response_text)
+    response_text = re.sub(r'\n?```', '', response_text)
+    response_text = response_text.strip()
+    
+    # Try to parse as JSON directly
+    try:
+        result = json.loads(response_text)
+        if _is_gap_result(result):
+            print(f"    ✓ Successfully parsed JSON")
+            return result, response_text
+    except json.JSONDecodeError as e:
+        print(f"    [DEBUG] Direct parse error: {e}")
+    
+    # Extract JSON from text if wrapped in other content
+    json_match = re.search(r'\{[\s\S]*\}', response_text)
+    if json_match:
+        json_str = json_match.group(0)
+        try:
+            result = json.loads(json_str)
+            if _is_gap_result(result):
+                print(f"    ✓ Parsed extracted JSON")
+                return result, response_text
+        except json.JSONDecodeError:
+            pass
+    
+    # Try to fix incomplete JSON by completing it
+    if response_text.startswith('{'):
+        # Count braces to see if JSON is incomplete
+        open_braces = response_text.count('{')
+        close_braces = response_text.count('}')
+        
+        if open_braces > close_braces:
+            # Try to complete the JSON
+            print(f"    [DEBUG] Incomplete JSON detected (open: {open_braces}, close: {close_braces})")
+            
+            # Add missing closing braces
+            missing_braces = open_braces - close_braces
+            completed_json = response_text + (' ]' if not response_text.rstrip().endswith(']') else '') + ('}' * missing_braces)
+            
+            try:
+                result = json.loads(completed_json)
+                if _is_gap_result(result):
+                    print(f"    ✓ Parsed completed JSON")
+                    return result, response_text
+            except json.JSONDecodeError:
+                pass
+    
+    return None, response_text
+
+def _is_gap_result(result) -> bool:
+    return isinstance(result, dict) and "modulesToDelete" in result and "modulesToAdd" in result
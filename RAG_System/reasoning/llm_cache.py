@@ -0,0 +1,115 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_LLM_CACHE_PATH = Path(__file__).parent.parent.parent / "data" / "llm_cache.db"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def response_cache_key(model_name: str, generation_config: dict, prompt: str) -> str:
+    """Cache key from the model name, generation config and a hash of the prompt."""
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    payload = json.dumps(
+        {"model": model_name, "config": generation_config, "prompt": prompt_hash},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    On-disk cache of parsed LLM responses, stored in SQLite.
+
+    Entries expire after ttl_seconds. When the cache holds more than
+    max_entries entries or max_bytes of JSON, the least recently used
+    entries are evicted. Only successfully parsed results should be stored,
+    so a failed or truncated response is never replayed.
+    """
+
+    def __init__(self, cache_path: str = None, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        cache_path = Path(cache_path or DEFAULT_LLM_CACHE_PATH)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        # Shared across analysis threads; sqlite3 connections are not thread-safe by themselves
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(cache_path), check_same_thread=False)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                size INTEGER NOT NULL,
+                value TEXT NOT NULL
+            )"""
+        )
+        self.conn.commit()
+
+    def get(self, key: str):
+        """Return the cached result for key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT created_at, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[0] > self.ttl_seconds:
+                if row is not None:
+                    self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self.conn.commit()
+                self.misses += 1
+                return None
+
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+        return json.loads(row[1])
+
+    def put(self, key: str, model_name: str, result: dict):
+        """Store a parsed result and evict expired / least recently used entries."""
+        value = json.dumps(result)
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, created_at, last_used, size, value) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_name, now, now, len(value), value)
+            )
+            self._evict(now)
+            self.conn.commit()
+
+    def _evict(self, now: float):
+        self.conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        count, total_bytes = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            total_bytes -= size
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,168 @@
+import json
+
+RESULT_KEYS = ("modulesToDelete", "modulesToAdd")
+
+
+def is_valid_entry(key: str, entry) -> bool:
+    """Check one modulesToAdd / modulesToDelete entry before it is emitted."""
+    if key == "modulesToAdd":
+        return (
+            isinstance(entry, dict)
+            and isinstance(entry.get("title"), str) and entry["title"].strip() != ""
+            and isinstance(entry.get("skills", []), list)
+        )
+    # Deletions name a module by id, title or an object describing it
+    return isinstance(entry, (dict, str, int)) and not isinstance(entry, bool)
+
+
+class GapResponseStreamParser:
+    """
+    Incremental parser for a streamed gap analysis JSON response.
+
+    feed() takes text as it arrives and returns the modulesToAdd /
+    modulesToDelete entries that were completed by it, as (key, entry)
+    pairs. Only new text is scanned, so the total cost is linear in the
+    response length. Text before the first "{" (e.g. a markdown fence) is
+    skipped.
+
+    finish() returns the whole result. If the response was cut off, it falls
+    back to the entries completed so far instead of failing.
+    """
+
+    def __init__(self):
+        self.length = 0  # Characters fed so far
+        self.entries = {key: [] for key in RESULT_KEYS}
+        self.invalid = 0
+        self._chunks = []
+        self._buf = ""  # Unparsed tail plus any open string/entry, starting at offset _base
+        self._base = 0
+        self._pos = 0
+        self._started = False
+        self._start = None  # Offsets of the top-level object's "{" and one past its "}"
+        self._end = None
+        self._stack = []  # open containers: "{" or "["
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None  # last complete string (a key when followed by ":")
+        self._key = None  # key of the value being read in the top-level object
+        self._array_key = None  # result key whose array is open
+        self._entry_start = None
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return "".join(self._chunks)
+
+    def feed(self, text: str) -> list:
+        self._chunks.append(text)
+        self.length += len(text)
+        # Only text an open string or entry still refers to is carried over, so each
+        # feed costs the new text plus that tail, not the whole response so far
+        keep = self._pos
+        if self._in_string:
+            keep = min(keep, self._string_start)
+        if self._entry_start is not None:
+            keep = min(keep, self._entry_start)
+        buf = self._buf[keep - self._base:] + text
+        base = self._base = keep
+        self._buf = buf
+
+        events = []
+        for i in range(self._pos - base, len(buf)):
+            char = buf[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = buf[self._string_start - base + 1:i]
+                continue
+
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._start = base + i
+                    self._stack.append("{")
+                continue
+            if not self._stack:
+                continue  # Trailing text after the top-level object
+
+            depth = len(self._stack)
+            in_result_array = self._array_key is not None and depth == 2
+
+            if in_result_array and self._entry_start is None and char not in " \t\r\n,]":
+                self._entry_start = base + i
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = base + i
+            elif char == ":" and depth == 1:
+                self._key = self._last_string
+            elif char in "{[":
+                if depth == 1 and char == "[" and self._key in RESULT_KEYS:
+                    self._array_key = self._key
+                self._stack.append(char)
+            elif char in "}]":
+                self._stack.pop()
+                if not self._stack:
+                    self._end = base + i + 1
+                elif in_result_array and char == "]":
+                    self._emit_entry(buf, base, i, events)
+                    self._array_key = None
+                elif self._array_key is not None and len(self._stack) == 2:
+                    # An object/array entry just closed
+                    self._emit_entry(buf, base, i + 1, events)
+            elif char == "," and in_result_array:
+                self._emit_entry(buf, base, i, events)
+
+        self._pos = base + len(buf)
+        return events
+
+    def _emit_entry(self, buf: str, base: int, end: int, events: list):
+        if self._entry_start is None:
+            return
+        raw = buf[self._entry_start - base:end].strip()
+        self._entry_start = None
+        if not raw:
+            return
+        try:
+            entry = json.loads(raw)
+        except json.JSONDecodeError:
+            self.invalid += 1
+            return
+        if not is_valid_entry(self._array_key, entry):
+            self.invalid += 1
+            return
+        self.entries[self._array_key].append(entry)
+        events.append((self._array_key, entry))
+
+    @property
+    def complete(self) -> bool:
+        """True once the top-level object has been closed."""
+        return self._started and not self._stack
+
+    def finish(self):
+        """
+        Returns:
+            result: Dict with modulesToDelete and modulesToAdd, or None if no
+                JSON object was started
+            complete: False if the response was truncated (result holds only
+                the entries completed before the cut)
+        """
+        if not self._started:
+            return None, False
+        if self.complete:
+            try:
+                # The object ends where its braces balanced; text after it may hold "}" too
+                result = json.loads(self.text[self._start:self._end])
+                if isinstance(result, dict):
+                    # Keep only validated entries, in the same shape as a parsed response
+                    result.update({key: list(self.entries[key]) for key in RESULT_KEYS})
+                    return result, True
+            except json.JSONDecodeError:
+                pass
+        return {key: list(self.entries[key]) for key in RESULT_KEYS}, False
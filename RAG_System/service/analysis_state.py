@@ -0,0 +1,239 @@
+import threading
+import time
+
+from data_ingestion.curriculum_processor import process_curriculum
+from data_ingestion.job_cleaner import _process_descriptions, build_chunk_records, iter_jobs
+from data_ingestion.job_table import ChunkList, clean_description
+from main import (INSTRUCTOR_MATCHING, RETRIEVAL_MODE, SKILL_TRENDING_THRESHOLD, analyze_course,
+                  build_coverage_engine, build_retriever, course_task, ingest_jobs, keyword_evidence,
+                  load_vector_store)
+from skill_engine.instructor_matching import InstructorMatcher
+from skill_engine.skill_matrix import JobSkillMatrix
+from skill_engine.skill_trends import calculate_trends, get_trending_skills, iter_matching_chunks
+from skill_engine.trend_engine import DEFAULT_HALF_LIFE_DAYS, DEFAULT_WINDOWS, SkillTrendEngine
+
+
+class AnalysisState:
+    """
+    Curriculum, job chunks, skill matrix, trend engine and vector store, kept
+    in memory between requests.
+
+    Jobs are ingested and courses analysed with main.py's own functions
+    (dedupe, fuzzy skills, hybrid retrieval, coverage, prompt budget,
+    instructor readiness), so the service writes the same
+    gap_analysis_<id>.json as a pipeline run on the same inputs.
+
+    reload() re-reads jobs.json: when the file only gained postings (the job
+    board appends), just the new ones are processed; otherwise everything is
+    rebuilt, which stays cheap thanks to the ingestion state and embedding
+    cache. add_jobs() ingests postings directly; they live in memory only, so
+    the next rebuild from a changed jobs.json drops them.
+
+    All public methods are serialised by one lock, so requests see either the
+    old or the new state, never a half-updated one.
+    """
+
+    def __init__(self, jobs_file_path: str = None, incremental: bool = True, workers: int = 1,
+                 trend_windows=DEFAULT_WINDOWS, half_life_days: float = DEFAULT_HALF_LIFE_DAYS):
+        self.jobs_file_path = jobs_file_path
+        self.incremental = incremental
+        self.workers = workers
+        self.trend_windows = trend_windows
+        self.half_life_days = half_life_days
+
+        self.curriculum = {}
+        self.curriculum_modules = []
+        self.source_jobs = []  # Every posting ingested, duplicates included (reload() compares jobs.json to it)
+        self.jobs = []  # Postings kept by the near-duplicate filter, in job index order
+        self.job_chunks = []
+        self.skill_matrix = None
+        self.trend_engine = None
+        self.detector = None
+        self.fuzzy = None
+        self.matcher = None
+        self.vector_store = None
+        self.retriever = None
+        self.coverage_engine = None
+        self.loaded_at = None
+        self._lock = threading.RLock()
+
+    # ---------- updates ----------
+
+    def load(self):
+        """(Re)build all state from curriculum.json and jobs.json."""
+        with self._lock:
+            self.curriculum, self.curriculum_modules = process_curriculum(workers=self.workers)
+            self.source_jobs = list(iter_jobs(self.jobs_file_path))
+            ingested = ingest_jobs(self.jobs_file_path, incremental=self.incremental, workers=self.workers)
+            self.jobs = list(ingested.kept_jobs(self.source_jobs))
+            self.job_chunks = ingested.job_chunks
+            self.detector = ingested.detector
+            self.fuzzy = ingested.fuzzy
+            self.skill_matrix = JobSkillMatrix.from_skill_lists(ingested.job_skills_list)
+            if self.trend_engine is not None:
+                self.trend_engine.close()
+            self.trend_engine = SkillTrendEngine.load(windows=self.trend_windows, half_life_days=self.half_life_days)
+            self.trend_engine.add_jobs(zip(self.jobs, ingested.job_skills_list))
+            self.trend_engine.remove_unseen()
+            self.trend_engine.save()
+            self.matcher = InstructorMatcher.from_file() if INSTRUCTOR_MATCHING else None
+            # Rebuilt on the next search or analysis, from cached embeddings
+            self.vector_store = None
+            self.retriever = None
+            self.coverage_engine = None
+            self.loaded_at = time.time()
+            print(f"  ✓ Loaded {len(self.job_chunks)} job chunks from {len(self.jobs)} jobs")
+
+    def reload(self) -> dict:
+        """
+        Bring the state up to date with jobs.json.
+
+        Returns:
+            Dict with mode ("append" or "rebuild") and the number of jobs added
+        """
+        with self._lock:
+            file_jobs = list(iter_jobs(self.jobs_file_path))
+            known = len(self.source_jobs)
+            if self.skill_matrix is not None and file_jobs[:known] == self.source_jobs:
+                added = self.add_jobs(file_jobs[known:])
+                return {"mode": "append", "added": added}
+
+            self.load()
+            return {"mode": "rebuild", "added": len(self.jobs)}
+
+    def add_jobs(self, jobs: list) -> int:
+        """
+        Ingest new postings without reprocessing the existing ones.
+
+        Postings whose id is already loaded, and near-duplicates of loaded
+        postings, are ignored. New postings get the fuzzy skills of phrases
+        already resolved; phrases first seen here wait for the next rebuild.
+
+        Returns:
+            Number of postings added
+        """
+        with self._lock:
+            known_ids = {str(job["id"]) for job in self.source_jobs if job.get("id") is not None}
+            jobs = [job for job in jobs if job.get("id") is None or str(job["id"]) not in known_ids]
+            self.source_jobs.extend(jobs)
+            if self.detector is not None:
+                jobs = list(self.detector.filter(jobs))
+            if not jobs:
+                return 0
+
+            start = len(self.jobs)
+            descriptions = [job.get("description", "") for job in jobs]
+            compact = isinstance(self.job_chunks, ChunkList)
+            skills_list, chunks_list = _process_descriptions(descriptions, compact=compact)
+            first_chunk = len(self.job_chunks)
+            if compact:
+                for job, skills, (description, spans) in zip(jobs, skills_list, chunks_list):
+                    self.job_chunks.table.add_job(job, skills, description, spans)
+                new_chunks = self.job_chunks[first_chunk:]
+            else:
+                new_chunks = []
+                for offset, (job, skills, chunks) in enumerate(zip(jobs, skills_list, chunks_list)):
+                    new_chunks.extend(build_chunk_records(job, skills, chunks, start + offset))
+                self.job_chunks.extend(new_chunks)
+            if self.fuzzy is not None:
+                # Chunk metadata keeps the exact matches, as in ingest_jobs
+                self.fuzzy.add_batch(clean_description(description) for description in descriptions)
+                skills_list = [
+                    sorted(set(skills).union(self.fuzzy.job_skills(start + offset)))
+                    for offset, skills in enumerate(skills_list)
+                ]
+
+            self.skill_matrix.extend(skills_list)
+            self.trend_engine.add_jobs(zip(jobs, skills_list))
+            self.trend_engine.save()
+            if self.vector_store is None:
+                pass
+            elif isinstance(self.job_chunks, ChunkList):
+                # The store indexes the table's views, which already include the new chunks
+                self.vector_store.extend(self.job_chunks.texts, self.job_chunks.metadata)
+            else:
+                self.vector_store.add([c["text"] for c in new_chunks], [c["metadata"] for c in new_chunks])
+            # Their BM25 index and coverage statistics cover the old chunks only
+            self.retriever = None
+            self.coverage_engine = None
+            self.jobs.extend(jobs)
+            self.loaded_at = time.time()
+            print(f"  ✓ Added {len(jobs)} jobs ({len(new_chunks)} chunks)")
+            return len(jobs)
+
+    # ---------- queries ----------
+
+    def course(self, course_id: int):
+        """Return (course, course modules), or (None, []) if the course does not exist."""
+        for course in self.curriculum.get("courses", []):
+            if course["id"] == course_id:
+                modules = [m for m in self.curriculum_modules if m["metadata"].get("courseId") == course_id]
+                return course, modules
+        return None, []
+
+    def trends(self, threshold: float) -> dict:
+        with self._lock:
+            return {
+                "totalJobs": self.skill_matrix.num_jobs,
+                "skillFrequency": self.skill_matrix.skill_frequency(),
+                "trendingSkills": self.skill_matrix.trending_skills(threshold),
+                "windows": self.trend_engine.summary()["windows"],
+            }
+
+    def matches(self, threshold: float, limit: int):
+        """
+        Job chunks with at least one trending skill (the evidence in "keyword" retrieval mode).
+
+        Returns:
+            First `limit` matching chunks and the total number of matches
+        """
+        with self._lock:
+            trending = self.skill_matrix.trending_skills(threshold)
+            matched = []
+            count = 0
+            for chunk in iter_matching_chunks(self.job_chunks, trending, self.skill_matrix):
+                count += 1
+                if len(matched) < limit:
+                    matched.append(dict(chunk))  # Plain dicts for the JSON response
+            return matched, count
+
+    def search(self, query: str, k: int = 10, filters: dict = None) -> list:
+        """Semantic search over job chunks (the vector store is built on first use)."""
+        with self._lock:
+            return self._vector_store().retrieve(query, k, filters)
+
+    def gap_analysis(self, course_id: int, force_refresh: bool = False, **options) -> dict:
+        """
+        Analyse one course on the in-memory state (None if the course is unknown).
+
+        Evidence, coverage and prompt settings are main.py's, through
+        course_task and analyze_course. Extra options (e.g. stream,
+        on_module) are passed to analyze_gap.
+        """
+        with self._lock:
+            course, modules = self.course(course_id)
+            if course is None:
+                return None
+            skill_frequency = calculate_trends(self.skill_matrix)
+            trending = get_trending_skills(self.skill_matrix, threshold=SKILL_TRENDING_THRESHOLD)
+            retriever = self._retriever()
+            evidence = None
+            if retriever is None:
+                evidence, _ = keyword_evidence(self.job_chunks, trending, self.skill_matrix)
+            if self.coverage_engine is None:
+                self.coverage_engine = build_coverage_engine(retriever, self.curriculum_modules)
+            task = course_task(course, modules, trending, skill_frequency, retriever, self.coverage_engine, evidence)
+            matcher = self.matcher
+
+        # The LLM call runs outside the lock so updates are not held up by it
+        return analyze_course(task, trending, skill_frequency, matcher, force_refresh=force_refresh, **options)
+
+    def _vector_store(self):
+        if self.vector_store is None:
+            self.vector_store = load_vector_store(self.job_chunks)
+        return self.vector_store
+
+    def _retriever(self):
+        if self.retriever is None and RETRIEVAL_MODE == "hybrid":
+            self.retriever = build_retriever(self.job_chunks, self._vector_store())
+        return self.retriever
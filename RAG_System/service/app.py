@@ -0,0 +1,184 @@
+"""
+Warm analysis service: keeps the pipeline state in memory between updates.
+
+Run from RAG_System:
+    uvicorn service.app:app --port 8000
+    (or: python -m service.app)
+
+watch-and-update.js posts to /events/jobs-changed whenever jobs.json changes;
+bursts of events are debounced and coalesced into a single update. Per-stage
+timings, cache hits and token usage are exposed for Prometheus at /metrics.
+"""
+from dotenv import load_dotenv
+load_dotenv()
+
+import json
+from contextlib import asynccontextmanager
+
+from fastapi import Body, FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from main import (
+    ANALYZE_ALL_COURSES, INCREMENTAL_INGESTION, INGESTION_WORKERS, MAX_EVIDENCE_CHUNKS,
+    SELECTED_COURSE_ID, SKILL_TRENDING_THRESHOLD, TREND_HALF_LIFE_DAYS, TREND_WINDOWS,
+    is_complete, save_gap_analysis,
+)
+from observability.tracing import enable_tracing, render_prometheus, span
+from reasoning.gap_analysis import iter_gap_analysis
+from service.analysis_state import AnalysisState
+from service.change_coalescer import ChangeCoalescer
+
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8000
+CHANGE_DEBOUNCE_SECONDS = 2.0  # Quiet period before a burst of jobs.json changes is applied
+CHANGE_MAX_DELAY_SECONDS = 30.0  # Apply pending changes at least this often during a steady stream
+REFRESH_GAP_ANALYSIS = True  # Regenerate gap_analysis_<id>.json after each update
+TRACING_ENABLED = True  # Record per-stage metrics for /metrics
+TRACE_MAX_SPANS = 10_000  # Individual spans kept in memory (aggregates are unbounded)
+
+if TRACING_ENABLED:
+    enable_tracing(max_spans=TRACE_MAX_SPANS)
+
+state = AnalysisState(
+    incremental=INCREMENTAL_INGESTION,
+    workers=INGESTION_WORKERS,
+    trend_windows=TREND_WINDOWS,
+    half_life_days=TREND_HALF_LIFE_DAYS
+)
+coalescer = None
+
+
+def apply_changes():
+    """Coalesced handler for jobs.json change events."""
+    with span("service.reload") as s:
+        update = state.reload()
+        s.add("jobs_added", update["added"])
+    print(f"  ✓ Jobs updated ({update['mode']}, {update['added']} jobs)")
+    if not REFRESH_GAP_ANALYSIS:
+        return
+
+    if ANALYZE_ALL_COURSES:
+        course_ids = [course["id"] for course in state.curriculum.get("courses", [])]
+    else:
+        course_ids = [SELECTED_COURSE_ID]
+    failed = []
+    for course_id in course_ids:
+        with span("service.gap_analysis", course_id=course_id):
+            result = state.gap_analysis(course_id)
+        if result is not None:
+            save_gap_analysis(course_id, result)
+            if not is_complete(result):
+                failed.append(course_id)
+    if failed:
+        # Reported to /events/jobs-changed waiters and /health
+        raise RuntimeError(f"Gap analysis failed or was truncated for courses {failed}")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global coalescer
+    state.load()
+    coalescer = ChangeCoalescer(apply_changes, CHANGE_DEBOUNCE_SECONDS, CHANGE_MAX_DELAY_SECONDS)
+    yield
+    coalescer.close()
+
+
+app = FastAPI(title="Curriculum Gap Analysis Service", lifespan=lifespan)
+
+
+# Endpoints are plain functions: FastAPI runs them in its thread pool, so
+# blocking work (ingestion, embeddings, LLM calls) never stalls the event loop.
+
+@app.get("/health")
+def health():
+    return {
+        "jobs": len(state.jobs),
+        "jobChunks": len(state.job_chunks),
+        "curriculumModules": len(state.curriculum_modules),
+        "loadedAt": state.loaded_at,
+        "updates": coalescer.runs if coalescer else 0,
+        "lastUpdateError": str(coalescer.last_error) if coalescer and coalescer.last_error else None,
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Span aggregates in the Prometheus text format (empty when tracing is off)."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/trends")
+def trends(threshold: float = SKILL_TRENDING_THRESHOLD):
+    return state.trends(threshold)
+
+
+@app.get("/matches")
+def matches(limit: int = MAX_EVIDENCE_CHUNKS, threshold: float = SKILL_TRENDING_THRESHOLD):
+    matched, count = state.matches(threshold, limit)
+    return {"matchedCount": count, "chunks": matched}
+
+
+@app.get("/search")
+def search(q: str, k: int = 10, skill: str = None, location: str = None):
+    filters = {}
+    if skill:
+        filters["skill"] = skill
+    if location:
+        filters["location"] = location
+    return {"results": state.search(q, k, filters or None)}
+
+
+@app.post("/jobs")
+def add_jobs(jobs: list[dict] = Body(...)):
+    """Ingest postings directly (in memory only; jobs.json stays the source of truth)."""
+    return {"added": state.add_jobs(jobs), "totalJobs": len(state.jobs)}
+
+
+@app.post("/events/jobs-changed")
+def jobs_changed(wait: bool = False, timeout: float = 300.0):
+    """
+    Record a jobs.json change. With wait=true, respond once an update covering
+    this event (and any coalesced with it) has finished.
+    """
+    generation = coalescer.notify()
+    if not wait:
+        return {"event": generation, "applied": False}
+    try:
+        return {"event": generation, "applied": coalescer.wait(generation, timeout)}
+    except RuntimeError as e:
+        return {"event": generation, "applied": False, "error": str(e)}
+
+
+@app.post("/gap-analysis/{course_id}")
+def gap_analysis(course_id: int, force_refresh: bool = False, save: bool = False):
+    result = state.gap_analysis(course_id, force_refresh)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Course ID {course_id} not found")
+    if save:
+        save_gap_analysis(course_id, result)
+    return result
+
+
+@app.post("/gap-analysis/{course_id}/stream")
+async def gap_analysis_stream(course_id: int, force_refresh: bool = False):
+    """
+    Stream the analysis as NDJSON: one {"type": "modulesToAdd" | "modulesToDelete",
+    "data": entry} line per recommendation as soon as it is complete, then
+    {"type": "result", "data": full result}.
+    """
+    course, _ = state.course(course_id)
+    if course is None:
+        raise HTTPException(status_code=404, detail=f"Course ID {course_id} not found")
+
+    async def events():
+        async for key, value in iter_gap_analysis(
+            state.gap_analysis, course_id=course_id, force_refresh=force_refresh
+        ):
+            yield json.dumps({"type": key, "data": value}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host=SERVICE_HOST, port=SERVICE_PORT)
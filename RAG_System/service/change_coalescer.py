@@ -0,0 +1,108 @@
+import threading
+import time
+
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+DEFAULT_MAX_DELAY_SECONDS = 30.0
+
+
+class ChangeCoalescer:
+    """
+    Debounce and coalesce change events into runs of a callback.
+
+    A burst of notify() calls becomes one run, started once no event has
+    arrived for `debounce` seconds (or `max_delay` after the first pending
+    event, so a steady stream cannot postpone it forever). Events arriving
+    while a run is in progress are never dropped: they trigger one more run
+    after it finishes. Runs happen on a single background thread.
+    """
+
+    def __init__(self, callback, debounce: float = DEFAULT_DEBOUNCE_SECONDS,
+                 max_delay: float = DEFAULT_MAX_DELAY_SECONDS):
+        self.callback = callback
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.runs = 0
+        self.last_error = None
+        self._requested = 0  # generation of the latest event
+        self._completed = 0  # latest generation covered by a finished run
+        self._first_pending = None
+        self._last_event = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def notify(self) -> int:
+        """
+        Record a change event.
+
+        Returns:
+            Generation number of the event (pass to wait())
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._requested += 1
+            self._last_event = now
+            if self._first_pending is None:
+                self._first_pending = now
+            self._cond.notify_all()
+            return self._requested
+
+    def wait(self, generation: int, timeout: float = None) -> bool:
+        """
+        Block until a run that started after event `generation` has finished.
+
+        Returns:
+            True once that run succeeded, False on timeout or close
+
+        Raises:
+            RuntimeError: if the latest finished run (which covers the event) failed
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._completed >= generation or self._closed, timeout)
+            if self._completed < generation:
+                return False
+            if self.last_error is not None:
+                raise RuntimeError(f"Update failed: {self.last_error}") from self.last_error
+            return True
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._requested > self._completed or self._closed)
+                if self._closed:
+                    return
+
+                # Wait for a quiet period, bounded by max_delay
+                while not self._closed:
+                    now = time.monotonic()
+                    quiet_at = self._last_event + self.debounce
+                    deadline = min(quiet_at, self._first_pending + self.max_delay)
+                    if now >= deadline:
+                        break
+                    self._cond.wait(deadline - now)
+                if self._closed:
+                    return
+
+                generation = self._requested
+                self._first_pending = None
+
+            error = None
+            try:
+                self.callback()
+            except Exception as e:
+                error = e
+                print(f"  ❌ Update failed: {e}")
+
+            with self._cond:
+                # Set with _completed, so a waiter woken by this run sees this run's outcome
+                self.last_error = error
+                self.runs += 1
+                self._completed = generation
+                self._cond.notify_all()
@@ -0,0 +1,136 @@
+import heapq
+import json
+from pathlib import Path
+
+import numpy as np
+
+from skill_engine.skill_extractor import extract_skills
+from skill_engine.skill_matrix import SkillVocabulary
+
+DEFAULT_INSTRUCTORS_PATH = Path(__file__).parent.parent.parent / "data" / "instructors.json"
+DEFAULT_TOP_K = 3  # Internal candidates listed per proposed module
+DEFAULT_MIN_COVERAGE = 0.5  # Share of a module's skills the best instructor needs to avoid hiring
+
+
+def load_instructors(instructors_path: str = None) -> list:
+    """Read the instructor list from instructors.json (defaults to data/instructors.json)."""
+    if instructors_path is None:
+        instructors_path = DEFAULT_INSTRUCTORS_PATH
+    with open(instructors_path) as f:
+        return json.load(f).get("instructors", [])
+
+
+def normalize_skills(skills) -> list:
+    """
+    Map free-text skills/expertise to canonical TECH_SKILLS_DB names.
+
+    "Machine Learning" -> "machine learning", "PyTorch & TensorFlow" ->
+    "pytorch", "tensorflow". Entries with no catalogue skill (e.g. "Clean
+    Code") are kept, lowercased, so they can still match each other.
+    """
+    normalized = []
+    seen = set()
+    for skill in skills:
+        found = extract_skills(skill) or [skill.strip().lower()]
+        for name in found:
+            if name and name not in seen:
+                seen.add(name)
+                normalized.append(name)
+    return normalized
+
+
+class InstructorMatcher:
+    """
+    Scores proposed modules against every instructor's expertise.
+
+    Built once from the instructor list: expertise is normalised through the
+    TECH_SKILLS_DB vocabulary into a dense instructor x skill matrix and an
+    inverted skill -> instructor index. match_modules() scores all modules
+    against all instructors with one matrix product; the inverted index
+    limits the top-k heap to instructors sharing at least one skill.
+    """
+
+    def __init__(self, instructors: list, vocabulary: SkillVocabulary = None):
+        self.instructors = instructors
+        self.vocabulary = vocabulary or SkillVocabulary()
+        self.expertise = [normalize_skills(i.get("expertise", [])) for i in instructors]
+        rows = [[self.vocabulary.add(skill) for skill in skills] for skills in self.expertise]
+
+        self.matrix = np.zeros((len(instructors), len(self.vocabulary)), dtype=np.float32)
+        postings = {}
+        for instructor, skill_ids in enumerate(rows):
+            self.matrix[instructor, skill_ids] = 1.0
+            for skill_id in skill_ids:
+                postings.setdefault(skill_id, []).append(instructor)
+        self.skill_index = {skill_id: np.array(ids, dtype=np.int64) for skill_id, ids in postings.items()}
+        self.ratings = np.array([float(i.get("rating") or 0.0) for i in instructors], dtype=np.float32)
+
+    @classmethod
+    def from_file(cls, instructors_path: str = None):
+        return cls(load_instructors(instructors_path))
+
+    def match_modules(self, modules: list, top_k: int = DEFAULT_TOP_K,
+                      min_coverage: float = DEFAULT_MIN_COVERAGE) -> list:
+        """
+        Rank internal instructors for each proposed module.
+
+        Args:
+            modules: modulesToAdd entries from analyze_gap ({"title", "skills", ...})
+            top_k: Candidates returned per module
+            min_coverage: Share of the module's skills the best candidate must
+                have; below it the module is flagged for external hiring
+
+        Returns:
+            One dict per module with title, requiredSkills, candidates (best
+            first: id, name, coverage, matchedSkills, missingSkills, rating),
+            hireExternally and missingSkills (skills the best candidate lacks)
+        """
+        required = [normalize_skills(module.get("skills", [])) for module in modules]
+        # Known skills only: a skill no instructor has cannot contribute to any score
+        known = len(self.vocabulary)
+        module_matrix = np.zeros((len(modules), known), dtype=np.float32)
+        for row, skills in enumerate(required):
+            ids = [self.vocabulary.get(skill) for skill in skills]
+            module_matrix[row, [i for i in ids if i is not None]] = 1.0
+
+        # modules x instructors: number of required skills each instructor has
+        overlap = module_matrix @ self.matrix.T if len(self.instructors) else np.zeros((len(modules), 0))
+
+        results = []
+        for row, (module, skills) in enumerate(zip(modules, required)):
+            skill_ids = [self.vocabulary.get(skill) for skill in skills]
+            candidate_lists = [self.skill_index[i] for i in skill_ids if i in self.skill_index]
+            candidates = np.unique(np.concatenate(candidate_lists)) if candidate_lists else np.array([], dtype=np.int64)
+
+            scores = overlap[row]
+            best = heapq.nlargest(top_k, candidates.tolist(),
+                                  key=lambda i: (scores[i], self.ratings[i], -i))
+            ranked = [self._candidate(i, skills, scores[i]) for i in best]
+
+            best_coverage = ranked[0]["coverage"] if ranked else 0.0
+            hire = not skills or best_coverage < min_coverage
+            results.append({
+                "title": module.get("title"),
+                "requiredSkills": skills,
+                "candidates": ranked,
+                "hireExternally": hire,
+                "missingSkills": ranked[0]["missingSkills"] if ranked else skills,
+            })
+        return results
+
+    def _candidate(self, instructor: int, skills: list, overlap: float) -> dict:
+        has = set(self.expertise[instructor])
+        info = self.instructors[instructor]
+        return {
+            "id": info.get("id"),
+            "name": info.get("name"),
+            "coverage": round(float(overlap) / len(skills), 4) if skills else 0.0,
+            "matchedSkills": [skill for skill in skills if skill in has],
+            "missingSkills": [skill for skill in skills if skill not in has],
+            "rating": info.get("rating"),
+        }
+
+
+def instructor_readiness(gap_analysis_result: dict, matcher: InstructorMatcher, **options) -> list:
+    """Match the modulesToAdd of an analyze_gap result (options go to match_modules)."""
+    return matcher.match_modules(gap_analysis_result.get("modulesToAdd", []), **options)
@@ -1,5 +1,5 @@
 import re
-from typing import List
+from typing import Iterable, List
 
 # Comprehensive skill/tool/framework database (NO API CALLS)
 TECH_SKILLS_DB = {
@@ -85,11 +85,49 @@ TECH_SKILLS_DB = {
     "model evaluation": ["model evaluation", "evaluation"],
 }
 
+def _build_matcher():
+    """
+    Compile every keyword in TECH_SKILLS_DB into a single alternation regex.
+    
+    The pattern is a zero-width lookahead so one scan of the text reports the
+    longest keyword starting at every word boundary, including overlapping
+    ones. Shorter keywords that are a prefix of a longer match (and end on a
+    word boundary inside it) are folded into the longer keyword's skill set,
+    so the result is identical to searching each keyword separately.
+    
+    Returns:
+        pattern: Compiled regex with one capturing group for the keyword
+        keyword_skills: Dict of keyword: frozenset of canonical skill names
+    """
+    keyword_skills = {}
+    for canonical_name, keywords in TECH_SKILLS_DB.items():
+        for keyword in keywords:
+            keyword_skills.setdefault(keyword, set()).add(canonical_name)
+    
+    word_boundary = re.compile(r'\b')
+    resolved = {}
+    for keyword in keyword_skills:
+        skills = set(keyword_skills[keyword])
+        boundaries = {m.start() for m in word_boundary.finditer(keyword)}
+        for other, other_skills in keyword_skills.items():
+            if len(other) < len(keyword) and keyword.startswith(other) and len(other) in boundaries:
+                skills |= other_skills
+        resolved[keyword] = frozenset(skills)
+    
+    # Longest first so the alternation prefers the longest keyword at a position
+    alternatives = sorted(keyword_skills, key=lambda k: (-len(k), k))
+    pattern = re.compile(r'(?=\b(' + '|'.join(re.escape(k) for k in alternatives) + r')\b)')
+    return pattern, resolved
+
+_SKILL_PATTERN, _KEYWORD_SKILLS = _build_matcher()
+
 def extract_skills(text: str) -> List[str]:
     """
     Extract technical skills, tools, and frameworks from text using keyword matching.
     NO API CALLS - completely local and instant.
     
+    All keywords are matched in a single pass with a regex compiled at import.
+    
     Args:
         text: Job description or text to extract skills from
         
@@ -99,20 +137,22 @@ def extract_skills(text: str) -> List[str]:
     if not text:
         return []
     
-    # Convert text to lowercase for matching
-    text_lower = text.lower()
-    
     # Track extracted skills (avoid duplicates)
     extracted = set()
-    
-    # Search for each skill in the database
-    for canonical_name, keywords in TECH_SKILLS_DB.items():
-        for keyword in keywords:
-            # Use word boundary matching to avoid partial matches
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            if re.search(pattern, text_lower):
-                extracted.add(canonical_name)
-                break  # Found this skill, move to next
+    for match in _SKILL_PATTERN.finditer(text.lower()):
+        extracted |= _KEYWORD_SKILLS[match.group(1)]
     
     # Return sorted list for consistency
-    return sorted(list(extracted))
+    return sorted(extracted)
+
+def extract_skills_batch(texts: Iterable[str]) -> List[List[str]]:
+    """
+    Extract skills from many texts at once.
+    
+    Args:
+        texts: Iterable of job descriptions / module descriptions
+        
+    Returns:
+        List of skill lists, in the same order as texts
+    """
+    return [extract_skills(text) for text in texts]
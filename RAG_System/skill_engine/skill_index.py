@@ -0,0 +1,372 @@
+import hashlib
+import json
+import re
+from array import array
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from skill_engine.skill_extractor import TECH_SKILLS_DB
+
+DEFAULT_SKILL_INDEX_DIR = Path(__file__).parent.parent.parent / "data" / "skill_index"
+DEFAULT_MATCH_THRESHOLD = 0.75  # Cosine similarity at which a phrase is taken as a catalogue skill
+DEFAULT_MIN_JOBS = 5  # Phrases found in fewer jobs are neither embedded nor reported
+DEFAULT_MAX_PHRASES = 50_000  # Most frequent phrases embedded per pass
+DEFAULT_BOILERPLATE_SHARE = 0.25  # Words in more of the jobs than this are boilerplate ("data", "tools")
+MAX_PHRASE_WORDS = 3
+SEARCH_BLOCK_SIZE = 8192  # Phrases scored against the catalogue at a time
+FUZZY_BATCH_SIZE = 256  # Descriptions scanned per add_batch call in fuzzy_skill_pass
+
+VECTORS_FILE = "vectors.npy"
+HEADER_FILE = "header.json"
+
+# English function words plus job-ad boilerplate; they end a candidate phrase
+STOPWORDS = frozenset("""
+a about above across after all also an and any are as at be been being both but by can could do does
+each etc for from has have having how i if in into is it its may more most must no not of on or our
+other out over per plus should so some such than that the their them then there these they this those
+through to under up us using via was we well were what when where which while who will with within
+would you your
+ability abilities able apply background benefits candidate candidates closely company competitive
+day degree develop developing environment excellent experience experienced familiarity familiar good
+great hands-on help ideal including join knowledge looking new opportunity plus preferred proficiency
+proficient proven related required requirements responsibilities role salary skills strong team
+understanding work working year years
+""".split())
+_KEYWORDS = frozenset(keyword for keywords in TECH_SKILLS_DB.values() for keyword in keywords)
+# Words the exact pass already extracts end a phrase too: "design node.js" adds nothing to "node.js"
+_BREAK_WORDS = STOPWORDS | {keyword for keyword in _KEYWORDS if " " not in keyword}
+_MULTIWORD_KEYWORDS = re.compile(
+    r"\b(?:" + "|".join(re.escape(k) for k in sorted(_KEYWORDS, key=len, reverse=True) if " " in k) + r")\b"
+)
+# Word sets of the parts of multi-word keywords: "apache" left of "apache kafka" is no new skill
+_KEYWORD_FRAGMENTS = frozenset(
+    frozenset(words[start:end])
+    for words in (keyword.split() for keyword in _KEYWORDS if " " in keyword)
+    for start in range(len(words))
+    for end in range(start + 1, len(words))
+)
+# Anything but letters, digits, spaces and the + # . / - found inside skill names ends a phrase,
+# as does a . or / that is not inside a word (end of sentence, "and/or" is split at the slash)
+_PHRASE_BREAK = re.compile(r"[^a-z0-9+#./\- ]+|[./-](?= |$)|(?:^| )[./-]")
+
+
+def candidate_phrases(text: str, max_words: int = MAX_PHRASE_WORDS) -> set:
+    """
+    Candidate skill phrases of a description.
+
+    The text is split at punctuation, stop words and single-word
+    TECH_SKILLS_DB keywords; every remaining run of at most max_words words
+    is a candidate ("vector databases", "llmops"). Longer runs are prose
+    rather than terms and are skipped, as are runs containing a multi-word
+    keyword: the exact pass already extracts those.
+    """
+    phrases = set()
+    for fragment in _PHRASE_BREAK.split(text.lower()):
+        run = []
+        for word in fragment.split():
+            if word in _BREAK_WORDS or word.isdigit():
+                if 0 < len(run) <= max_words:
+                    phrases.add(" ".join(run))
+                run = []
+            else:
+                run.append(word)
+        if 0 < len(run) <= max_words:
+            phrases.add(" ".join(run))
+    return {phrase for phrase in phrases if " " not in phrase or not _MULTIWORD_KEYWORDS.search(phrase)}
+
+
+def catalogue_fingerprint(model_name: str) -> str:
+    """Identity of an index: the skill catalogue and the embedding model."""
+    payload = json.dumps({"skills": TECH_SKILLS_DB, "model": model_name}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _normalise(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def _default_embedder():
+    # Imported on use: trends-only runs never load faiss or the embedding model
+    from rag.embedding_cache import EmbeddingCache
+    from rag.vector_store import EMBEDDING_MODEL_NAME, embed_texts
+    cache = EmbeddingCache()
+    return (lambda texts: embed_texts(texts, cache)), EMBEDDING_MODEL_NAME
+
+
+class SkillEmbeddingIndex:
+    """
+    Unit-norm embeddings of every TECH_SKILLS_DB skill name and alias.
+
+    Built once per catalogue and embedding model and saved to
+    data/skill_index (vectors.npy plus a header with the fingerprint and
+    the skill of each row); load_or_build() rebuilds only when the
+    catalogue or the model changed.
+    """
+
+    def __init__(self, labels: list, skills: list, vectors: np.ndarray, fingerprint: str = None):
+        self.labels = labels  # Text embedded for each row (skill name or alias)
+        self.skills = skills  # Canonical skill of each row
+        self.vectors = _normalise(vectors)
+        self.fingerprint = fingerprint
+
+    @staticmethod
+    def catalogue() -> tuple:
+        """(labels, skills): one row per distinct (alias, canonical skill) pair, names included."""
+        labels, skills = [], []
+        for skill, keywords in TECH_SKILLS_DB.items():
+            for label in dict.fromkeys([skill] + keywords):
+                labels.append(label)
+                skills.append(skill)
+        return labels, skills
+
+    @classmethod
+    def build(cls, embed_fn, model_name: str):
+        labels, skills = cls.catalogue()
+        return cls(labels, skills, embed_fn(labels), catalogue_fingerprint(model_name))
+
+    def save(self, path=None):
+        path = Path(path or DEFAULT_SKILL_INDEX_DIR)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / VECTORS_FILE, self.vectors)
+        with open(path / HEADER_FILE, "w") as f:
+            json.dump({"fingerprint": self.fingerprint, "labels": self.labels, "skills": self.skills}, f)
+
+    @classmethod
+    def load(cls, path=None, expected_fingerprint: str = None):
+        """Load a saved index, or None if it is missing or was built from another catalogue/model."""
+        path = Path(path or DEFAULT_SKILL_INDEX_DIR)
+        try:
+            with open(path / HEADER_FILE) as f:
+                header = json.load(f)
+            vectors = np.load(path / VECTORS_FILE)
+        except (OSError, ValueError):
+            return None
+        if expected_fingerprint is not None and header.get("fingerprint") != expected_fingerprint:
+            return None
+        return cls(header["labels"], header["skills"], vectors, header.get("fingerprint"))
+
+    @classmethod
+    def load_or_build(cls, path=None, embed_fn=None, model_name: str = None):
+        """
+        Load the saved index for this catalogue and model, or embed the catalogue and save it.
+
+        Args:
+            embed_fn: Callable(texts) -> embeddings (defaults to the shared
+                embedding model, through the embedding cache)
+            model_name: Name of embed_fn's model (part of the fingerprint;
+                required when embed_fn is given)
+        """
+        if embed_fn is None:
+            embed_fn, model_name = _default_embedder()
+        elif not model_name:
+            # Without it, indexes of different custom models would share one fingerprint
+            raise ValueError("model_name is required with a custom embed_fn")
+        index = cls.load(path, catalogue_fingerprint(model_name))
+        if index is None:
+            index = cls.build(embed_fn, model_name)
+            index.save(path)
+        return index
+
+    def search(self, vectors, block_size: int = SEARCH_BLOCK_SIZE):
+        """
+        Nearest catalogue row of each vector by cosine similarity.
+
+        Returns:
+            rows, similarities: Arrays with one entry per vector
+        """
+        vectors = _normalise(vectors)
+        rows = np.zeros(len(vectors), dtype=np.int64)
+        similarities = np.zeros(len(vectors), dtype=np.float32)
+        for start in range(0, len(vectors), block_size):
+            scores = vectors[start:start + block_size] @ self.vectors.T
+            rows[start:start + block_size] = np.argmax(scores, axis=1)
+            similarities[start:start + block_size] = scores[np.arange(len(scores)), rows[start:start + block_size]]
+        return rows, similarities
+
+
+class FuzzySkillPass:
+    """
+    Second, embedding-based skill extraction over a whole corpus.
+
+    add_batch() collects each job's candidate phrases (stored once, as ids
+    in CSR arrays) and counts the jobs each phrase occurs in. resolve()
+    then embeds only the max_phrases most frequent phrases seen in at least
+    min_jobs jobs, in one batched call, and maps them to the catalogue with
+    one blocked similarity search: a phrase is a skill when its nearest
+    catalogue entry is at least threshold similar, and no word of it can be
+    dropped without losing similarity (the phrase as a whole matches, not
+    the words it shares with the entry). Frequent phrases below the
+    threshold are kept as emerging-skill candidates unless every word of
+    them is boilerplate (in more than boilerplate_share of the jobs).
+    """
+
+    def __init__(self, index: SkillEmbeddingIndex, threshold: float = DEFAULT_MATCH_THRESHOLD,
+                 min_jobs: int = DEFAULT_MIN_JOBS, max_phrases: int = DEFAULT_MAX_PHRASES, embed_fn=None,
+                 boilerplate_share: float = DEFAULT_BOILERPLATE_SHARE):
+        self.index = index
+        self.threshold = threshold
+        self.min_jobs = min_jobs
+        self.max_phrases = max_phrases
+        self.embed_fn = embed_fn
+        self.boilerplate_share = boilerplate_share
+        self.phrase_ids = {}
+        self.phrase_jobs = []  # Jobs containing each phrase
+        self.word_jobs = {}  # Jobs containing each word of a phrase (document frequency)
+        self.job_indptr = array("I", [0])
+        self.job_phrases = array("I")
+        self.phrase_skill = {}  # phrase id -> canonical skill, after resolve()
+        self.candidates = []  # (phrase id, nearest catalogue row, similarity) of the phrases embedded
+
+    @property
+    def num_jobs(self) -> int:
+        return len(self.job_indptr) - 1
+
+    def add_batch(self, descriptions: Iterable[str]):
+        """Collect the candidate phrases of the next jobs' (cleaned) descriptions."""
+        phrase_ids = self.phrase_ids
+        word_jobs = self.word_jobs
+        for description in descriptions:
+            phrases = candidate_phrases(description)
+            for phrase in phrases:
+                phrase_id = phrase_ids.get(phrase)
+                if phrase_id is None:
+                    phrase_id = phrase_ids[phrase] = len(self.phrase_jobs)
+                    self.phrase_jobs.append(0)
+                self.phrase_jobs[phrase_id] += 1
+                self.job_phrases.append(phrase_id)
+            for word in {word for phrase in phrases for word in phrase.split()}:
+                word_jobs[word] = word_jobs.get(word, 0) + 1
+            self.job_indptr.append(len(self.job_phrases))
+
+    def resolve(self):
+        """Embed the frequent phrases and map them to catalogue skills (one search for all of them)."""
+        counts = np.array(self.phrase_jobs, dtype=np.int64)
+        frequent = np.flatnonzero(counts >= self.min_jobs)
+        if len(frequent) > self.max_phrases:
+            frequent = frequent[np.argsort(-counts[frequent], kind="stable")[:self.max_phrases]]
+        if not len(frequent):
+            return self
+
+        phrases = list(self.phrase_ids)
+        embed_fn = self.embed_fn or _default_embedder()[0]
+        rows, similarities = self.index.search(embed_fn([phrases[i] for i in frequent.tolist()]))
+        self.candidates = list(zip(frequent.tolist(), rows.tolist(), similarities.tolist()))
+        matched = [candidate for candidate in self.candidates if candidate[2] >= self.threshold]
+        self.phrase_skill = {
+            phrase_id: self.index.skills[row]
+            for phrase_id, row, _ in self._whole_phrase_matches(matched, phrases, embed_fn)
+        }
+        return self
+
+    def _whole_phrase_matches(self, matched: list, phrases: list, embed_fn) -> list:
+        """
+        Drop matches that hold without one of the phrase's words.
+
+        "cloud production platform" is as close to "cloud platform" without
+        "production": the entry matched the words they share, not the
+        phrase. Every one-word-shorter variant of the multi-word matches is
+        embedded in one call and compared with the same catalogue row.
+        """
+        variants, owners = [], []
+        for position, (phrase_id, _, _) in enumerate(matched):
+            words = phrases[phrase_id].split()
+            if len(words) > 1:
+                for skip in range(len(words)):
+                    variants.append(" ".join(words[:skip] + words[skip + 1:]))
+                    owners.append(position)
+        if not variants:
+            return matched
+        owners = np.array(owners, dtype=np.int64)
+        rows = np.array([matched[position][1] for position in owners], dtype=np.int64)
+        similarities = np.array([matched[position][2] for position in owners], dtype=np.float32)
+        variant_similarities = np.einsum("ij,ij->i", _normalise(embed_fn(variants)), self.index.vectors[rows])
+        partial = set(owners[variant_similarities >= similarities - 1e-6].tolist())
+        return [candidate for position, candidate in enumerate(matched) if position not in partial]
+
+    def job_skills(self, job_index: int) -> list:
+        """Skills the fuzzy pass found in a job (sorted)."""
+        found = {
+            self.phrase_skill[phrase_id]
+            for phrase_id in self.job_phrases[self.job_indptr[job_index]:self.job_indptr[job_index + 1]]
+            if phrase_id in self.phrase_skill
+        }
+        return sorted(found)
+
+    def merge(self, skills_list) -> list:
+        """Per-job union of exact-match skills and fuzzy skills (sorted, like extract_skills)."""
+        return [
+            sorted(set(skills).union(self.job_skills(job_index))) if self.phrase_skill else list(skills)
+            for job_index, skills in enumerate(skills_list)
+        ]
+
+    def matched_phrases(self) -> dict:
+        """Phrase -> canonical skill for every accepted phrase."""
+        phrases = list(self.phrase_ids)
+        return {phrases[phrase_id]: skill for phrase_id, skill in self.phrase_skill.items()}
+
+    def _is_boilerplate(self, phrase: str, max_jobs: float) -> bool:
+        words = phrase.split()
+        return all(self.word_jobs[word] > max_jobs for word in words) or frozenset(words) in _KEYWORD_FRAGMENTS
+
+    def emerging_skills(self, top: int = 20) -> list:
+        """
+        Frequent phrases no catalogue skill matched, most common first.
+
+        Phrases made only of boilerplate words (each in more than
+        boilerplate_share of the jobs, e.g. "data", "scalable tools") and
+        parts of multi-word catalogue keywords ("apache") are left out.
+
+        Returns:
+            List of {"phrase", "jobs", "nearestSkill", "similarity"}
+        """
+        phrases = list(self.phrase_ids)
+        max_jobs = self.boilerplate_share * self.num_jobs
+        unmatched = [
+            {
+                "phrase": phrases[phrase_id],
+                "jobs": self.phrase_jobs[phrase_id],
+                "nearestSkill": self.index.skills[row],
+                "similarity": round(similarity, 4),
+            }
+            for phrase_id, row, similarity in self.candidates
+            if similarity < self.threshold
+            and not self._is_boilerplate(phrases[phrase_id], max_jobs)
+        ]
+        unmatched.sort(key=lambda c: (-c["jobs"], c["phrase"]))
+        return unmatched[:top]
+
+
+def fuzzy_skill_pass(descriptions: Iterable[str], skills_list, index: SkillEmbeddingIndex = None,
+                     batch_size: int = FUZZY_BATCH_SIZE, embed_fn=None, model_name: str = None, **options):
+    """
+    Run the fuzzy pass over a corpus and add its skills to the exact matches.
+
+    Args:
+        descriptions: Cleaned job descriptions, in the order of skills_list
+        skills_list: Per-job skill lists from extract_skills
+        index: Skill index (loaded or built from data/skill_index if omitted)
+        embed_fn: Callable(texts) -> embeddings (defaults to the shared model)
+        model_name: Name of embed_fn's model (required with embed_fn unless
+            index is given)
+        options: threshold, min_jobs, max_phrases, boilerplate_share (see FuzzySkillPass)
+
+    Returns:
+        merged: Per-job skill lists with the fuzzy matches added
+        fuzzy: The resolved FuzzySkillPass (matched_phrases, emerging_skills)
+    """
+    if index is None:
+        index = SkillEmbeddingIndex.load_or_build(embed_fn=embed_fn, model_name=model_name)
+    fuzzy = FuzzySkillPass(index, embed_fn=embed_fn, **options)
+    batch = []
+    for description in descriptions:
+        batch.append(description)
+        if len(batch) >= batch_size:
+            fuzzy.add_batch(batch)
+            batch = []
+    fuzzy.add_batch(batch)
+    fuzzy.resolve()
+    return fuzzy.merge(skills_list), fuzzy
@@ -0,0 +1,127 @@
+from typing import Iterable, List
+
+import numpy as np
+
+from skill_engine.skill_extractor import TECH_SKILLS_DB
+
+
+class SkillVocabulary:
+    """
+    Maps canonical skill names to dense integer ids.
+
+    Starts from the TECH_SKILLS_DB canonical names (in catalogue order) and
+    assigns new ids to any other skill it is asked to add. Lookups are
+    case-insensitive.
+    """
+
+    def __init__(self, skills: Iterable[str] = None):
+        self.skills = []
+        self._ids = {}
+        for skill in (TECH_SKILLS_DB if skills is None else skills):
+            self.add(skill)
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __contains__(self, skill):
+        return skill.lower() in self._ids
+
+    def add(self, skill: str) -> int:
+        """Return the id of skill, assigning a new one if it is unknown."""
+        key = skill.lower()
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            skill_id = len(self.skills)
+            self._ids[key] = skill_id
+            self.skills.append(skill)
+        return skill_id
+
+    def get(self, skill: str, default=None):
+        return self._ids.get(skill.lower(), default)
+
+    def ids(self, skills: Iterable[str]) -> np.ndarray:
+        """Ids of the known skills in skills (unknown ones are dropped)."""
+        found = [self._ids[s.lower()] for s in skills if s.lower() in self._ids]
+        return np.array(found, dtype=np.int32)
+
+
+class JobSkillMatrix:
+    """
+    Binary job x skill matrix in CSR form (indptr/indices arrays, no values).
+
+    Row i holds the skill ids of job i. Built once at ingestion, it answers
+    skill frequencies, trending thresholds and "which jobs have any of these
+    skills" with vectorised NumPy operations instead of nested Python loops.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, vocabulary: SkillVocabulary):
+        self.indptr = indptr
+        self.indices = indices
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_skill_lists(cls, skill_lists: Iterable[List[str]], vocabulary: SkillVocabulary = None):
+        """
+        Build the matrix from per-job skill lists (a list or a stream).
+
+        Args:
+            skill_lists: Iterable of skill lists, one per job, in job order
+            vocabulary: Vocabulary to map skills with (extended with unseen skills)
+
+        Returns:
+            JobSkillMatrix
+        """
+        vocabulary = vocabulary or SkillVocabulary()
+        indptr = [0]
+        indices = []
+        for skills in skill_lists:
+            row = sorted({vocabulary.add(skill) for skill in skills})
+            indices.extend(row)
+            indptr.append(len(indices))
+        return cls(np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int32), vocabulary)
+
+    def extend(self, skill_lists: Iterable[List[str]]):
+        """Append rows for new jobs in place (job indexes continue from num_jobs)."""
+        indices = []
+        indptr = []
+        offset = int(self.indptr[-1])
+        for skills in skill_lists:
+            row = sorted({self.vocabulary.add(skill) for skill in skills})
+            indices.extend(row)
+            indptr.append(offset + len(indices))
+        self.indptr = np.concatenate((self.indptr, np.array(indptr, dtype=np.int64)))
+        self.indices = np.concatenate((self.indices, np.array(indices, dtype=np.int32)))
+
+    @property
+    def num_jobs(self) -> int:
+        return len(self.indptr) - 1
+
+    def skill_counts(self) -> np.ndarray:
+        """Number of jobs per skill id."""
+        return np.bincount(self.indices, minlength=len(self.vocabulary))
+
+    def skill_frequency(self) -> dict:
+        """Dict of skill: job count for skills that occur (same shape as calculate_trends)."""
+        counts = self.skill_counts()
+        return {self.vocabulary.skills[i]: int(counts[i]) for i in np.flatnonzero(counts)}
+
+    def trending_skills(self, threshold: float = 0.3) -> list:
+        """Skills present in >= threshold of all jobs (same rule as get_trending_skills)."""
+        min_count = max(1, int(self.num_jobs * threshold))
+        counts = self.skill_counts()
+        return sorted(self.vocabulary.skills[i] for i in np.flatnonzero(counts >= min_count))
+
+    def overlap(self, skills: Iterable[str]) -> np.ndarray:
+        """Number of the given skills each job has (int array of length num_jobs)."""
+        wanted = np.zeros(len(self.vocabulary), dtype=bool)
+        wanted[self.vocabulary.ids(skills)] = True
+        hits = np.concatenate(([0], np.cumsum(wanted[self.indices])))
+        return hits[self.indptr[1:]] - hits[self.indptr[:-1]]
+
+    def jobs_matching(self, skills: Iterable[str]) -> np.ndarray:
+        """Boolean mask of jobs that have at least one of the given skills."""
+        return self.overlap(skills) > 0
+
+    def job_skills(self, job_index: int) -> list:
+        row = self.indices[self.indptr[job_index]:self.indptr[job_index + 1]]
+        return [self.vocabulary.skills[i] for i in row]
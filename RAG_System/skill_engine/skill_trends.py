@@ -1,33 +1,72 @@
 from collections import Counter
+from skill_engine.skill_matrix import JobSkillMatrix
 
 def calculate_trends(all_skills):
     """
     Calculate skill frequency from all extracted skills.
     
+    Args:
+        all_skills: List of per-job skill lists, or a JobSkillMatrix
+    
     Returns:
         Dict with skill: count
     """
+    if isinstance(all_skills, JobSkillMatrix):
+        return all_skills.skill_frequency()
+    
     counter = Counter()
     for skills in all_skills:
         for skill in skills:
             counter[skill] += 1
     return dict(counter)
 
-def get_trending_skills(skill_frequency: dict, total_jobs: int, threshold: float = 0.3) -> list:
+def get_trending_skills(skill_frequency, total_jobs: int = None, threshold: float = 0.3) -> list:
     """
     Identify trending skills based on frequency threshold.
     
     A skill is trending if it appears in >= threshold% of all jobs.
     
     Args:
-        skill_frequency: Dict of skill: count
-        total_jobs: Total number of jobs analyzed
+        skill_frequency: Dict of skill: count, or a JobSkillMatrix
+        total_jobs: Total number of jobs analyzed (taken from the matrix if one is given)
         threshold: Minimum percentage (default 0.3 = 30%)
         
     Returns:
         List of trending skill strings
     """
+    if isinstance(skill_frequency, JobSkillMatrix):
+        return skill_frequency.trending_skills(threshold)
+    
     min_count = max(1, int(total_jobs * threshold))
     trending = [skill for skill, count in skill_frequency.items() if count >= min_count]
     return sorted(trending)
 
+def iter_matching_chunks(job_chunks, trending_skills: list, skill_matrix: JobSkillMatrix = None):
+    """
+    Lazily filter job chunks to those with at least one trending skill.
+    
+    Args:
+        job_chunks: Iterable of job chunk records (list or stream)
+        trending_skills: List of trending skill strings
+        skill_matrix: Job x skill matrix for the same jobs. When given, jobs are
+            matched once, vectorised, and each chunk is looked up by its jobIndex.
+        
+    Yields:
+        Matching job chunk records, in input order
+    """
+    if skill_matrix is not None:
+        matched_jobs = skill_matrix.jobs_matching(trending_skills)
+        if hasattr(job_chunks, "iter_for_jobs"):
+            # JobTable chunk views: unmatched jobs' chunks are never built
+            yield from job_chunks.iter_for_jobs(matched_jobs)
+            return
+        for chunk in job_chunks:
+            if matched_jobs[chunk["metadata"]["jobIndex"]]:
+                yield chunk
+        return
+    
+    trending = {skill.lower() for skill in trending_skills}
+    for chunk in job_chunks:
+        job_skills = chunk["metadata"].get("extractedSkills", [])
+        if any(skill.lower() in trending for skill in job_skills):
+            yield chunk
@@ -0,0 +1,423 @@
+import json
+import math
+import sqlite3
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+
+from data_ingestion.ingestion_state import content_hash
+
+DEFAULT_TREND_STATE_PATH = Path(__file__).parent.parent.parent / "data" / "trend_state.db"
+DEFAULT_WINDOWS = (7, 30, 90)
+DEFAULT_HALF_LIFE_DAYS = 30.0
+
+TREND_STATE_VERSION = 3
+JOB_BATCH_SIZE = 500  # Postings looked up / written per SQLite round trip
+SECONDS_PER_DAY = 86400.0
+# Forward-decay weights are exp(rate * (t - landmark)); move the landmark before they overflow
+MAX_DECAY_EXPONENT = 600.0
+
+
+def parse_posted_at(value) -> float:
+    """Parse a job's postedAt ISO timestamp (e.g. 2025-12-13T16:22:23.521Z) to epoch seconds."""
+    if not value:
+        return None
+    try:
+        posted = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if posted.tzinfo is None:
+        posted = posted.replace(tzinfo=timezone.utc)
+    return posted.timestamp()
+
+
+def job_key(job: dict) -> str:
+    """Key a posting by its id, falling back to the hash of its description when it has none."""
+    job_id = job.get("id")
+    return str(job_id) if job_id is not None else "hash:" + content_hash(job.get("description", ""))
+
+
+class SkillTrendEngine:
+    """
+    Incrementally updated, time-windowed skill demand.
+
+    Keeps per-day skill counts for the last 2x the longest window (enough to
+    compare each window with the one before it) and an exponentially decayed
+    score per skill. Adding a job touches only that job's skills, so updates
+    cost O(new jobs) and queries never rescan the corpus.
+
+    Each counted posting (key, posting time, skills) is stored in SQLite,
+    like IngestionState, so the set of known postings is never loaded or
+    rewritten as a whole. Feeding an unchanged posting again is a no-op, an
+    edited one has its old contribution subtracted first, and
+    remove_unseen() subtracts postings that were not fed since load().
+
+    Decayed scores use forward decay: each job adds exp(rate * (t - landmark))
+    and scores are divided by exp(rate * (now - landmark)) when read.
+
+    Postings without a (parseable) postedAt have no place in time: they are
+    counted in the all-time totals and in undated_counts, never in a day
+    bucket or the decayed scores, so they cannot move the windows.
+    """
+
+    def __init__(self, windows=DEFAULT_WINDOWS, half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+                 state_path: str = None):
+        """
+        Args:
+            windows: Rolling window lengths in days
+            half_life_days: Half-life of the decayed scores
+            state_path: SQLite file for the posting records (in memory if omitted; see load())
+        """
+        self.windows = tuple(sorted(windows))
+        self.half_life_days = half_life_days
+        self.decay_rate = math.log(2) / (half_life_days * SECONDS_PER_DAY)
+        self.day_counts = {}   # day number -> Counter(skill -> jobs)
+        self.day_jobs = Counter()  # day number -> jobs posted that day
+        self.decayed = Counter()   # skill -> forward-decayed weight
+        self.total_counts = Counter()  # skill -> all-time jobs
+        self.total_jobs = 0
+        self.undated_counts = Counter()  # skill -> jobs without a posting time
+        self.undated_jobs = 0
+        self.landmark = None
+        self.latest = None
+        self.run = 1  # Postings fed since load() are stamped with it (see remove_unseen)
+
+        self.conn = sqlite3.connect(str(state_path) if state_path else ":memory:", check_same_thread=False)
+        self._create_tables()
+
+    def _create_tables(self):
+        # posted is NULL for undated postings
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                job_key TEXT PRIMARY KEY,
+                posted REAL,
+                skills TEXT NOT NULL,
+                run INTEGER NOT NULL
+            )"""
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.commit()
+
+    # ---------- updates ----------
+
+    def add_job(self, job: dict, skills: list) -> bool:
+        """
+        Record one posting.
+
+        Args:
+            job: Job dict (uses "id", or the description when there is none,
+                and "postedAt"; postings without it are counted as undated)
+            skills: Extracted skills of the job
+
+        Returns:
+            True if the posting was new or changed, False if already recorded as is
+        """
+        return self.add_jobs([(job, skills)]) == 1
+
+    def add_jobs(self, jobs_with_skills) -> int:
+        """
+        Record many postings (looked up and written in batches).
+
+        Args:
+            jobs_with_skills: Iterable of (job dict, skills) pairs
+
+        Returns:
+            Number of postings that were new or changed
+        """
+        changed = 0
+        jobs_with_skills = iter(jobs_with_skills)
+        while True:
+            batch = list(islice(jobs_with_skills, JOB_BATCH_SIZE))
+            if not batch:
+                return changed
+            changed += self._add_batch(batch)
+
+    def remove_unseen(self) -> int:
+        """
+        Subtract and forget the postings not fed since load() (e.g. removed from jobs.json).
+
+        Call after feeding the whole corpus.
+
+        Returns:
+            Number of postings removed
+        """
+        rows = self.conn.execute("SELECT posted, skills FROM jobs WHERE run < ?", (self.run,)).fetchall()
+        if not rows:
+            return 0
+        for posted, skills in rows:
+            self._count(posted, json.loads(skills), -1)
+        self.conn.execute("DELETE FROM jobs WHERE run < ?", (self.run,))
+        self.latest = self.conn.execute("SELECT MAX(posted) FROM jobs").fetchone()[0]
+        return len(rows)
+
+    def _add_batch(self, batch: list) -> int:
+        postings = {}
+        for job, skills in batch:
+            # The first of several postings with one key counts, as with repeated ids before
+            postings.setdefault(job_key(job), (job, sorted(set(skills))))
+
+        stored = {}
+        keys = list(postings)
+        rows = self.conn.execute(
+            f"SELECT job_key, posted, skills FROM jobs WHERE job_key IN ({','.join('?' * len(keys))})", keys
+        )
+        for key, posted, skills in rows:
+            stored[key] = (posted, json.loads(skills))
+
+        seen, written = [], []
+        for key, (job, skills) in postings.items():
+            old = stored.get(key)
+            posted = parse_posted_at(job.get("postedAt"))
+            if old is not None and old == (posted, skills):
+                seen.append((self.run, key))
+                continue
+            if old is not None:
+                self._count(*old, -1)
+            self._count(posted, skills, 1)
+            written.append((key, posted, json.dumps(skills), self.run))
+
+        self.conn.executemany("UPDATE jobs SET run = ? WHERE job_key = ?", seen)
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO jobs (job_key, posted, skills, run) VALUES (?, ?, ?, ?)", written
+        )
+        return len(written)
+
+    def _count(self, posted: float, skills: list, sign: int):
+        """Add (sign 1) or subtract (sign -1) one posting's contribution (posted None: undated)."""
+        if posted is None:
+            for skill in skills:
+                self.undated_counts[skill] += sign
+                if self.undated_counts[skill] <= 0:
+                    del self.undated_counts[skill]
+            self.undated_jobs += sign
+            self._count_total(skills, sign)
+            return
+
+        if sign > 0:
+            if self.landmark is None:
+                self.landmark = posted
+            elif self.decay_rate * (posted - self.landmark) > MAX_DECAY_EXPONENT:
+                self._move_landmark(posted)
+            self.latest = posted if self.latest is None else max(self.latest, posted)
+
+        day = int(posted // SECONDS_PER_DAY)
+        new_day = day not in self.day_counts
+        if sign > 0:
+            self.day_counts.setdefault(day, Counter()).update(skills)
+            self.day_jobs[day] += 1
+        elif not new_day:
+            # Days past the retention horizon were already dropped
+            day_counter = self.day_counts[day]
+            day_counter.subtract(skills)
+            for skill in skills:
+                if day_counter[skill] <= 0:
+                    del day_counter[skill]
+            self.day_jobs[day] -= 1
+            if self.day_jobs[day] <= 0:
+                del self.day_counts[day]
+                del self.day_jobs[day]
+
+        weight = sign * math.exp(self.decay_rate * (posted - self.landmark))
+        for skill in skills:
+            self.decayed[skill] += weight
+            if self.total_counts[skill] - self.undated_counts[skill] + sign <= 0:
+                # No dated posting left: drop the float residue of the subtraction too
+                del self.decayed[skill]
+        self._count_total(skills, sign)
+
+        if sign > 0 and new_day:
+            self._expire_days()
+
+    def _count_total(self, skills: list, sign: int):
+        for skill in skills:
+            self.total_counts[skill] += sign
+            if self.total_counts[skill] <= 0:
+                del self.total_counts[skill]
+        self.total_jobs += sign
+
+    def _move_landmark(self, new_landmark: float):
+        scale = math.exp(-self.decay_rate * (new_landmark - self.landmark))
+        for skill in self.decayed:
+            self.decayed[skill] *= scale
+        self.landmark = new_landmark
+
+    def _expire_days(self):
+        if self.latest is None:
+            return
+        oldest_kept = int(self.latest // SECONDS_PER_DAY) - 2 * self.windows[-1]
+        for day in [d for d in self.day_counts if d < oldest_kept]:
+            del self.day_counts[day]
+            del self.day_jobs[day]
+
+    # ---------- queries ----------
+
+    def _as_of_day(self, as_of: float = None) -> int:
+        reference = as_of if as_of is not None else self.latest
+        return int(reference // SECONDS_PER_DAY) if reference is not None else 0
+
+    def window_counts(self, days: int, as_of: float = None, offset: int = 0):
+        """
+        Skill counts over the `days` days ending at as_of (default: latest posting).
+
+        Args:
+            days: Window length in days
+            as_of: Epoch seconds of the window end
+            offset: Shift the window back by this many windows (1 = previous window)
+
+        Returns:
+            skill_counts: Counter of skill -> jobs in the window
+            total_jobs: Number of jobs in the window
+        """
+        last_day = self._as_of_day(as_of) - offset * days
+        first_day = last_day - days + 1
+        counts = Counter()
+        total = 0
+        for day, day_counter in self.day_counts.items():
+            if first_day <= day <= last_day:
+                counts.update(day_counter)
+                total += self.day_jobs[day]
+        return counts, total
+
+    def decayed_scores(self, as_of: float = None) -> dict:
+        """Exponentially decayed job count per skill at as_of (default: latest posting)."""
+        reference = as_of if as_of is not None else self.latest
+        if reference is None:
+            return {}
+        scale = math.exp(-self.decay_rate * (reference - self.landmark))
+        return {skill: weight * scale for skill, weight in self.decayed.items()}
+
+    def growth_rates(self, days: int, as_of: float = None) -> dict:
+        """
+        Change in each skill's share of postings versus the previous window.
+
+        Returns:
+            Dict of skill -> {"count", "share", "previousCount", "previousShare", "growth"},
+            where growth is the relative change in share (None if the skill is new)
+        """
+        current, current_jobs = self.window_counts(days, as_of)
+        previous, previous_jobs = self.window_counts(days, as_of, offset=1)
+
+        rates = {}
+        for skill in set(current) | set(previous):
+            share = current[skill] / current_jobs if current_jobs else 0.0
+            previous_share = previous[skill] / previous_jobs if previous_jobs else 0.0
+            rates[skill] = {
+                "count": current[skill],
+                "share": share,
+                "previousCount": previous[skill],
+                "previousShare": previous_share,
+                "growth": (share - previous_share) / previous_share if previous_share else None,
+            }
+        return rates
+
+    def rising_skills(self, days: int = 30, top: int = 10, min_count: int = 2, as_of: float = None) -> list:
+        """
+        Skills whose share of postings grew the most in the last `days` days.
+
+        Skills absent from the previous window rank first (by count).
+
+        Returns:
+            List of (skill, stats) pairs, fastest rising first
+        """
+        rates = self.growth_rates(days, as_of)
+        rising = [
+            (skill, stats) for skill, stats in rates.items()
+            if stats["count"] >= min_count and (stats["growth"] is None or stats["growth"] > 0)
+        ]
+        rising.sort(key=lambda item: (
+            item[1]["growth"] is not None,
+            -(item[1]["growth"] or 0),
+            -item[1]["count"],
+            item[0],
+        ))
+        return rising[:top]
+
+    def summary(self, as_of: float = None, top: int = 10) -> dict:
+        """Per-window counts and rising skills, plus top decayed scores (JSON-friendly)."""
+        decayed = self.decayed_scores(as_of)
+        summary = {
+            "totalJobs": self.total_jobs,
+            "undatedJobs": self.undated_jobs,
+            "halfLifeDays": self.half_life_days,
+            "topDecayed": sorted(decayed.items(), key=lambda item: -item[1])[:top],
+            "windows": {},
+        }
+        for days in self.windows:
+            counts, jobs = self.window_counts(days, as_of)
+            summary["windows"][f"{days}d"] = {
+                "jobs": jobs,
+                "topSkills": counts.most_common(top),
+                "rising": [
+                    {"skill": skill, **stats} for skill, stats in self.rising_skills(days, top, as_of=as_of)
+                ],
+            }
+        return summary
+
+    # ---------- persistence ----------
+
+    def to_dict(self) -> dict:
+        return {
+            "version": TREND_STATE_VERSION,
+            "windows": list(self.windows),
+            "halfLifeDays": self.half_life_days,
+            "dayCounts": {str(day): dict(counts) for day, counts in self.day_counts.items()},
+            "dayJobs": {str(day): jobs for day, jobs in self.day_jobs.items()},
+            "decayed": dict(self.decayed),
+            "totalCounts": dict(self.total_counts),
+            "totalJobs": self.total_jobs,
+            "undatedCounts": dict(self.undated_counts),
+            "undatedJobs": self.undated_jobs,
+            "landmark": self.landmark,
+            "latest": self.latest,
+            "run": self.run,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict, state_path: str = None):
+        engine = cls(state["windows"], state["halfLifeDays"], state_path)
+        engine.day_counts = {int(day): Counter(counts) for day, counts in state["dayCounts"].items()}
+        engine.day_jobs = Counter({int(day): jobs for day, jobs in state["dayJobs"].items()})
+        engine.decayed = Counter(state["decayed"])
+        engine.total_counts = Counter(state["totalCounts"])
+        engine.total_jobs = state["totalJobs"]
+        engine.undated_counts = Counter(state["undatedCounts"])
+        engine.undated_jobs = state["undatedJobs"]
+        engine.landmark = state["landmark"]
+        engine.latest = state["latest"]
+        # Postings fed from now on are told apart from those of earlier runs
+        engine.run = state["run"] + 1
+        return engine
+
+    def save(self):
+        """Commit the posting records together with the aggregate counts (one SQLite transaction)."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('state', ?)", (json.dumps(self.to_dict()),)
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    @classmethod
+    def load(cls, path: str = None, windows=DEFAULT_WINDOWS, half_life_days: float = DEFAULT_HALF_LIFE_DAYS):
+        """
+        Load a saved engine, or start a new one if the file is missing or was
+        saved with different windows / half-life (its posting records are then cleared).
+        """
+        path = Path(path or DEFAULT_TREND_STATE_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        engine = cls(windows, half_life_days, path)
+        row = engine.conn.execute("SELECT value FROM meta WHERE key = 'state'").fetchone()
+        state = json.loads(row[0]) if row else {}
+        if (state.get("version") == TREND_STATE_VERSION
+                and tuple(state["windows"]) == tuple(sorted(windows))
+                and state["halfLifeDays"] == half_life_days):
+            engine.close()
+            return cls.from_dict(state, path)
+
+        # Dropped rather than emptied: older versions created the table with posted NOT NULL
+        engine.conn.execute("DROP TABLE IF EXISTS jobs")
+        engine.conn.execute("DELETE FROM meta")
+        engine._create_tables()
+        return engine
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modules import each other as top-level packages (skill_engine, reasoning, ...), as when run from RAG_System
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,40 @@
+import copy
+
+import pytest
+
+from reasoning.artifact_graph import ArtifactGraph
+from reasoning.gap_analysis import build_prompt
+
+MODULES = [{"text": "Python basics", "metadata": {"moduleId": 1, "moduleTitle": "Python basics"}}]
+COVERAGE = {
+    "coveredShare": 0.61,
+    "modules": [{"moduleId": 1, "title": "Python basics", "demandCount": 12}],
+    "underservedSkills": [{"skill": "docker", "jobChunks": 7, "coveredShare": 0.21}],
+    "uncoveredClusters": [{"topSkills": ["kubernetes", "helm"]}],
+}
+
+
+def prompt_changed(tmp_path, coverage: dict) -> bool:
+    """Record the prompt for COVERAGE, then for coverage; True if the course must be re-analysed."""
+    graph = ArtifactGraph(tmp_path / "state.db")
+    for summary in (COVERAGE, coverage):
+        graph.record("evidence:1", build_prompt([], MODULES, ["python"], {"python": 3}, coverage=summary))
+        stale = graph.needs_update("result:1", ["evidence:1"])
+        graph.mark_built("result:1", ["evidence:1"])
+    graph.close()
+    return stale
+
+
+@pytest.mark.parametrize("edit", [
+    lambda c: c["uncoveredClusters"].append({"topSkills": ["terraform"]}),
+    lambda c: c["underservedSkills"][0].update(jobChunks=8),
+    lambda c: c["underservedSkills"][0].update(coveredShare=0.22),
+])
+def test_any_change_to_the_rendered_coverage_reruns_the_course(tmp_path, edit):
+    coverage = copy.deepcopy(COVERAGE)
+    edit(coverage)
+    assert prompt_changed(tmp_path, coverage)
+
+
+def test_unchanged_prompt_is_not_rerun(tmp_path):
+    assert not prompt_changed(tmp_path, copy.deepcopy(COVERAGE))
@@ -0,0 +1,68 @@
+import json
+import time
+
+import pytest
+
+import reasoning.gap_analysis as gap_analysis
+from reasoning.batch_analysis import run_batch_gap_analysis
+from reasoning.llm_cache import LLMResponseCache
+
+RESULT = {"modulesToDelete": [], "modulesToAdd": [{"title": "RAG", "skills": ["rag"], "reason": "Demand"}]}
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    model_name = "stub-gemini"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        self.calls += 1
+        return StubResponse(json.dumps(RESULT))
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = LLMResponseCache(tmp_path / "llm_cache.db")
+    monkeypatch.setattr(gap_analysis, "_response_cache", cache)
+    yield cache
+    cache.close()
+
+
+def course_tasks(n: int) -> list:
+    return [
+        {"courseId": course_id, "courseName": f"Course {course_id}", "jobChunks": [],
+         "modules": [{"text": f"Module {course_id}",
+                      "metadata": {"moduleId": course_id, "moduleTitle": f"Module {course_id}"}}]}
+        for course_id in range(1, n + 1)
+    ]
+
+
+def run(tasks, model, rpm: float, timeout: float = 2.0):
+    return run_batch_gap_analysis(tasks, ["python"], {"python": 1}, requests_per_minute=rpm,
+                                  timeout=timeout, backoff_seconds=0.01, model=model)
+
+
+def test_cached_courses_do_not_wait_for_rate_limit(cache):
+    tasks = course_tasks(4)
+    run(tasks, StubModel(), rpm=6000)
+
+    model = StubModel()
+    start = time.perf_counter()
+    # One request per minute: any course that took a token would wait ~60s and time out
+    results = run(tasks, model, rpm=1)
+    assert time.perf_counter() - start < 1.5
+    assert model.calls == 0
+    assert all(result == RESULT for result in results.values())
+
+
+def test_api_calls_are_rate_limited(cache):
+    model = StubModel()
+    results = run(course_tasks(3), model, rpm=1, timeout=0.5)
+    assert model.calls == 1
+    assert sum("error" in result for result in results.values()) == 2
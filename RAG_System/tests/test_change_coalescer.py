@@ -0,0 +1,46 @@
+import pytest
+
+from service.change_coalescer import ChangeCoalescer
+
+
+class Callback:
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ValueError("jobs.json is not valid JSON")
+
+
+def test_wait_reports_applied_update():
+    callback = Callback()
+    coalescer = ChangeCoalescer(callback, debounce=0.01, max_delay=0.1)
+    try:
+        assert coalescer.wait(coalescer.notify(), timeout=5) is True
+        assert callback.calls == 1
+    finally:
+        coalescer.close()
+
+
+def test_wait_raises_when_update_failed():
+    coalescer = ChangeCoalescer(Callback(failures=1), debounce=0.01, max_delay=0.1)
+    try:
+        with pytest.raises(RuntimeError, match="not valid JSON"):
+            coalescer.wait(coalescer.notify(), timeout=5)
+        assert coalescer.runs == 1
+
+        # The next successful run clears the failure
+        assert coalescer.wait(coalescer.notify(), timeout=5) is True
+        assert coalescer.last_error is None
+    finally:
+        coalescer.close()
+
+
+def test_wait_times_out_before_run():
+    coalescer = ChangeCoalescer(Callback(), debounce=10, max_delay=10)
+    try:
+        assert coalescer.wait(coalescer.notify(), timeout=0.05) is False
+    finally:
+        coalescer.close()
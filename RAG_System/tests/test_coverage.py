@@ -0,0 +1,30 @@
+import pytest
+
+import rag.vector_store as vector_store
+from benchmarks.fake_embeddings import install_fake_embeddings
+from rag.coverage import CoverageEngine
+from rag.vector_store import VectorStore
+
+CHUNKS = [
+    ("python pandas dataframes", ["python", "pandas"]),
+    ("python pandas notebooks", ["python", "pandas"]),
+    ("kubernetes cluster operations", ["kubernetes", "python"]),
+]
+MODULES = [{"text": "python pandas dataframes notebooks", "metadata": {"courseId": 1, "moduleId": 10}}]
+
+
+@pytest.fixture(autouse=True)
+def fake_embeddings(monkeypatch):
+    monkeypatch.setattr(vector_store, "_embeddings", None)
+    return install_fake_embeddings(dim=64)
+
+
+def test_fully_covered_skills_are_not_underserved():
+    store = VectorStore(use_embedding_cache=False)
+    store.build_index([text for text, _ in CHUNKS], [{"extractedSkills": skills} for _, skills in CHUNKS])
+    summary = CoverageEngine(store, MODULES).summary(1)
+
+    assert summary["coveredShare"] == pytest.approx(2 / 3, abs=1e-4)
+    assert [(s["skill"], s["coveredShare"]) for s in summary["underservedSkills"]] == [
+        ("kubernetes", 0.0), ("python", pytest.approx(2 / 3, abs=1e-4)),
+    ]
@@ -0,0 +1,26 @@
+from benchmarks.synthetic import generate_job_descriptions
+from data_ingestion.dedupe import DuplicateDetector
+
+BASE = generate_job_descriptions(40, seed=3, words_per_job=150)
+
+
+def test_reposted_and_lightly_edited_postings_are_dropped():
+    edited = BASE[5].replace(BASE[5].split()[-1], "APPLY NOW!!")
+    jobs = [{"id": i, "description": d} for i, d in enumerate(BASE + [BASE[2], edited])]
+    detector = DuplicateDetector()
+    kept = [job["id"] for job in detector.filter(jobs, batch_size=7)]
+    assert kept == list(range(len(BASE)))
+    assert detector.canonical[-2:] == [2, 5]
+    assert detector.duplicates == 2
+
+
+def test_distinct_postings_are_kept_in_any_batch_size():
+    for batch_size in (1, 16, 256):
+        detector = DuplicateDetector()
+        list(detector.filter(({"description": d} for d in BASE), batch_size))
+        assert all(detector.kept)
+
+
+def test_empty_descriptions_are_not_duplicates_of_each_other():
+    detector = DuplicateDetector()
+    assert detector.add_batch(["", "", "short"]) == [0, 1, 2]
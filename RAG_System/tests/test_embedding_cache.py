@@ -0,0 +1,43 @@
+import numpy as np
+
+from rag.embedding_cache import EmbeddingCache
+
+
+class CountingModel:
+    """Deterministic embeddings; records the texts it was asked to embed."""
+
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, texts):
+        self.texts.extend(texts)
+        return [[len(text), sum(map(ord, text)) % 97, 1.0] for text in texts]
+
+
+def test_hits_are_not_embedded_again(tmp_path):
+    model = CountingModel()
+    cache = EmbeddingCache(tmp_path)
+    first = cache.embed(["a", "bb", "a"], model, "m")
+    again = EmbeddingCache(tmp_path).embed(["bb", "a", "ccc"], model, "m")
+    assert model.texts == ["a", "bb", "ccc"]
+    np.testing.assert_array_equal(again[:2], first[[1, 0]])
+
+
+def test_model_name_is_part_of_the_key(tmp_path):
+    model = CountingModel()
+    cache = EmbeddingCache(tmp_path)
+    cache.embed(["a"], model, "m1")
+    cache.embed(["a"], model, "m2")
+    assert model.texts == ["a", "a"]
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    model = CountingModel()
+    cache = EmbeddingCache(tmp_path, max_entries=3)
+    for text in ["a", "b", "c", "a", "d"]:
+        cache.embed([text], model, "m")
+    assert len(cache) == 3
+    model.texts.clear()
+    vectors = cache.embed(["a", "c", "d", "b"], model, "m")
+    assert model.texts == ["b"]
+    np.testing.assert_array_equal(vectors, np.array(CountingModel()(["a", "c", "d", "b"]), dtype=np.float32))
@@ -0,0 +1,48 @@
+import numpy as np
+
+from reasoning.evidence_selector import estimate_tokens, select_evidence
+from reasoning.gap_analysis import build_prompt
+
+SKILLS = [f"skill{i}" for i in range(40)]
+MODULES = [{"text": f"Module {i}", "metadata": {"moduleId": i, "moduleTitle": f"Module {i}", "moduleSkills": SKILLS[i:i + 3]}}
+           for i in range(6)]
+CHUNKS = [{"text": f"chunk {i}", "metadata": {"jobTitle": f"Engineer {i}", "extractedSkills": SKILLS[i:i + 8]}}
+          for i in range(30)]
+
+
+def embed(texts):
+    rng = np.random.default_rng(len(texts))
+    return rng.normal(size=(len(texts), 16))
+
+
+def select(budget, reserved=0):
+    return select_evidence(CHUNKS, MODULES, SKILLS, {s: 40 - i for i, s in enumerate(SKILLS)}, embed,
+                           budget, reserved_tokens=reserved)
+
+
+def test_selection_fits_the_budget():
+    selection = select(200)
+    assert 0 < selection["estimatedTokens"] <= 200
+    assert selection["skills"] and selection["modules"] and selection["jobEvidence"]
+
+
+def test_reserved_tokens_are_charged_against_the_budget():
+    full = select(200)
+    reserved = select(200, reserved=120)
+    assert reserved["estimatedTokens"] <= 200
+    evidence = sum(len(reserved[name]) for name in ("skills", "modules", "jobEvidence"))
+    assert evidence < sum(len(full[name]) for name in ("skills", "modules", "jobEvidence"))
+    assert select(200, reserved=250)["estimatedTokens"] == 250
+
+
+def test_whole_prompt_fits_the_budget():
+    coverage = {
+        "coveredShare": 0.5,
+        "modules": [{"moduleId": i, "title": f"Module {i}", "demandCount": 6 - i} for i in range(6)],
+        "underservedSkills": [{"skill": s, "jobChunks": 3, "coveredShare": 0.1} for s in SKILLS[:5]],
+        "uncoveredClusters": [{"topSkills": SKILLS[5:8]}],
+    }
+    prompt = build_prompt(CHUNKS, MODULES, SKILLS, {s: 40 - i for i, s in enumerate(SKILLS)}, coverage=coverage,
+                          token_budget=300, embed_fn=embed)
+    assert '"jobTitle"' in prompt
+    assert estimate_tokens(prompt) <= 300
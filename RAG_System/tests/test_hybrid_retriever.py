@@ -0,0 +1,47 @@
+import pytest
+
+import rag.vector_store as vector_store
+from benchmarks.fake_embeddings import install_fake_embeddings
+from rag.hybrid_retriever import BM25Index, HybridRetriever, record_terms
+from rag.vector_store import VectorStore
+
+RECORDS = [
+    ("backend engineer building python services", ["python", "docker"]),
+    ("data engineer writing python pipelines", ["python", "spark"]),
+    ("platform engineer running kubernetes clusters", ["kubernetes", "python"]),
+    ("frontend engineer shipping react apps", ["react"]),
+]
+
+
+@pytest.fixture(autouse=True)
+def fake_embeddings(monkeypatch):
+    monkeypatch.setattr(vector_store, "_embeddings", None)
+    return install_fake_embeddings(dim=64)
+
+
+@pytest.fixture
+def retriever():
+    store = VectorStore(use_embedding_cache=False)
+    store.build_index([text for text, _ in RECORDS], [{"extractedSkills": skills} for _, skills in RECORDS])
+    return HybridRetriever(store)
+
+
+def test_frequent_skill_terms_are_scored_frequent_words_are_not():
+    index = BM25Index.build(record_terms(text, skills) for text, skills in RECORDS)
+    # "python" is a skill of 3 of 4 records: above the df cutoff, still a match
+    ids, _ = index.search(record_terms("", ["python"]), k=10)
+    assert sorted(ids.tolist()) == [0, 1, 2]
+    # "engineer" is in every record: a stop word
+    ids, _ = index.search(record_terms("engineer"), k=10)
+    assert len(ids) == 0
+
+
+def test_dense_results_fill_up_short_bm25_candidates(retriever):
+    results = retriever.retrieve("react apps", k=3)
+    assert len(results) == 3
+    assert results[0]["id"] == 3 and results[0]["sparseScore"] > 0
+    assert [r["sparseScore"] for r in results[1:]] == [0.0, 0.0]
+    assert len({r["id"] for r in results}) == 3
+
+    # No shared term at all: dense search alone
+    assert len(retriever.retrieve("completely unrelated words", k=2)) == 2
@@ -0,0 +1,31 @@
+from skill_engine.instructor_matching import InstructorMatcher, normalize_skills
+
+INSTRUCTORS = [
+    {"id": 1, "name": "Asha", "expertise": ["Machine Learning", "PyTorch & TensorFlow"], "rating": 4.2},
+    {"id": 2, "name": "Ben", "expertise": ["Docker", "Kubernetes", "AWS"], "rating": 4.8},
+    {"id": 3, "name": "Chen", "expertise": ["Docker", "Clean Code"], "rating": 4.9},
+]
+
+
+def match(skills: list, **options) -> dict:
+    return InstructorMatcher(INSTRUCTORS).match_modules([{"title": "New module", "skills": skills}], **options)[0]
+
+
+def test_expertise_is_normalised_to_catalogue_skills():
+    assert normalize_skills(["PyTorch & TensorFlow", "Clean Code", "pytorch"]) == ["pytorch", "tensorflow", "clean code"]
+
+
+def test_candidates_rank_by_coverage_then_rating():
+    result = match(["Docker", "K8s"])
+    assert [c["name"] for c in result["candidates"]] == ["Ben", "Chen"]
+    assert result["candidates"][0]["coverage"] == 1.0 and not result["hireExternally"]
+    assert result["candidates"][1]["missingSkills"] == ["kubernetes"]
+    # Unrelated instructors are not candidates at all
+    assert "Asha" not in [c["name"] for c in match(["docker"], top_k=3)["candidates"]]
+
+
+def test_uncovered_module_is_hired_externally():
+    result = match(["rust", "golang", "docker"])
+    assert result["hireExternally"]
+    assert result["missingSkills"] == ["rust", "go"]
+    assert match([])["hireExternally"]
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+import data_ingestion.job_cleaner as job_cleaner
+import data_ingestion.job_table as job_table
+from benchmarks.synthetic import generate_curriculum
+from data_ingestion.curriculum_processor import process_curriculum
+from data_ingestion.ingestion_state import IngestionState
+from data_ingestion.job_cleaner import clean_jobs, iter_job_chunks, load_job_table
+
+WORDS = "python docker kubernetes aws terraform react sql spark".split()
+JOBS = [
+    {"id": i, "title": f"Engineer {i}", "company": "Acme", "location": "Pune",
+     "description": "  ".join(WORDS[(i + j) % len(WORDS)] for j in range(400 + 97 * i))}
+    for i in range(4)
+] + [{"title": "No id", "description": "Short\n posting with   python"}, {"id": 9, "description": ""}]
+
+
+@pytest.fixture
+def jobs_file(tmp_path):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps(JOBS))
+    return path
+
+
+def as_dicts(job_chunks):
+    return [{"text": chunk["text"], "metadata": dict(chunk["metadata"])} for chunk in job_chunks]
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_compact_chunks_match_chunk_texts(jobs_file, tmp_path, incremental):
+    state = tmp_path / "state.db"
+    chunks, skills = clean_jobs(jobs_file, state, incremental=incremental)
+    compact_chunks, compact_skills = clean_jobs(jobs_file, state, incremental=incremental, compact=True)
+    assert len(chunks) > len(JOBS)
+    assert as_dicts(compact_chunks) == chunks
+    assert list(compact_skills) == skills
+
+
+def test_job_table_reuses_stored_chunk_spans(jobs_file, tmp_path, monkeypatch):
+    state = tmp_path / "state.db"
+    first = as_dicts(load_job_table(jobs_file, state, incremental=True).chunks)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unchanged jobs were cleaned or chunked again")
+
+    process = job_cleaner._process_descriptions
+    monkeypatch.setattr(job_cleaner, "_process_descriptions",
+                        lambda descriptions, **kwargs: fail() if descriptions else process(descriptions, **kwargs))
+    monkeypatch.setattr(job_table, "chunk_spans", fail)
+    monkeypatch.setattr(job_cleaner, "chunk_text", fail)
+    assert as_dicts(load_job_table(jobs_file, state, incremental=True).chunks) == first
+
+
+def test_incremental_run_processes_only_new_or_edited_jobs(jobs_file, tmp_path, monkeypatch):
+    state = tmp_path / "state.db"
+    clean_jobs(jobs_file, state, incremental=True)
+
+    jobs = [dict(job) for job in JOBS]
+    jobs[1]["description"] = "edited posting needing rust"
+    del jobs[2]
+    jobs.append({"id": 42, "description": "new posting needing go lang"})
+    jobs_file.write_text(json.dumps(jobs))
+
+    processed = []
+    process = job_cleaner._process_descriptions
+    monkeypatch.setattr(job_cleaner, "_process_descriptions",
+                        lambda descriptions, **kwargs: processed.extend(descriptions) or process(descriptions, **kwargs))
+    chunks, skills = clean_jobs(jobs_file, state, incremental=True)
+    assert processed == [jobs[1]["description"], jobs[-1]["description"]]
+    assert (chunks, skills) == clean_jobs(jobs_file, tmp_path / "fresh.db", incremental=False)
+
+
+def test_removed_jobs_are_pruned_from_the_state(jobs_file, tmp_path):
+    state = tmp_path / "state.db"
+    clean_jobs(jobs_file, state, incremental=True)
+    jobs_file.write_text(json.dumps(JOBS[:2]))
+    clean_jobs(jobs_file, state, incremental=True)
+    with IngestionState(state) as stored:
+        assert set(stored.get_many(["0", "1", "2", "3", "9"])) == {"0", "1"}
+
+
+def test_streamed_chunks_match_loaded_chunks(jobs_file, tmp_path):
+    jsonl_file = tmp_path / "jobs.jsonl"
+    jsonl_file.write_text("\n".join(json.dumps(job) for job in JOBS))
+    chunks, _ = clean_jobs(jobs_file)
+    assert list(iter_job_chunks(jsonl_file, batch_size=2)) == chunks
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_worker_processes_do_not_change_the_output(jobs_file, tmp_path, incremental):
+    serial = clean_jobs(jobs_file, tmp_path / "serial.db", incremental=incremental)
+    assert clean_jobs(jobs_file, tmp_path / "parallel.db", incremental=incremental, workers=2) == serial
+
+
+def test_parallel_curriculum_processing_keeps_module_order(tmp_path):
+    path = tmp_path / "curriculum.json"
+    path.write_text(json.dumps(generate_curriculum(6, seed=1)))
+    assert process_curriculum(path, workers=2) == process_curriculum(path)
@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from data_ingestion.json_stream import iter_json_records
+
+RECORDS = [{"id": i, "description": "brace } bracket ] " * i + "é"} for i in range(50)]
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 1 << 20])
+def test_array_records_span_read_buffers(tmp_path, read_size):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps(RECORDS, indent=2), encoding="utf-8")
+    assert list(iter_json_records(path, read_size=read_size)) == RECORDS
+
+
+@pytest.mark.parametrize("name", ["jobs.jsonl", "jobs.json"])
+def test_json_lines_by_suffix_or_content(tmp_path, name):
+    path = tmp_path / name
+    path.write_text("\n".join(json.dumps(record) for record in RECORDS) + "\n\n", encoding="utf-8")
+    assert list(iter_json_records(path)) == RECORDS
+
+
+def test_bad_line_reports_its_number(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    path.write_text('{"id": 1}\n{"id": \n', encoding="utf-8")
+    with pytest.raises(ValueError, match="line 2"):
+        list(iter_json_records(path))
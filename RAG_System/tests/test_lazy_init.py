@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.bench_startup import HEAVY_MODULES
+
+RAG_DIR = Path(__file__).parent.parent
+
+# Records (and refuses) every import of a heavy module, whether or not it is installed
+WATCH_IMPORTS = f"""
+import json, sys
+attempted = []
+class Watch:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] in {sorted({m.split(".")[0] for m in HEAVY_MODULES})!r}:
+            attempted.append(name)
+            raise ImportError(name)
+sys.meta_path.insert(0, Watch())
+"""
+
+
+def attempted_heavy_imports(code: str) -> list:
+    """Heavy modules a fresh interpreter tried to import while running code."""
+    script = WATCH_IMPORTS + code + "\nprint(json.dumps(attempted))"
+    out = subprocess.run([sys.executable, "-c", script], cwd=RAG_DIR, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_pipeline_modules_import_without_the_model_or_sdk():
+    assert attempted_heavy_imports(
+        "import rag.vector_store, rag.hybrid_retriever, rag.coverage, reasoning.gap_analysis, "
+        "reasoning.batch_analysis, data_ingestion.job_cleaner, skill_engine.trend_engine"
+    ) == []
+
+
+def test_no_api_key_means_no_client():
+    assert attempted_heavy_imports(
+        "import os\nos.environ.pop('GOOGLE_API_KEY', None)\n"
+        "from reasoning import gap_analysis\nassert gap_analysis.get_model() is None"
+    ) == []
+
+
+def test_first_embedding_loads_the_model():
+    code = "from rag import vector_store\ntry:\n    vector_store.embed_texts(['python'])\nexcept ImportError:\n    pass"
+    assert attempted_heavy_imports(code) == ["langchain_huggingface"]
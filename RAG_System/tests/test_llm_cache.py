@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+import reasoning.gap_analysis as gap_analysis
+import reasoning.llm_cache as llm_cache
+from reasoning.llm_cache import LLMResponseCache
+
+RESULT = {"modulesToDelete": [], "modulesToAdd": [{"title": "RAG", "skills": ["rag"], "reason": "Demand"}]}
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    """Gemini stand-in: returns text (or raises error) and counts calls."""
+
+    model_name = "stub-gemini"
+
+    def __init__(self, text: str = json.dumps(RESULT), error: Exception = None):
+        self.text = text
+        self.error = error
+        self.calls = 0
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return StubResponse(self.text)
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = LLMResponseCache(tmp_path / "llm_cache.db", ttl_seconds=60, max_entries=2)
+    monkeypatch.setattr(gap_analysis, "_response_cache", cache)
+    yield cache
+    cache.close()
+
+
+def analyze(model=None, skills=("python",), **kwargs):
+    return gap_analysis.analyze_gap("Course", 1, [], [], list(skills), {}, model=model, **kwargs)
+
+
+def test_cache_hit_does_not_call_model(cache):
+    model = StubModel()
+    first = analyze(model)
+    second = analyze(model)
+    assert first == second == RESULT
+    assert model.calls == 1
+    assert cache.hits == 1
+
+
+def test_expired_entry_calls_model_again(cache, clock):
+    model = StubModel()
+    analyze(model)
+    clock.now += 61
+    analyze(model)
+    assert model.calls == 2
+
+
+def test_least_recently_used_entry_is_evicted(cache, clock):
+    model = StubModel()
+    for skills in (["python"], ["rust"], ["go"]):
+        clock.now += 1
+        analyze(model, skills)
+    assert model.calls == 3
+
+    analyze(model, ["go"])
+    analyze(model, ["rust"])
+    assert model.calls == 3
+    analyze(model, ["python"])
+    assert model.calls == 4
+
+
+def test_force_refresh_bypasses_and_updates_cache(cache):
+    analyze(StubModel())
+    refreshed = dict(RESULT, modulesToAdd=[])
+    model = StubModel(json.dumps(refreshed))
+    assert analyze(model, force_refresh=True) == refreshed
+    assert model.calls == 1
+    assert analyze(model) == refreshed
+    assert model.calls == 1
+
+
+def test_unparsed_response_is_not_cached(cache):
+    model = StubModel("I cannot answer that.")
+    result = analyze(model)
+    assert "error" in result
+    analyze(model)
+    assert model.calls == 2
+
+
+def test_api_error_is_not_cached(cache):
+    failing = StubModel(error=RuntimeError("429 Too Many Requests"))
+    assert "error" in analyze(failing)
+    model = StubModel()
+    assert analyze(model) == RESULT
+    assert model.calls == 1
+
+
+def test_cached_prompt_is_answered_without_api_key(cache, monkeypatch):
+    # Cached under the default model's name, as a run with a key would have stored it
+    model = StubModel()
+    model.model_name = gap_analysis.GEMINI_MODEL_NAME
+    analyze(model)
+    monkeypatch.setattr(gap_analysis, "LLM_AVAILABLE", False)
+    assert analyze() == RESULT
+    assert analyze(skills=["scala"])["error"] == "Gemini API key not configured"
+
+
+def test_prompt_model_and_config_are_part_of_the_key(cache, monkeypatch):
+    model = StubModel()
+    analyze(model)
+    other = StubModel()
+    other.model_name = "other-gemini"
+    analyze(other)
+    monkeypatch.setattr(gap_analysis, "GENERATION_CONFIG", dict(gap_analysis.GENERATION_CONFIG, temperature=0.5))
+    analyze(model)
+    assert (model.calls, other.calls) == (2, 1)
+
+
+def test_prebuilt_prompt_shares_the_cache_entry(cache):
+    model = StubModel()
+    analyze(model)
+    prompt = gap_analysis.build_prompt([], [], ["python"], {})
+    assert analyze(model, skills=["unused"], prompt=prompt) == RESULT
+    assert model.calls == 1
@@ -0,0 +1,51 @@
+import re
+
+import pytest
+
+from benchmarks.synthetic import generate_job_descriptions
+from skill_engine.skill_extractor import TECH_SKILLS_DB, extract_skills, extract_skills_batch
+
+
+def extract_skills_reference(text: str) -> list:
+    """Original per-keyword implementation of extract_skills, which the compiled matcher must reproduce."""
+    if not text:
+        return []
+
+    text_lower = text.lower()
+    extracted = set()
+    for canonical_name, keywords in TECH_SKILLS_DB.items():
+        for keyword in keywords:
+            pattern = r'\b' + re.escape(keyword) + r'\b'
+            if re.search(pattern, text_lower):
+                extracted.add(canonical_name)
+                break
+
+    return sorted(list(extracted))
+
+
+def test_same_skills_as_the_reference_on_a_fixed_corpus():
+    texts = generate_job_descriptions(300, seed=42)
+    assert extract_skills_batch(texts) == [extract_skills_reference(text) for text in texts]
+
+
+@pytest.mark.parametrize("text", [
+    # Overlapping aliases: a keyword that is a prefix or suffix of a longer one
+    "Experience with large language models and language model evaluation",
+    "apache spark, pyspark and spark streaming",
+    "model deployment pipelines; data pipeline ownership",
+    "Google Cloud Platform (GCP) or cloud platform experience",
+    "t-sql and postgresql",
+    "go lang or golang",
+    "scikit learn / sklearn",
+    # Punctuation and case
+    "Python,Docker;K8S.",
+    "PyTorch/TensorFlow (TF) & Hugging-Face",
+    "node.js, Node.JS and nodejs",
+    "C++ and CPP",
+    "CI/CD, cicd",
+    "REST API's",
+    "",
+    "no skills here",
+])
+def test_same_skills_as_the_reference_on_edge_cases(text):
+    assert extract_skills(text) == extract_skills_reference(text)
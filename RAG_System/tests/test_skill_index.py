@@ -0,0 +1,41 @@
+import pytest
+
+from benchmarks.fake_embeddings import FakeEmbeddings
+from skill_engine.skill_index import FuzzySkillPass, SkillEmbeddingIndex
+
+
+@pytest.fixture
+def embed():
+    return FakeEmbeddings(dim=4096).embed_documents
+
+
+@pytest.fixture
+def index(tmp_path, embed):
+    return SkillEmbeddingIndex.load_or_build(tmp_path, embed, "fake")
+
+
+def resolved(index, embed, descriptions) -> FuzzySkillPass:
+    fuzzy = FuzzySkillPass(index, min_jobs=2, embed_fn=embed)
+    fuzzy.add_batch(descriptions)
+    return fuzzy.resolve()
+
+
+def test_custom_embed_fn_needs_model_name(tmp_path, embed):
+    with pytest.raises(ValueError, match="model_name"):
+        SkillEmbeddingIndex.load_or_build(tmp_path, embed)
+
+
+def test_phrase_must_match_as_a_whole(index, embed):
+    fuzzy = resolved(index, embed, [
+        "hands-on deep-learning. cloud production platform",
+        "deep-learning; cloud production platform",
+    ])
+    assert fuzzy.matched_phrases() == {"deep-learning": "deep learning"}
+
+
+def test_boilerplate_is_not_an_emerging_skill(index, embed):
+    descriptions = ["vector databases. scalable data. apache kafka."] * 3
+    descriptions += ["scalable data, no skills."] * 3
+    fuzzy = resolved(index, embed, descriptions)
+    fuzzy.boilerplate_share = 0.6
+    assert [c["phrase"] for c in fuzzy.emerging_skills()] == ["vector databases"]
@@ -0,0 +1,36 @@
+import random
+
+from skill_engine.skill_matrix import JobSkillMatrix
+from skill_engine.skill_trends import calculate_trends, get_trending_skills, iter_matching_chunks
+
+SKILLS = ["python", "docker", "kubernetes", "aws", "react", "sql", "rust"]
+RNG = random.Random(7)
+SKILL_LISTS = [RNG.sample(SKILLS, RNG.randint(0, 4)) for _ in range(200)]
+CHUNKS = [
+    {"text": f"chunk {c} of job {j}", "metadata": {"jobIndex": j, "extractedSkills": skills}}
+    for j, skills in enumerate(SKILL_LISTS) for c in range(2)
+]
+
+
+def test_counts_and_trending_match_the_skill_lists():
+    matrix = JobSkillMatrix.from_skill_lists(iter(SKILL_LISTS))
+    assert calculate_trends(matrix) == calculate_trends(SKILL_LISTS)
+    for threshold in (0.1, 0.3, 0.9):
+        assert get_trending_skills(matrix, threshold=threshold) == get_trending_skills(
+            calculate_trends(SKILL_LISTS), len(SKILL_LISTS), threshold
+        )
+
+
+def test_extended_matrix_equals_one_built_at_once():
+    matrix = JobSkillMatrix.from_skill_lists(SKILL_LISTS[:120])
+    matrix.extend(SKILL_LISTS[120:])
+    whole = JobSkillMatrix.from_skill_lists(SKILL_LISTS)
+    assert matrix.num_jobs == len(SKILL_LISTS)
+    assert [matrix.job_skills(i) for i in range(matrix.num_jobs)] == [whole.job_skills(i) for i in range(whole.num_jobs)]
+
+
+def test_matrix_matching_selects_the_same_chunks():
+    trending = ["Rust", "react"]
+    matrix = JobSkillMatrix.from_skill_lists(SKILL_LISTS)
+    assert list(iter_matching_chunks(iter(CHUNKS), trending, matrix)) == list(iter_matching_chunks(CHUNKS, trending))
+    assert matrix.overlap(["python", "unknown"]).tolist() == [int("python" in skills) for skills in SKILL_LISTS]
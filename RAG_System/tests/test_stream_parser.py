@@ -0,0 +1,55 @@
+import json
+import time
+
+from reasoning.stream_parser import GapResponseStreamParser
+
+RESULT = {
+    "modulesToDelete": ["Legacy Module"],
+    "modulesToAdd": [
+        {"title": "RAG {basics}", "skills": ["rag", "embeddings"], "reason": "Asked for \"often\""},
+        {"title": "LLMOps", "skills": ["docker"], "reason": "Deployment"},
+    ],
+}
+
+
+def feed_all(text: str, chunk_size: int):
+    parser = GapResponseStreamParser()
+    events = []
+    for start in range(0, len(text), chunk_size):
+        events.extend(parser.feed(text[start:start + chunk_size]))
+    return parser, events
+
+
+def test_entries_are_emitted_for_any_chunk_size():
+    text = "```json\n" + json.dumps(RESULT, indent=2) + "\n```"
+    for chunk_size in (1, 3, 17, len(text)):
+        parser, events = feed_all(text, chunk_size)
+        assert events == [("modulesToDelete", "Legacy Module")] + [("modulesToAdd", m) for m in RESULT["modulesToAdd"]]
+        assert parser.finish() == (RESULT, True)
+        assert parser.length == len(text)
+
+
+def test_trailing_text_with_braces_is_not_truncation():
+    text = json.dumps(RESULT) + "\n\nNote: skills use the {name} format.\n```"
+    for chunk_size in (1, 5, len(text)):
+        parser, _ = feed_all(text, chunk_size)
+        assert parser.finish() == (RESULT, True)
+
+
+def test_truncated_response_keeps_completed_entries():
+    text = json.dumps(RESULT)
+    parser, _ = feed_all(text[:text.index("LLMOps")], 4)
+    result, complete = parser.finish()
+    assert not complete
+    assert result == {"modulesToDelete": ["Legacy Module"], "modulesToAdd": RESULT["modulesToAdd"][:1]}
+
+
+def test_feed_cost_is_linear_in_response_length():
+    def parse_seconds(modules: int) -> float:
+        text = json.dumps({"modulesToDelete": [], "modulesToAdd": [RESULT["modulesToAdd"][1]] * modules})
+        start = time.perf_counter()
+        feed_all(text, 8)
+        return time.perf_counter() - start
+
+    # Quadratic buffering would take ~8x as long for 4x the text
+    assert parse_seconds(8000) < 6 * parse_seconds(2000) + 0.05
@@ -0,0 +1,25 @@
+import json
+
+from benchmarks.bench_pipeline import compare_reports
+from benchmarks.synthetic import generate_jobs, iter_synthetic_jobs, write_corpus
+
+
+def test_corpus_is_reproducible_from_its_seed(tmp_path):
+    first = write_corpus(tmp_path / "a", 50, n_courses=3, n_instructors=4, seed=5)
+    second = write_corpus(tmp_path / "b", 50, n_courses=3, n_instructors=4, seed=5)
+    for name, path in first.items():
+        with open(path) as f, open(second[name]) as g:
+            assert f.read() == g.read()
+    with open(first["jobs.json"]) as f:
+        assert json.load(f) == generate_jobs(50, seed=5) == list(iter_synthetic_jobs(50, seed=5))
+    assert generate_jobs(50, seed=6) != generate_jobs(50, seed=5)
+
+
+def test_only_slower_or_bigger_stages_beyond_the_tolerance_regress():
+    def report(seconds, peak):
+        return {"runs": [{"jobs": 1000, "stages": {"clean_jobs": {"seconds": seconds, "peakMB": peak}}}]}
+
+    assert compare_reports(report(1.2, 10.0), report(1.0, 10.0), tolerance=0.25) == []
+    assert compare_reports(report(0.06, 10.0), report(0.01, 10.0), tolerance=0.25) == []  # below the noise floor
+    regressions = compare_reports(report(1.5, 20.0), report(1.0, 10.0), tolerance=0.25)
+    assert [r.split(": ")[1].split()[0] for r in regressions] == ["seconds", "peakMB"]
@@ -0,0 +1,51 @@
+import json
+import threading
+
+import pytest
+
+from observability.tracing import NOOP_SPAN, disable_tracing, enable_tracing, render_prometheus, span
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    tracer = enable_tracing(tmp_path / "trace.json")
+    yield tracer
+    disable_tracing()
+
+
+def test_disabled_tracing_records_nothing():
+    disable_tracing()
+    assert span("work", items=3) is NOOP_SPAN
+    assert render_prometheus() == ""
+
+
+def test_spans_nest_per_thread_and_aggregate(tracer):
+    def worker():
+        with span("course") as s:
+            s.add("tokens", 10)
+
+    with span("run"):
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with span("course") as s:
+            s.add("tokens", 5)
+    with pytest.raises(ValueError), span("course"):
+        raise ValueError
+
+    with open(tracer.write_trace()) as f:
+        spans = json.load(f)["spans"]
+    parents = [record["parent"] for record in spans if record["name"] == "course"]
+    assert sorted(parents, key=str) == [None, None, None, None, "run"]
+    totals = tracer.summary()["course"]
+    assert (totals["calls"], totals["errors"], totals["counters"]) == (5, 1, {"tokens": 35})
+
+
+def test_prometheus_output(tracer):
+    with span('stage "a"') as s:
+        s.add("hits", 2)
+    text = render_prometheus()
+    assert 'curriculum_pipeline_span_calls_total{span="stage \\"a\\""} 1' in text
+    assert 'curriculum_pipeline_span_counter_total{span="stage \\"a\\"",counter="hits"} 2' in text
@@ -0,0 +1,76 @@
+import pytest
+
+from skill_engine.trend_engine import SkillTrendEngine
+
+JOBS = [
+    ({"id": 1, "postedAt": "2025-12-01T10:00:00Z", "description": "python docker"}, ["python", "docker"]),
+    ({"id": 2, "postedAt": "2025-12-05T10:00:00Z", "description": "python"}, ["python"]),
+    ({"postedAt": "2025-12-06T10:00:00Z", "description": "rust without an id"}, ["rust"]),
+    ({"description": "go, undated and without an id"}, ["go"]),
+]
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return tmp_path / "trend_state.db"
+
+
+def run(state_path, jobs):
+    """One pipeline run: load, feed the whole corpus, drop what is gone, save."""
+    engine = SkillTrendEngine.load(state_path)
+    added = engine.add_jobs(jobs)
+    removed = engine.remove_unseen()
+    engine.save()
+    return engine, added, removed
+
+
+def test_rerun_counts_nothing_again(state_path):
+    engine, added, _ = run(state_path, JOBS)
+    assert added == 4
+    first = engine.to_dict()
+
+    engine, added, removed = run(state_path, JOBS)
+    assert (added, removed) == (0, 0)
+    assert engine.total_jobs == 4
+    assert engine.total_counts == {"python": 2, "docker": 1, "rust": 1, "go": 1}
+    assert engine.to_dict() == dict(first, run=first["run"] + 1)
+
+
+def test_edited_posting_replaces_its_counts(state_path):
+    run(state_path, JOBS)
+    edited = [({"id": 1, "postedAt": "2025-12-01T10:00:00Z"}, ["python", "kubernetes"])] + JOBS[1:]
+    engine, added, _ = run(state_path, edited)
+    assert added == 1
+    assert engine.total_jobs == 4
+    assert engine.total_counts == {"python": 2, "kubernetes": 1, "rust": 1, "go": 1}
+    assert "docker" not in engine.decayed_scores()
+
+
+def test_removed_postings_are_subtracted(state_path):
+    run(state_path, JOBS)
+    engine, added, removed = run(state_path, JOBS[1:2] + JOBS[3:])
+    assert (added, removed) == (0, 2)
+    assert engine.total_jobs == 2
+    assert engine.total_counts == {"python": 1, "go": 1}
+    counts, jobs = engine.window_counts(90)
+    assert (dict(counts), jobs) == ({"python": 1}, 1)
+    assert engine.decayed_scores() == pytest.approx({"python": 1.0})
+
+
+def test_undated_postings_stay_out_of_the_windows(state_path):
+    engine, _, _ = run(state_path, JOBS)
+    assert (engine.undated_jobs, dict(engine.undated_counts)) == (1, {"go": 1})
+    # The windows end at the latest dated posting and hold only dated ones
+    counts, jobs = engine.window_counts(7)
+    assert (dict(counts), jobs) == ({"python": 2, "docker": 1, "rust": 1}, 3)
+    assert "go" not in engine.decayed_scores()
+
+    engine, _, removed = run(state_path, JOBS[:3])
+    assert removed == 1 and engine.undated_jobs == 0 and "go" not in engine.total_counts
+
+
+def test_settings_change_starts_over(state_path):
+    run(state_path, JOBS)
+    engine = SkillTrendEngine.load(state_path, half_life_days=7.0)
+    assert engine.total_jobs == 0
+    assert engine.add_jobs(JOBS) == 4
@@ -0,0 +1,151 @@
+import os
+
+import pytest
+
+import rag.vector_store as vector_store
+from benchmarks.fake_embeddings import install_fake_embeddings
+from data_ingestion.job_table import ChunkFieldView, JobTable
+from rag.vector_store import HEADER_FILE, RECORDS_FILE, VectorStore
+
+TEXTS = [f"job {i} needs python and docker skill{i}" for i in range(20)]
+METADATA = [{"jobId": i} for i in range(20)]
+
+
+@pytest.fixture(autouse=True)
+def fake_embeddings(monkeypatch):
+    monkeypatch.setattr(vector_store, "_embeddings", None)
+    return install_fake_embeddings(dim=64)
+
+
+@pytest.fixture
+def embedded(fake_embeddings, monkeypatch):
+    """Texts passed to the embedding model."""
+    texts = []
+    embed = fake_embeddings.embed_documents
+    monkeypatch.setattr(fake_embeddings, "embed_documents", lambda batch: texts.extend(batch) or embed(batch))
+    return texts
+
+
+def built_store(texts=TEXTS, metadata=METADATA) -> VectorStore:
+    store = VectorStore(use_embedding_cache=False)
+    store.build_index(texts, metadata)
+    return store
+
+
+def test_save_and_load_round_trip(tmp_path):
+    built_store().save(tmp_path)
+    store = VectorStore(use_embedding_cache=False)
+    assert store.load(tmp_path, expected_fingerprint=vector_store.compute_fingerprint(TEXTS, METADATA))
+    assert store.texts == TEXTS and store.metadata == METADATA
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_crash_during_save_leaves_no_loadable_index(tmp_path, monkeypatch):
+    built_store().save(tmp_path)
+
+    real_replace = os.replace
+
+    def crash_on_records(src, dst):
+        if str(dst).endswith(RECORDS_FILE):
+            raise OSError("disk full")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(vector_store.os, "replace", crash_on_records)
+    with pytest.raises(OSError):
+        built_store(TEXTS[:10], METADATA[:10]).save(tmp_path)
+    monkeypatch.undo()
+
+    # The new index.faiss is in place but the old header is gone, so it is not paired with old records
+    assert not (tmp_path / HEADER_FILE).exists()
+    assert not VectorStore(use_embedding_cache=False).load(tmp_path)
+
+
+def test_half_written_records_are_rejected(tmp_path):
+    built_store().save(tmp_path)
+    records = tmp_path / RECORDS_FILE
+    data = records.read_bytes()
+    records.write_bytes(data[:len(data) // 2])
+    assert VectorStore(use_embedding_cache=False).load(tmp_path) is False
+
+
+def test_missing_index_file_is_rejected(tmp_path):
+    built_store().save(tmp_path)
+    (tmp_path / vector_store.INDEX_FILE).unlink()
+    assert VectorStore(use_embedding_cache=False).load(tmp_path) is False
+
+
+def test_appended_records_extend_the_saved_index(tmp_path, embedded):
+    assert not VectorStore(use_embedding_cache=False).load_or_build(TEXTS[:15], METADATA[:15], tmp_path)
+    embedded.clear()
+
+    store = VectorStore(use_embedding_cache=False)
+    assert store.load_or_build(TEXTS, METADATA, tmp_path)
+    assert embedded == TEXTS[15:]
+    assert store.index.ntotal == len(TEXTS)
+    assert store.retrieve(TEXTS[18], k=1)[0]["metadata"] == METADATA[18]
+
+    # The extended index was saved and matches the full records
+    assert VectorStore(use_embedding_cache=False).load(
+        tmp_path, expected_fingerprint=vector_store.compute_fingerprint(TEXTS, METADATA)
+    )
+
+
+def test_changed_records_rebuild_the_index(tmp_path, embedded):
+    VectorStore(use_embedding_cache=False).load_or_build(TEXTS, METADATA, tmp_path)
+    changed = ["changed posting"] + TEXTS[1:]
+    assert not VectorStore(use_embedding_cache=False).load_or_build(changed, METADATA, tmp_path)
+    assert not VectorStore(use_embedding_cache=False).load_or_build(changed[:10], METADATA[:10], tmp_path)
+
+
+def test_chunk_views_are_indexed_without_copies(tmp_path):
+    table = JobTable(chunk_size=5, overlap=0)
+    for i in range(4):
+        table.add_job({"title": f"Job {i}"}, ["python"], f"posting {i} about python docker kubernetes and rust skill{i}")
+    chunks = table.chunks
+
+    VectorStore(use_embedding_cache=False).load_or_build(chunks.texts, chunks.metadata, tmp_path)
+    store = VectorStore(use_embedding_cache=False)
+    assert store.load_or_build(chunks.texts, chunks.metadata, tmp_path)
+    assert isinstance(store.texts, ChunkFieldView) and isinstance(store.metadata, ChunkFieldView)
+
+    table.add_job({"title": "Job 4"}, ["go"], "posting 4 about golang services")
+    store.extend(chunks.texts, chunks.metadata)
+    assert store.index.ntotal == len(chunks)
+    assert store.retrieve("golang services", k=1)[0]["metadata"]["jobTitle"] == "Job 4"
+
+
+def test_filtered_ivf_search_returns_k_results():
+    texts = [f"posting {i} about {['python', 'docker', 'rust', 'golang'][i % 4]} topic{i % 97}" for i in range(4000)]
+    metadata = [{"jobId": i, "team": "search" if i % 200 == 0 else "other"} for i in range(4000)]
+    store = VectorStore(use_embedding_cache=False, index_type="ivf_flat", nprobe=1)
+    store.build_index(texts, metadata)
+
+    results = store.retrieve_batch(["python topic3", "rust topic50"], k=10, filters={"team": "search"})
+    assert [len(rows) for rows in results] == [10, 10]
+    assert all(r["metadata"]["team"] == "search" for rows in results for r in rows)
+
+
+def test_embed_goes_through_the_embedding_cache(tmp_path, embedded):
+    store = VectorStore(cache_dir=tmp_path)
+    first = store.embed(TEXTS[:3])
+    assert store.embed(TEXTS[:3]).tolist() == first.tolist()
+    assert embedded == TEXTS[:3]
+
+
+def test_batched_retrieval_matches_single_queries():
+    store = built_store()
+    queries = ["python skill3", "docker skill11", "nothing relevant"]
+    assert store.retrieve_batch(queries, k=4) == [store.retrieve(query, k=4) for query in queries]
+
+
+def test_filters_and_fields_and_or_values():
+    metadata = [{"jobId": i, "location": ["Pune", "Remote", "Delhi"][i % 3], "extractedSkills": ["Python"] if i % 2 else []}
+                for i in range(20)]
+    store = built_store(metadata=metadata)
+    filters = {"location": ["Pune", "Remote"], "skill": "python"}
+    expected = [i for i, meta in enumerate(metadata) if meta["location"] != "Delhi" and meta["extractedSkills"]]
+    assert store.filter_ids(filters).tolist() == expected
+
+    results = store.retrieve("python and docker", k=50, filters=filters)
+    assert sorted(r["metadata"]["jobId"] for r in results) == expected
+    assert store.retrieve("python", k=5, filters={"location": "Mars"}) == []
@@ -134,7 +134,14 @@ const jobsJsonPath = path.join(__dirname, "../data/jobs.json");
 const gapAnalysisDir = __dirname;
 const frontendPublicDir = path.join(__dirname, "../Frontend/public");
 
+// Warm analysis service (python -m service.app); falls back to spawning main.py
+const serviceUrl = process.env.ANALYSIS_SERVICE_URL || "http://127.0.0.1:8000";
+// Seconds the service waits for the update; the request is aborted a little later
+const serviceWaitSeconds = Number(process.env.ANALYSIS_SERVICE_WAIT_SECONDS) || 300;
+const serviceTimeoutMs = (serviceWaitSeconds + 30) * 1000;
+
 let isRunning = false;
+let pendingRun = false;
 
 console.log("[WATCH] Starting watch for jobs.json changes...");
 console.log(`[WATCH] Watching: ${jobsJsonPath}`);
@@ -151,13 +158,67 @@ const watcher = chokidar.watch(jobsJsonPath, {
   },
 });
 
-function runPythonScript() {
+async function notifyService() {
+  // The service debounces and coalesces events; wait=true returns once applied
+  const controller = new AbortController();
+  const timer = setTimeout(() => controller.abort(), serviceTimeoutMs);
+  try {
+    const response = await fetch(
+      `${serviceUrl}/events/jobs-changed?wait=true&timeout=${serviceWaitSeconds}`,
+      { method: "POST", signal: controller.signal }
+    );
+    if (!response.ok) {
+      throw new Error(`Service responded with ${response.status}`);
+    }
+    const result = await response.json();
+    // A failed or timed-out update still answers 200, with applied: false
+    if (result.applied !== true || result.error) {
+      throw new Error(
+        `Service did not apply update (event ${result.event}): ${
+          result.error || `not finished within ${serviceWaitSeconds}s`
+        }`
+      );
+    }
+    return result;
+  } catch (error) {
+    if (error.name === "AbortError") {
+      throw new Error(`Service did not answer within ${serviceTimeoutMs / 1000}s`);
+    }
+    throw error;
+  } finally {
+    clearTimeout(timer);
+  }
+}
+
+async function handleJobsChange() {
   if (isRunning) {
-    console.log("⏳ Previous run still in progress, skipping...");
+    // Coalesce: one more run after the current one, instead of dropping it
+    console.log("⏳ Previous run still in progress, queued another update...");
+    pendingRun = true;
     return;
   }
 
   isRunning = true;
+  try {
+    const result = await notifyService();
+    console.log(`\n✅ Analysis service applied update (event ${result.event})`);
+    copyNewestGapAnalysisFile();
+    finishRun();
+  } catch (error) {
+    console.error(`⚠️  Analysis service update failed (${error.message}), running main.py`);
+    runPythonScript();
+  }
+}
+
+function finishRun() {
+  isRunning = false;
+  if (pendingRun) {
+    pendingRun = false;
+    handleJobsChange();
+  }
+}
+
+function runPythonScript() {
   const timestamp = new Date().toLocaleTimeString();
   console.log(
     `\n[${timestamp}] 📝 Detected jobs.json change! Running gap analysis...`
@@ -193,7 +254,7 @@ function runPythonScript() {
         console.error("Error details:", pythonError);
       }
     }
-    isRunning = false;
+    finishRun();
   });
 }
 
@@ -273,7 +334,7 @@ function copyNewestGapAnalysisFile() {
 // Watcher events
 watcher.on("change", (filePath) => {
   console.log(`\n📂 File changed: ${path.basename(filePath)}`);
-  runPythonScript();
+  handleJobsChange();
 });
 
 watcher.on("error", (error) => {